@@ -13,6 +13,7 @@ Usage:
     python run.py test-lexer
     python run.py test-parser
     python run.py test-ast
+    python run.py profile-parser <file>
     python run.py clean
 
     # On macOS/Linux:
@@ -22,6 +23,7 @@ Usage:
     python3 run.py test-lexer
     python3 run.py test-parser
     python3 run.py test-ast
+    python3 run.py profile-parser <file>
     python3 run.py clean
 """
 
@@ -94,7 +96,7 @@ class TyCBuilder:
             self.venv_python3 = self.venv_dir / "bin" / "python"
             self.venv_pip = self.venv_dir / "bin" / "pip"
 
-    def run_command(self, cmd, cwd=None, check=True, capture_output=False):
+    def run_command(self, cmd, cwd=None, check=True, capture_output=False, env=None):
         """Run a shell command."""
         try:
             if isinstance(cmd, str):
@@ -105,6 +107,7 @@ class TyCBuilder:
                     check=check,
                     capture_output=capture_output,
                     text=True,
+                    env=env,
                 )
             else:
                 result = subprocess.run(
@@ -113,6 +116,7 @@ class TyCBuilder:
                     check=check,
                     capture_output=capture_output,
                     text=True,
+                    env=env,
                 )
             return result
         except subprocess.CalledProcessError as e:
@@ -196,6 +200,13 @@ class TyCBuilder:
             )
         )
         print()
+        print(self.colors.green("Profiling:"))
+        print(
+            self.colors.yellow(
+                "  python3 run.py profile-parser <file> - Report parser decision/rule costs for a TyC file"
+            )
+        )
+        print()
         print(self.colors.green("Cleaning:"))
         print(
             self.colors.yellow(
@@ -493,6 +504,32 @@ class TyCBuilder:
         )
         self.clean_cache()
 
+    def profile_parser(self, file_path=None):
+        """Profile parser decisions and rules on a TyC file."""
+        if not file_path:
+            print(self.colors.red("Usage: python3 run.py profile-parser <file>"))
+            sys.exit(1)
+        if not self.build_dir.exists():
+            print(
+                self.colors.yellow("Build directory not found. Running build first...")
+            )
+            self.build_grammar()
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join([str(self.root_dir), str(self.build_dir)])
+
+        result = self.run_command(
+            [
+                str(self.venv_python3),
+                "-m",
+                "src.utils.parser_profile",
+                str(Path(file_path).absolute()),
+            ],
+            check=False,
+            env=env,
+        )
+        sys.exit(result.returncode)
+
 
 def main():
     """Main entry point."""
@@ -517,9 +554,11 @@ def main():
             "test-lexer",
             "test-parser",
             "test-ast",
+            "profile-parser",
         ],
         help="Command to execute",
     )
+    parser.add_argument("file", nargs="?", help="TyC source file (profile-parser)")
 
     args = parser.parse_args()
 
@@ -537,6 +576,7 @@ def main():
         "test-lexer": builder.test_lexer,
         "test-parser": builder.test_parser,
         "test-ast": builder.test_ast,
+        "profile-parser": lambda: builder.profile_parser(args.file),
     }
 
     if args.command in commands:
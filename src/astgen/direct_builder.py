@@ -0,0 +1,618 @@
+"""
+Direct AST builder for TyC programming language.
+This module builds the AST (src/utils/nodes.py) straight from the token
+stream with a recursive-descent parser that follows the rules of TyC.g4,
+so the TyCParser parse tree is never materialized. Expressions are parsed
+by precedence climbing over INFIX_OPS/PREFIX_OPS, one call per operand
+instead of one per precedence level of the grammar's expression rules.
+
+The builder accepts the same programs as TyCParser. When the lexer or the
+builder rejects a program, the source is parsed again with TyCParser in LL
+mode, so lexer errors and syntax errors are reported with exactly the same
+exceptions and messages as the parse-tree pipeline.
+
+AST shapes:
+    function without a declared type  FuncDecl(None, ...)
+    function body that is one statement  wrapped in a BlockStmt
+    parenthesized expression  the inner expression
+    for initializer expression  ExprStmt
+    `type x = {...}`  VarDecl with a StructLiteral initializer
+    switch section with several labels  one CaseStmt/DefaultStmt per label,
+        the statements (and a trailing BreakStmt) go to the last label
+
+Two constructs the grammar accepts have no AST form: calls whose callee is
+not an identifier (`s.f(x)`, `f(x)(y)`; the specification only calls
+functions by name) and a second default clause in one switch statement
+(a compile-time error in the specification). Programs TyCParser accepts
+that use them raise UnsupportedConstruct, not SyntaxException.
+"""
+
+import os
+from typing import List
+
+from antlr4 import Token
+
+from build.TyCParser import TyCParser
+from src.utils.parsing import POOL, parse_ll
+from src.utils.nodes import (
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    INT_TYPE,
+    FLOAT_TYPE,
+    STRING_TYPE,
+    VOID_TYPE,
+    TypeTable,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+
+
+# AST build modes: "parse-tree" runs TyCParser and ASTGeneration, "direct" this builder.
+# The default can be switched with the TYC_AST_BUILD environment variable.
+BUILD_MODES = ("parse-tree", "direct")
+BUILD_MODE = os.environ.get("TYC_AST_BUILD", "parse-tree")
+
+EOF = Token.EOF
+ID = TyCParser.ID
+AUTO = TyCParser.AUTO
+INT = TyCParser.INT
+FLOAT = TyCParser.FLOAT
+STRING = TyCParser.STRING
+VOID = TyCParser.VOID
+STRUCT = TyCParser.STRUCT
+IF = TyCParser.IF
+ELSE = TyCParser.ELSE
+WHILE = TyCParser.WHILE
+FOR = TyCParser.FOR
+SWITCH = TyCParser.SWITCH
+CASE = TyCParser.CASE
+DEFAULT = TyCParser.DEFAULT
+BREAK = TyCParser.BREAK
+CONTINUE = TyCParser.CONTINUE
+RETURN = TyCParser.RETURN
+INT_LIT = TyCParser.INT_LIT
+FLOAT_LIT = TyCParser.FLOAT_LIT
+STRING_LIT = TyCParser.STRING_LIT
+ASSIGN = TyCParser.ASSIGN
+DOT = TyCParser.DOT
+INC = TyCParser.INC
+DEC = TyCParser.DEC
+LPAREN = TyCParser.LPAREN
+RPAREN = TyCParser.RPAREN
+LBRACE = TyCParser.LBRACE
+RBRACE = TyCParser.RBRACE
+SEMI = TyCParser.SEMI
+COMMA = TyCParser.COMMA
+COLON = TyCParser.COLON
+
+# Operator precedence and associativity of the TyC specification, higher
+# values bind tighter. Postfix ++/--, calls and member access bind tightest
+# and are applied to a primary expression before any of these.
+ASSIGNMENT = 0
+INFIX_OPS = {  # token type -> (precedence, right associative, operator)
+    ASSIGN: (ASSIGNMENT, True, "="),
+    TyCParser.OR: (1, False, "||"),
+    TyCParser.AND: (2, False, "&&"),
+    TyCParser.EQ: (3, False, "=="),
+    TyCParser.NEQ: (3, False, "!="),
+    TyCParser.LT: (4, False, "<"),
+    TyCParser.LE: (4, False, "<="),
+    TyCParser.GT: (4, False, ">"),
+    TyCParser.GE: (4, False, ">="),
+    TyCParser.PLUS: (5, False, "+"),
+    TyCParser.MINUS: (5, False, "-"),
+    TyCParser.MUL: (6, False, "*"),
+    TyCParser.DIV: (6, False, "/"),
+    TyCParser.MOD: (6, False, "%"),
+}
+PREFIX_OPS = {  # token type -> (precedence of the operand, operator)
+    TyCParser.NOT: (7, "!"),
+    TyCParser.MINUS: (7, "-"),
+    TyCParser.PLUS: (7, "+"),
+    INC: (8, "++"),
+    DEC: (8, "--"),
+}
+POSTFIX_OPS = {INC: "++", DEC: "--"}
+POSTFIX_START = {LPAREN, DOT, INC, DEC}
+
+PRIMITIVE_TYPES = {INT: INT_TYPE, FLOAT: FLOAT_TYPE, STRING: STRING_TYPE}
+DECL_START = {INT, FLOAT, STRING, AUTO}
+
+# Block rules of TyC.g4; each decides which statements a block may contain
+BLOCK = "block"  # typed function body, needs a `return expr;` at its top level
+TYPE_INFER_BLOCK = "typeInferBlock"  # if/else bodies and untyped function bodies
+LOOP_BLOCK = "loopBlock"  # loop bodies, also allow break and continue
+VOID_BLOCK = "voidBlock"  # void function bodies, `return;` instead of `return expr;`
+
+
+class UnsupportedConstruct(Exception):
+    """A construct TyCParser accepts that has no AST form, at its first token the builder could not take."""
+
+    def __init__(self, token):
+        self.token = token
+        text = token.text if token.type != EOF else "<EOF>"
+        self.message = f"Unsupported construct on line {token.line} col {token.column}: {text}"
+        super().__init__(self.message)
+
+
+class _Reject(Exception):
+    """Raised when the tokens do not match the rule being parsed."""
+
+
+class DirectASTBuilder:
+    """Recursive-descent parser over a token list producing AST nodes."""
+
+    def __init__(self, tokens: list, type_table: TypeTable = None):
+        self.tokens = tokens
+        # Struct types are shared within the compilation, which may span several builders
+        self.type_table = type_table or TypeTable()
+        self.types = [token.type for token in tokens]
+        self.pos = 0
+        self.furthest = 0  # index of the furthest token a rule failed on
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _reject(self, index: int = None):
+        index = self.pos if index is None else index
+        if index > self.furthest:
+            self.furthest = index
+        raise _Reject()
+
+    def _expect(self, token_type: int):
+        if self.types[self.pos] != token_type:
+            self._reject()
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    @staticmethod
+    def _at(node, token):
+        node.line = token.line
+        node.column = token.column
+        return node
+
+    def _starts_var_decl(self) -> bool:
+        token_type = self.types[self.pos]
+        return token_type in DECL_START or (token_type == ID and self.types[self.pos + 1] == ID)
+
+    # ------------------------------------------------------------------
+    # Declarations
+    # ------------------------------------------------------------------
+
+    def program(self) -> Program:
+        start = self.tokens[0]
+        decls = []
+        while self.types[self.pos] != EOF:
+            if self.types[self.pos] == STRUCT:
+                decls.append(self._struct_decl())
+            else:
+                decls.append(self._func_decl())
+        return self._at(Program(decls), start)
+
+    def _struct_decl(self) -> StructDecl:
+        start = self._expect(STRUCT)
+        name = self._expect(ID).text
+        self._expect(LBRACE)
+        members = []
+        while self.types[self.pos] != RBRACE:
+            member_start = self.tokens[self.pos]
+            member_type = self._type()
+            member = MemberDecl(member_type, self._expect(ID).text)
+            self._expect(SEMI)
+            members.append(self._at(member, member_start))
+        self.pos += 1
+        self._expect(SEMI)
+        return self._at(StructDecl(name, members), start)
+
+    def _func_decl(self) -> FuncDecl:
+        start = self.tokens[self.pos]
+        token_type = self.types[self.pos]
+        if token_type == VOID:
+            self.pos += 1
+            return_type, kind = VOID_TYPE, VOID_BLOCK
+        elif token_type == ID and self.types[self.pos + 1] == LPAREN:
+            # funcDecl without a type and typeInferFuncDecl; typeInferBlock accepts both bodies
+            return_type, kind = None, TYPE_INFER_BLOCK
+        else:
+            return_type, kind = self._type(), BLOCK
+        name = self._expect(ID).text
+        self._expect(LPAREN)
+        params = []
+        if self.types[self.pos] != RPAREN:
+            params.append(self._param())
+            while self.types[self.pos] == COMMA:
+                self.pos += 1
+                params.append(self._param())
+        self._expect(RPAREN)
+        body = self._body(kind)
+        if type(body) is not BlockStmt:
+            body = self._at(BlockStmt([body]), body)
+        return self._at(FuncDecl(return_type, name, params, body), start)
+
+    def _param(self) -> Param:
+        start = self.tokens[self.pos]
+        param_type = self._type()
+        return self._at(Param(param_type, self._expect(ID).text), start)
+
+    def _type(self):
+        token_type = self.types[self.pos]
+        primitive = PRIMITIVE_TYPES.get(token_type)
+        if primitive is not None:
+            self.pos += 1
+            return primitive
+        return self.type_table.struct_type(self._expect(ID).text)
+
+    def _var_decl(self) -> VarDecl:
+        # varDeclNoSemi; structInitNoSemi is covered by an initializer that is a struct literal
+        start = self.tokens[self.pos]
+        if self.types[self.pos] == AUTO:
+            self.pos += 1
+            var_type = None
+        else:
+            var_type = self._type()
+        name = self._expect(ID).text
+        init_value = None
+        if self.types[self.pos] == ASSIGN:
+            self.pos += 1
+            init_value = self._expr()
+        return self._at(VarDecl(var_type, name, init_value), start)
+
+    # ------------------------------------------------------------------
+    # Blocks and statements
+    # ------------------------------------------------------------------
+
+    def _body(self, kind: str):
+        """A block rule: `{ ... }` or a single statement."""
+        if self.types[self.pos] == LBRACE:
+            # The brace alternative comes first; `{...};` can still be a struct literal statement
+            saved = self.pos
+            try:
+                return self._block(kind)
+            except _Reject:
+                self.pos = saved
+        return self._stmt(kind == VOID_BLOCK)
+
+    def _block(self, kind: str) -> BlockStmt:
+        start = self._expect(LBRACE)
+        statements = []
+        while self.types[self.pos] != RBRACE:
+            statements.append(self._block_item(kind))
+        if kind == BLOCK and not any(
+            type(statement) is ReturnStmt for statement in statements
+        ):
+            self._reject()
+        self.pos += 1
+        return self._at(BlockStmt(statements), start)
+
+    def _block_item(self, kind: str):
+        token_type = self.types[self.pos]
+        if self._starts_var_decl():
+            declaration = self._var_decl()
+            self._expect(SEMI)
+            return declaration
+        if token_type == LBRACE:
+            # stmt comes before the nested block in every block rule
+            saved = self.pos
+            try:
+                return self._expr_stmt()
+            except _Reject:
+                self.pos = saved
+            return self._block(kind)
+        if kind == LOOP_BLOCK and (token_type == BREAK or token_type == CONTINUE):
+            return self._jump()
+        return self._stmt(kind == VOID_BLOCK)
+
+    def _stmt(self, void: bool = False):
+        """stmt, or voidStmt (`return;` instead of `return expr;`) when void is set."""
+        token_type = self.types[self.pos]
+        if token_type == IF:
+            return self._if_stmt()
+        if token_type == WHILE:
+            return self._while_stmt()
+        if token_type == FOR:
+            return self._for_stmt()
+        if token_type == SWITCH:
+            return self._switch_stmt()
+        if token_type == RETURN:
+            start = self.tokens[self.pos]
+            self.pos += 1
+            expr = None if void else self._expr()
+            self._expect(SEMI)
+            return self._at(ReturnStmt(expr), start)
+        return self._expr_stmt()
+
+    def _expr_stmt(self) -> ExprStmt:
+        start = self.tokens[self.pos]
+        expr = self._expr()
+        self._expect(SEMI)
+        return self._at(ExprStmt(expr), start)
+
+    def _jump(self):
+        start = self.tokens[self.pos]
+        node = BreakStmt() if self.types[self.pos] == BREAK else ContinueStmt()
+        self.pos += 1
+        self._expect(SEMI)
+        return self._at(node, start)
+
+    def _if_stmt(self) -> IfStmt:
+        start = self._expect(IF)
+        self._expect(LPAREN)
+        condition = self._expr()
+        self._expect(RPAREN)
+        then_stmt = self._body(TYPE_INFER_BLOCK)
+        else_stmt = None
+        if self.types[self.pos] == ELSE:
+            self.pos += 1
+            else_stmt = self._body(TYPE_INFER_BLOCK)
+        return self._at(IfStmt(condition, then_stmt, else_stmt), start)
+
+    def _while_stmt(self) -> WhileStmt:
+        start = self._expect(WHILE)
+        self._expect(LPAREN)
+        condition = self._expr()
+        self._expect(RPAREN)
+        return self._at(WhileStmt(condition, self._body(LOOP_BLOCK)), start)
+
+    def _for_stmt(self) -> ForStmt:
+        start = self._expect(FOR)
+        self._expect(LPAREN)
+        init = condition = update = None
+        if self.types[self.pos] != SEMI:
+            if self._starts_var_decl():
+                init = self._var_decl()
+            else:
+                init_start = self.tokens[self.pos]
+                init = self._at(ExprStmt(self._expr()), init_start)
+        self._expect(SEMI)
+        if self.types[self.pos] != SEMI:
+            condition = self._expr()
+        self._expect(SEMI)
+        if self.types[self.pos] != RPAREN:
+            update = self._expr()
+        self._expect(RPAREN)
+        return self._at(ForStmt(init, condition, update, self._body(LOOP_BLOCK)), start)
+
+    def _switch_stmt(self) -> SwitchStmt:
+        start = self._expect(SWITCH)
+        self._expect(LPAREN)
+        expr = self._expr()
+        self._expect(RPAREN)
+        self._expect(LBRACE)
+        cases = []
+        default_case = None
+        while self.types[self.pos] != RBRACE:
+            # switchSection: caseLabel+ stmt* breakStmt?
+            labels = []
+            while True:
+                label_start = self.tokens[self.pos]
+                if self.types[self.pos] == CASE:
+                    self.pos += 1
+                    label = CaseStmt(self._expr(), [])
+                    cases.append(label)
+                elif self.types[self.pos] == DEFAULT:
+                    if default_case is not None:
+                        self._reject()
+                    self.pos += 1
+                    label = default_case = DefaultStmt([])
+                else:
+                    break
+                self._expect(COLON)
+                labels.append(self._at(label, label_start))
+            if not labels:
+                self._reject()
+            statements = labels[-1].statements
+            while self.types[self.pos] not in (CASE, DEFAULT, BREAK, RBRACE):
+                statements.append(self._stmt())
+            if self.types[self.pos] == BREAK:
+                statements.append(self._jump())
+        self.pos += 1
+        return self._at(SwitchStmt(expr, cases, default_case), start)
+
+    # ------------------------------------------------------------------
+    # Expressions
+    # ------------------------------------------------------------------
+
+    def _expr(self, min_precedence: int = ASSIGNMENT):
+        """Expression whose infix operators all bind at least as tightly as min_precedence."""
+        types = self.types
+        start_pos = self.pos
+        start = self.tokens[start_pos]
+        token_type = types[start_pos]
+        prefix = PREFIX_OPS.get(token_type)
+        if prefix is None:
+            if token_type == ID and types[start_pos + 1] not in POSTFIX_START:
+                # The most common operand: a bare identifier
+                self.pos += 1
+                left = self._at(Identifier(start.text), start)
+            else:
+                left = self._postfix()
+        else:
+            self.pos += 1
+            left = self._at(PrefixOp(prefix[1], self._expr(prefix[0])), start)
+        infix = INFIX_OPS.get(types[self.pos])
+        while infix is not None and infix[0] >= min_precedence:
+            precedence, right_associative, operator = infix
+            if precedence == ASSIGNMENT and not _is_lvalue(left, self.pos - start_pos):
+                self._reject()
+            self.pos += 1
+            right = self._expr(precedence if right_associative else precedence + 1)
+            if precedence == ASSIGNMENT:
+                left = self._at(AssignExpr(left, right), start)
+            else:
+                left = self._at(BinaryOp(left, operator, right), start)
+            infix = INFIX_OPS.get(types[self.pos])
+        return left
+
+    def _postfix(self):
+        start = self.tokens[self.pos]
+        node = self._primary()
+        types = self.types
+        while True:
+            token_type = types[self.pos]
+            if token_type == LPAREN:
+                if type(node) is not Identifier:
+                    self._reject()
+                self.pos += 1
+                args = [] if types[self.pos] == RPAREN else self._expr_list()
+                self._expect(RPAREN)
+                node = self._at(FuncCall(node.name, args), start)
+            elif token_type == DOT:
+                self.pos += 1
+                node = self._at(MemberAccess(node, self._expect(ID).text), start)
+            elif token_type == INC or token_type == DEC:
+                self.pos += 1
+                node = self._at(PostfixOp(POSTFIX_OPS[token_type], node), start)
+            else:
+                return node
+
+    def _expr_list(self) -> List:
+        values = [self._expr()]
+        while self.types[self.pos] == COMMA:
+            self.pos += 1
+            values.append(self._expr())
+        return values
+
+    def _primary(self):
+        token = self.tokens[self.pos]
+        token_type = token.type
+        if token_type == ID:
+            self.pos += 1
+            return self._at(Identifier(token.text), token)
+        if token_type == INT_LIT:
+            self.pos += 1
+            return self._at(IntLiteral(int(token.text)), token)
+        if token_type == FLOAT_LIT:
+            self.pos += 1
+            return self._at(FloatLiteral(float(token.text)), token)
+        if token_type == STRING_LIT:
+            self.pos += 1
+            return self._at(StringLiteral(token.text), token)
+        if token_type == LPAREN:
+            self.pos += 1
+            expr = self._expr()
+            self._expect(RPAREN)
+            return expr
+        if token_type == LBRACE:
+            # structLit; initElem's structLit alternative is already an expr
+            self.pos += 1
+            values = [] if self.types[self.pos] == RBRACE else self._expr_list()
+            self._expect(RBRACE)
+            return self._at(StructLiteral(values), token)
+        self._reject()
+
+
+def _is_lvalue(node, tokens: int) -> bool:
+    # lvalue: ID (DOT ID)*, spelled without parentheses in exactly 2 * depth + 1 tokens
+    depth = 0
+    while type(node) is MemberAccess:
+        node = node.obj
+        depth += 1
+    return type(node) is Identifier and tokens == 2 * depth + 1
+
+
+def tokenize(source: str, backend: str = None) -> list:
+    """All tokens of source, EOF included, from this thread's pooled lexer."""
+    lexer = POOL.lexer(source, backend)
+    tokens = []
+    append = tokens.append
+    next_token = lexer.nextToken
+    token = next_token()
+    while token.type != EOF:
+        append(token)
+        token = next_token()
+    append(token)
+    return tokens
+
+
+def build_ast(source: str, backend: str = None, tokens: list = None, type_table: TypeTable = None) -> Program:
+    """AST of source built directly from its tokens.
+
+    Raises the same lexer exceptions and SyntaxException messages as parsing
+    source with TyCParser in LL mode, and UnsupportedConstruct for the
+    programs TyCParser accepts that have no AST form. tokens, when given, are the result of
+    tokenize(source, backend) and save lexing the source again. type_table,
+    when given, supplies the struct types, as for a compilation built in parts.
+    """
+    builder = None
+    try:
+        builder = DirectASTBuilder(tokens or tokenize(source, backend), type_table)
+        return builder.program()
+    except _Reject:
+        pass
+    except Exception:
+        # Lexer errors: TyCParser decides whether a syntax error comes first
+        if builder is not None:
+            raise
+    parse_ll(POOL.parser(source, backend))
+    # TyCParser accepted a program the builder cannot represent
+    raise UnsupportedConstruct(builder.tokens[builder.furthest])
+
+
+def measure_build_memory(lines: int = 2_000) -> dict:
+    """Peak traced memory, live blocks and seconds to get a generated program's AST or parse tree.
+
+    The parse-tree figures do not include ASTGeneration, which would add the
+    AST on top of the tree, so the ratios to the direct build are lower bounds.
+    """
+    import time
+    import tracemalloc
+
+    from src.utils.node_memory import generate_expression_source
+    from src.utils.parsing import parse_source
+
+    source = generate_expression_source(lines)
+    steps = {
+        "parse-tree": lambda: parse_source(source),
+        "direct": lambda: build_ast(source),
+    }
+    result = {"lines": lines}
+    for name, step in steps.items():
+        # The first, untraced run also warms the parser's DFA cache
+        start = time.perf_counter()
+        step()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        try:
+            tree = step()
+            peak = tracemalloc.get_traced_memory()[1]
+            blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        finally:
+            tracemalloc.stop()
+        del tree
+        result[name] = {"peak": peak, "blocks": blocks, "seconds": elapsed}
+    return result
+
+
+if __name__ == "__main__":
+    result = measure_build_memory()
+    tree, direct = result["parse-tree"], result["direct"]
+    print(f"generated program: {result['lines']} lines")
+    print(f"parse tree:  peak {tree['peak'] / 2**20:.1f} MiB, {tree['blocks']} live blocks, {tree['seconds']:.2f} s")
+    print(f"direct AST:  peak {direct['peak'] / 2**20:.1f} MiB, {direct['blocks']} live blocks, {direct['seconds']:.2f} s")
+    print(f"peak memory ratio: {direct['peak'] / tree['peak']:.2f}, live blocks ratio: {direct['blocks'] / tree['blocks']:.2f}")
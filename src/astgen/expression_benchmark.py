@@ -0,0 +1,124 @@
+"""
+Expression parsing benchmark for TyC programming language.
+This module times DirectASTBuilder's precedence-climbing expression parser
+(src.astgen.direct_builder) against CascadeASTBuilder, which parses
+expressions with one method per precedence level of TyC.g4 as the grammar's
+expression rules do, and against TyCParser on the same generated program.
+"""
+
+import time
+
+from build.TyCParser import TyCParser
+from src.astgen.direct_builder import ASSIGN, ASSIGNMENT, DEC, DOT, ID, INC, DirectASTBuilder, tokenize
+from src.utils.node_memory import generate_expression_source
+from src.utils.nodes import AssignExpr, BinaryOp, Identifier, MemberAccess, PrefixOp
+from src.utils.parsing import parse_source
+
+
+# Binary operator levels of TyC.g4, lowest precedence first
+OR_OPS = {TyCParser.OR: "||"}
+AND_OPS = {TyCParser.AND: "&&"}
+EQUALITY_OPS = {TyCParser.EQ: "==", TyCParser.NEQ: "!="}
+RELATIONAL_OPS = {TyCParser.LT: "<", TyCParser.LE: "<=", TyCParser.GT: ">", TyCParser.GE: ">="}
+ADDITIVE_OPS = {TyCParser.PLUS: "+", TyCParser.MINUS: "-"}
+MULTIPLICATIVE_OPS = {TyCParser.MUL: "*", TyCParser.DIV: "/", TyCParser.MOD: "%"}
+UNARY_OPS = {TyCParser.PLUS: "+", TyCParser.MINUS: "-", TyCParser.NOT: "!", INC: "++", DEC: "--"}
+
+
+class CascadeASTBuilder(DirectASTBuilder):
+    """DirectASTBuilder parsing expressions with one method per precedence level of TyC.g4.
+
+    The baseline of measure_expression_parsing; builds the same AST.
+    """
+
+    def _expr(self, min_precedence: int = ASSIGNMENT):
+        return self._assign_expr()
+
+    def _assign_expr(self):
+        # lvalue: ID (DOT ID)* followed by ASSIGN
+        types = self.types
+        if types[self.pos] == ID:
+            end = self.pos + 1
+            while types[end] == DOT and types[end + 1] == ID:
+                end += 2
+            if types[end] == ASSIGN:
+                tokens = self.tokens
+                start = tokens[self.pos]
+                lhs = self._at(Identifier(start.text), start)
+                for index in range(self.pos + 2, end, 2):
+                    lhs = self._at(MemberAccess(lhs, tokens[index].text), start)
+                self.pos = end + 1
+                return self._at(AssignExpr(lhs, self._assign_expr()), start)
+        return self._logical_or()
+
+    def _binary(self, operators: dict, operand):
+        start = self.tokens[self.pos]
+        left = operand()
+        operator = operators.get(self.types[self.pos])
+        while operator is not None:
+            self.pos += 1
+            left = self._at(BinaryOp(left, operator, operand()), start)
+            operator = operators.get(self.types[self.pos])
+        return left
+
+    def _logical_or(self):
+        return self._binary(OR_OPS, self._logical_and)
+
+    def _logical_and(self):
+        return self._binary(AND_OPS, self._equality)
+
+    def _equality(self):
+        return self._binary(EQUALITY_OPS, self._relational)
+
+    def _relational(self):
+        return self._binary(RELATIONAL_OPS, self._additive)
+
+    def _additive(self):
+        return self._binary(ADDITIVE_OPS, self._multiplicative)
+
+    def _multiplicative(self):
+        return self._binary(MULTIPLICATIVE_OPS, self._unary)
+
+    def _unary(self):
+        operator = UNARY_OPS.get(self.types[self.pos])
+        if operator is None:
+            return self._postfix()
+        start = self.tokens[self.pos]
+        self.pos += 1
+        return self._at(PrefixOp(operator, self._unary()), start)
+
+
+def measure_expression_parsing(lines: int = 2_000, repeat: int = 3) -> dict:
+    """Best-of-repeat seconds to turn an expression-heavy program's tokens into an AST.
+
+    "cascade" parses expressions with one method per precedence level and
+    "precedence" by precedence climbing; "parse-tree" is TyCParser (two-stage,
+    lexing included) for reference.
+    """
+    source = generate_expression_source(lines)
+    tokens = tokenize(source)
+    steps = {
+        "parse-tree": lambda: parse_source(source),
+        "cascade": lambda: CascadeASTBuilder(tokens).program(),
+        "precedence": lambda: DirectASTBuilder(tokens).program(),
+    }
+    result = {"lines": lines, "tokens": len(tokens)}
+    for name, step in steps.items():
+        step()  # warm-up, also fills the parser's DFA cache
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            step()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        result[name] = best
+    return result
+
+
+if __name__ == "__main__":
+    timings = measure_expression_parsing()
+    print(f"expression parsing ({timings['tokens']} tokens):")
+    print(f"  TyCParser parse tree:     {timings['parse-tree'] * 1000:.0f} ms")
+    print(f"  precedence-level cascade: {timings['cascade'] * 1000:.0f} ms")
+    print(f"  precedence climbing:      {timings['precedence'] * 1000:.0f} ms")
+    print(f"  speed-up over cascade:    {timings['cascade'] / timings['precedence']:.2f}x")
@@ -0,0 +1,206 @@
+"""
+Incremental AST builder for TyC programming language.
+This module keeps the ASTs of a program's top-level declarations between
+builds, so after an edit only the declarations whose text changed are
+lexed and parsed again.
+
+The source is split at declaration boundaries with the structural pre-scan
+of src.astgen.parallel_builder. Each span is keyed by its text and the
+column it starts at; a span seen in the previous build reuses that build's
+declarations, or a copy of them with shifted lines when the span has moved
+up or down, so a Program returned earlier never changes. Other spans are built with the direct builder, padded so their
+nodes get absolute positions. Hashing and the pre-scan are linear in the
+file but run at C speed, so the cost of a rebuild follows the size of the
+edit rather than the size of the file.
+
+When the braces do not balance or a changed span does not build on its
+own, the whole source is built with build_ast, which also raises the
+sequential builder's errors; the declarations kept so far stay cached for
+the next build.
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+from src.astgen.direct_builder import DirectASTBuilder, build_ast, tokenize
+from src.astgen.parallel_builder import split_declarations
+from src.utils.nodes import ASTNode, Program, Type, TypeTable
+
+
+class IncrementalBuilder:
+    """Builds successive versions of one program, reusing unchanged declarations.
+
+    After each build, reused and rebuilt count the declaration spans taken
+    from the previous build and built again, and seconds is the build time.
+    Reused declarations that did not move are shared with the Program the
+    previous build returned; moved maps each copied top-level declaration
+    to the previous build's declaration it was copied from.
+    """
+
+    def __init__(self, backend: str = None):
+        self.backend = backend
+        # Struct types of the program, shared by every build
+        self.type_table = TypeTable()
+        # (start column, span text) -> [(start line, span Program), ...]
+        self._spans: Dict[Tuple[int, str], List[Tuple[int, Program]]] = {}
+        self.reused = 0
+        self.rebuilt = 0
+        self.seconds = 0.0
+        self.moved: Dict[ASTNode, ASTNode] = {}
+
+    def build(self, source: str) -> Program:
+        """AST of source; returns what build_ast returns and raises what it raises."""
+        start = time.perf_counter()
+        try:
+            return self._build(source)
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    def _build(self, source: str) -> Program:
+        self.reused = self.rebuilt = 0
+        self.moved = {}
+        starts = split_declarations(source)
+        if starts is None:
+            self.rebuilt = 1
+            return build_ast(source, self.backend, type_table=self.type_table)
+        starts.append(len(source))
+        previous = self._spans
+        spans = {}
+        parts = []
+        moved = []
+        line = 1
+        for before, begin, end in zip([0] + starts, starts, starts[1:]):
+            line += source.count("\n", before, begin)
+            text = source[begin:end]
+            if not text or text.isspace():
+                continue
+            column = begin - (source.rfind("\n", 0, begin) + 1)
+            key = (column, text)
+            # Identical spans each take their own cached copy
+            cached = previous.get(key, ())
+            taken = len(spans.get(key, ()))
+            if taken < len(cached):
+                old_line, part = cached[taken]
+                if old_line != line:
+                    moved.append((len(parts), part, line - old_line))
+                self.reused += 1
+            else:
+                try:
+                    part = self._build_span(text, line, column)
+                except Exception:
+                    # Not buildable on its own: the whole source decides
+                    self.rebuilt = 1
+                    return build_ast(source, self.backend, type_table=self.type_table)
+                self.rebuilt += 1
+            spans.setdefault(key, []).append((line, len(parts)))
+            parts.append(part)
+        # Moved spans are only copied once every span has built
+        for index, part, delta in moved:
+            copy = parts[index] = _shifted_copy(part, delta)
+            self.moved.update(zip(copy.decls, part.decls))
+        for key, cached in spans.items():
+            spans[key] = [(line, parts[index]) for line, index in cached]
+        self._spans = spans
+        if not parts:
+            return build_ast(source, self.backend, type_table=self.type_table)
+        program = Program([decl for part in parts for decl in part.decls])
+        program.line, program.column = parts[0].line, parts[0].column
+        return program
+
+    def _build_span(self, text: str, line: int, column: int) -> Program:
+        padded = "\n" * (line - 1) + " " * column + text
+        return DirectASTBuilder(tokenize(padded, self.backend), self.type_table).program()
+
+
+def _fields(node_class: type) -> tuple:
+    """Slot names of node_class other than line and column, base class fields first."""
+    fields = _FIELDS.get(node_class)
+    if fields is None:
+        fields = _FIELDS[node_class] = tuple(
+            field
+            for klass in reversed(node_class.__mro__[:-1])
+            for field in klass.__dict__.get("__slots__", ())
+            if field not in ("line", "column")
+        )
+    return fields
+
+
+_FIELDS: Dict[type, tuple] = {}
+
+
+def _shifted_copy(root: ASTNode, delta: int) -> ASTNode:
+    """Copy of root's subtree with its lines moved by delta; type nodes stay shared."""
+    result = [None]
+    # Entries are (node, the list or node to store its copy in, index or field)
+    stack = [(root, result, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, target, key = pop()
+        node_class = type(node)
+        copy = node_class.__new__(node_class)
+        line = node.line
+        copy.line = line if line is None else line + delta
+        copy.column = node.column
+        for field in _fields(node_class):
+            value = getattr(node, field)
+            if type(value) is list:
+                items = value[:]
+                for index, item in enumerate(items):
+                    if isinstance(item, ASTNode) and not isinstance(item, Type):
+                        push((item, items, index))
+                value = items
+            elif isinstance(value, ASTNode) and not isinstance(value, Type):
+                push((value, copy, field))
+            setattr(copy, field, value)
+        if type(target) is list:
+            target[key] = copy
+        else:
+            setattr(target, key, copy)
+    return result[0]
+
+
+def measure_incremental_build(sizes=(1_000, 4_000, 16_000), repeat: int = 3) -> dict:
+    """Best-of-repeat seconds to rebuild generated programs after a one-function edit.
+
+    "edit" changes a literal in the first function; "insert" adds a line to
+    it, so every later declaration moves down and has its lines shifted.
+    For each size the result has the full build_ast time and, per edit, the
+    incremental rebuild time and how many spans were rebuilt and reused.
+    """
+    from src.utils.node_memory import generate_source
+
+    result = {}
+    for lines in sizes:
+        source = generate_source(lines)
+        edits = {
+            "edit": source.replace("b * 2", "b * 3", 1),
+            "insert": source.replace("{\n", "{\n    int inserted = 1;\n", 1),
+        }
+        full = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build_ast(source)
+            elapsed = time.perf_counter() - start
+            full = elapsed if full is None else min(full, elapsed)
+        result[lines] = {"full": full}
+        for name, edited in edits.items():
+            builder = IncrementalBuilder()
+            best = None
+            for _ in range(repeat):
+                builder.build(source)
+                builder.build(edited)
+                best = builder.seconds if best is None else min(best, builder.seconds)
+            result[lines][name] = {"seconds": best, "rebuilt": builder.rebuilt, "reused": builder.reused}
+    return result
+
+
+if __name__ == "__main__":
+    for lines, timings in measure_incremental_build().items():
+        print(f"{lines} lines: full build {timings['full'] * 1000:.0f} ms")
+        for name in ("edit", "insert"):
+            edit = timings[name]
+            print(
+                f"  {name:6} incremental {edit['seconds'] * 1000:.1f} ms "
+                f"({edit['rebuilt']} declaration(s) rebuilt, {edit['reused']} reused)"
+            )
@@ -0,0 +1,174 @@
+"""
+Parallel AST builder for TyC programming language.
+This module splits a program at its top-level declaration boundaries,
+builds the AST of each chunk with the direct builder in a process pool and
+stitches the declarations back into one Program.
+
+The boundaries come from a pre-scan of the structural tokens (`{`, `}` and
+`;`, skipping comments and string literals): a declaration starts after a
+`}` or `;` at brace depth 0, where the `;` that ends a struct declaration
+belongs to the declaration before it. Each chunk is padded with the
+newlines and spaces that precede it in the source, so its nodes carry
+absolute line and column numbers without a pass over the tree. Workers
+send their declarations back in the binary AST format.
+
+When the split is ambiguous (unbalanced braces, a stray `}`) or any chunk
+fails to lex or parse (an error, or a `;` at depth 0 inside a one-statement
+function body such as `f() if (x) return 1; else return 2;`), the whole
+source is built sequentially with build_ast instead, so results and error
+messages are always those of the sequential builder.
+"""
+
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional
+
+from src.astgen.direct_builder import DirectASTBuilder, build_ast, tokenize
+from src.utils.ast_binary import dumps, loads
+from src.utils.nodes import Program, TypeTable
+
+
+# Chunks per worker: more chunks balance uneven declarations, fewer save overhead
+CHUNKS_PER_WORKER = 2
+# Smaller sources are not worth a process pool
+MIN_CHUNK_CHARS = 16_384
+
+# Comments and string literals are matched whole so their braces do not count
+_STRUCTURE = re.compile(r'/\*.*?\*/|//[^\r\n]*|"(?:[^"\\\r\n]|\\.)*"?|[{};]', re.DOTALL)
+
+
+def split_declarations(source: str) -> Optional[List[int]]:
+    """Offsets at which top-level declarations start, or None when braces do not balance."""
+    starts = [0]
+    depth = 0
+    pending = None  # end of a `}` at depth 0, unless a `;` follows
+    for match in _STRUCTURE.finditer(source):
+        text = match.group()
+        if text == "{":
+            depth += 1
+        elif text == "}":
+            depth -= 1
+            if depth < 0:
+                return None
+            if depth == 0:
+                pending = match.end()
+                continue
+        elif text == ";":
+            if depth == 0:
+                if pending is not None and source[pending : match.start()].strip():
+                    starts.append(pending)
+                starts.append(match.end())
+                pending = None
+                continue
+        elif text[0] == "/":
+            continue
+        if pending is not None:
+            starts.append(pending)
+            pending = None
+    if depth != 0:
+        return None
+    if pending is not None:
+        starts.append(pending)
+    return starts
+
+
+def split_chunks(source: str, starts: List[int], count: int) -> List[str]:
+    """source cut at declaration starts into about count chunks of similar size.
+
+    Each chunk is prefixed with one newline per preceding line and one space
+    per preceding column, so its tokens keep their positions in source.
+    """
+    size = len(source) / count
+    cuts = [0]
+    for start in starts[1:]:
+        if start >= size * len(cuts) and start < len(source):
+            cuts.append(start)
+    cuts.append(len(source))
+    chunks = []
+    line = 0
+    for previous, begin, end in zip([0] + cuts, cuts, cuts[1:]):
+        line += source.count("\n", previous, begin)
+        column = begin - (source.rfind("\n", 0, begin) + 1)
+        chunks.append("\n" * line + " " * column + source[begin:end])
+    return chunks
+
+
+def _build_chunk(chunk: str, backend: str = None) -> bytes:
+    # Errors propagate to build_ast_parallel, which falls back to build_ast
+    return dumps(DirectASTBuilder(tokenize(chunk, backend)).program())
+
+
+def build_ast_parallel(
+    source: str,
+    workers: int = None,
+    backend: str = None,
+    executor: Executor = None,
+    min_chunk_chars: int = MIN_CHUNK_CHARS,
+) -> Program:
+    """AST of source built one chunk of declarations per task in a process pool.
+
+    workers defaults to the number of CPUs; pass executor to reuse a pool
+    across calls. Returns what build_ast returns and raises what it raises.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = min(workers * CHUNKS_PER_WORKER, len(source) // max(min_chunk_chars, 1))
+    starts = split_declarations(source) if workers > 1 and count > 1 else None
+    if starts is None or len(starts) < 2:
+        return build_ast(source, backend)
+    chunks = split_chunks(source, starts, count)
+    if len(chunks) < 2:
+        return build_ast(source, backend)
+    pool = executor or ProcessPoolExecutor(min(workers, len(chunks)))
+    try:
+        parts = list(pool.map(_build_chunk, chunks, [backend] * len(chunks)))
+    except Exception:
+        # Ambiguous split or an error: the sequential build decides and reports it
+        return build_ast(source, backend)
+    finally:
+        if executor is None:
+            pool.shutdown()
+    # The chunks share one set of struct types
+    type_table = TypeTable()
+    program = loads(parts[0], type_table)
+    for part in parts[1:]:
+        program.decls.extend(loads(part, type_table).decls)
+    return program
+
+
+def measure_parallel_build(lines: int = 5_000, workers: int = None, repeat: int = 3) -> dict:
+    """Best-of-repeat seconds to build a generated program's AST sequentially and in parallel.
+
+    The pool is started (and its workers forked) before timing, as a
+    long-running tool would reuse it.
+    """
+    import time
+
+    from src.utils.node_memory import generate_expression_source
+
+    workers = workers or os.cpu_count() or 1
+    source = generate_expression_source(lines)
+    result = {"lines": lines, "workers": workers}
+    with ProcessPoolExecutor(workers) as executor:
+        steps = {
+            "sequential": lambda: build_ast(source),
+            "parallel": lambda: build_ast_parallel(source, workers, executor=executor, min_chunk_chars=1),
+        }
+        for name, step in steps.items():
+            step()  # warm-up, also starts the workers
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                step()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            result[name] = best
+    return result
+
+
+if __name__ == "__main__":
+    result = measure_parallel_build()
+    print(f"generated program: {result['lines']} lines, {result['workers']} worker(s)")
+    print(f"sequential direct build: {result['sequential'] * 1000:.0f} ms")
+    print(f"parallel direct build:   {result['parallel'] * 1000:.0f} ms")
+    print(f"speed-up: {result['sequential'] / result['parallel']:.2f}x")
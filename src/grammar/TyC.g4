@@ -22,6 +22,23 @@ def emit(self):
      
 }
 
+@parser::header {
+from antlr4.error.Errors import InputMismatchException
+}
+
+@parser::members {
+def requireReturn(self, localctx):
+    # A braced typed-function block needs a `return expr;` among its own
+    # statements. It is checked once the block is parsed: placing the return
+    # in the block rule itself needs lookahead to the end of the block.
+    for stmt in localctx.getTypedRuleContexts(TyCParser.StmtContext):
+        if stmt.returnStmt() is not None:
+            return
+    e = InputMismatchException(self)
+    e.offendingToken = self._input.LT(-1)  # the closing brace
+    raise e
+}
+
 
 options{
 	language=Python3;
@@ -128,8 +145,9 @@ voidFuncDecl
   : VOID ID LPAREN paramList? RPAREN  voidBlock
   ;
 
+// A function without a type is a typeInferFuncDecl: its body is also a typeInferBlock
 funcDecl
-  : type? ID LPAREN paramList? RPAREN block
+  : type ID LPAREN paramList? RPAREN block
   ;
 
 
@@ -157,11 +175,6 @@ structMemberDecl
   : type ID SEMI        // no AUTO here
   ;
 
-structInit
-  : structInitNoSemi SEMI
-  ;
-
-
 // Variable Declaration Rules
   varDecl
   : varDeclNoSemi SEMI
@@ -249,19 +262,14 @@ forUpdate
   : expr
   ;
 
+// `type ID = {...}` initializes with a structLit expression
 varDeclNoSemi
   : type ID (ASSIGN expr)?
   | AUTO ID (ASSIGN expr)?
-  | structInitNoSemi
-  ;
-
-structInitNoSemi
-  : type ID ASSIGN LBRACE exprList? RBRACE
   ;
 
 initElem
-  : expr
-  | structLit
+  : expr                // nested struct literals are expressions too
   ;
 
 initList
@@ -325,26 +333,46 @@ voidStmt
   | voidReturnStmt
   ;
 // Code Block Rules
+// A block is braced or a single statement. Nested items are braced only:
+// a statement item that may also be a one-statement block is ambiguous
+// until the end of the statement.
 block
-  : LBRACE (varDecl | stmt | block)* returnStmt (varDecl | stmt | block)*RBRACE
+  : bracedBlock
   | stmt
   ;
 
+// Must contain a top-level returnStmt, see requireReturn
+bracedBlock
+  : LBRACE (varDecl | stmt | bracedBlock)* RBRACE {self.requireReturn($ctx)}
+  ;
+
 typeInferBlock
-  : LBRACE (varDecl | stmt | typeInferBlock)* RBRACE
+  : bracedTypeInferBlock
   | stmt
   ;
 
+bracedTypeInferBlock
+  : LBRACE (varDecl | stmt | bracedTypeInferBlock)* RBRACE
+  ;
+
 loopBlock
-  : LBRACE (varDecl | stmt | breakStmt | continueStmt | loopBlock)* RBRACE
+  : bracedLoopBlock
   | stmt
-  ; 
+  ;
+
+bracedLoopBlock
+  : LBRACE (varDecl | stmt | breakStmt | continueStmt | bracedLoopBlock)* RBRACE
+  ;
 
 // Void Block Rules
 voidBlock
-  : LBRACE (varDecl | voidStmt | voidBlock)* RBRACE
+  : bracedVoidBlock
   | voidStmt
   ;
+
+bracedVoidBlock
+  : LBRACE (varDecl | voidStmt | bracedVoidBlock)* RBRACE
+  ;
 // Whitespace
 WS : [ \t\r\n\f]+ -> skip ; // skip spaces, tabs
 
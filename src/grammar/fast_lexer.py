@@ -0,0 +1,266 @@
+"""
+Hand-written fast-path lexer for TyC programming language.
+This module contains TyCFastLexer, a table-driven scanner that recognizes
+exactly the token set of TyC.g4 and can be used in place of the generated
+TyCLexer by CommonTokenStream and TyCParser.
+"""
+
+import re
+
+from antlr4 import InputStream, Token
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Lexer import TokenSource
+
+from build.TyCLexer import TyCLexer
+from lexererr import ErrorToken, IllegalEscape, UncloseString
+
+
+KEYWORDS = {
+    "auto": TyCLexer.AUTO,
+    "break": TyCLexer.BREAK,
+    "case": TyCLexer.CASE,
+    "continue": TyCLexer.CONTINUE,
+    "default": TyCLexer.DEFAULT,
+    "else": TyCLexer.ELSE,
+    "float": TyCLexer.FLOAT,
+    "for": TyCLexer.FOR,
+    "if": TyCLexer.IF,
+    "int": TyCLexer.INT,
+    "return": TyCLexer.RETURN,
+    "string": TyCLexer.STRING,
+    "struct": TyCLexer.STRUCT,
+    "switch": TyCLexer.SWITCH,
+    "void": TyCLexer.VOID,
+    "while": TyCLexer.WHILE,
+}
+
+# Operators and separators: first character -> (single-char type, {second char: two-char type})
+OPERATORS = {
+    "+": (TyCLexer.PLUS, {"+": TyCLexer.INC}),
+    "*": (TyCLexer.MUL, {}),
+    "%": (TyCLexer.MOD, {}),
+    "=": (TyCLexer.ASSIGN, {"=": TyCLexer.EQ}),
+    "!": (TyCLexer.NOT, {"=": TyCLexer.NEQ}),
+    "<": (TyCLexer.LT, {"=": TyCLexer.LE}),
+    ">": (TyCLexer.GT, {"=": TyCLexer.GE}),
+    "|": (TyCLexer.ERROR_CHAR, {"|": TyCLexer.OR}),
+    "&": (TyCLexer.ERROR_CHAR, {"&": TyCLexer.AND}),
+    "[": (TyCLexer.LBRACK, {}),
+    "]": (TyCLexer.RBRACK, {}),
+    "{": (TyCLexer.LBRACE, {}),
+    "}": (TyCLexer.RBRACE, {}),
+    "(": (TyCLexer.LPAREN, {}),
+    ")": (TyCLexer.RPAREN, {}),
+    ";": (TyCLexer.SEMI, {}),
+    ",": (TyCLexer.COMMA, {}),
+    ":": (TyCLexer.COLON, {}),
+}
+
+# Character classes used by the first-character dispatch table
+CC_OTHER = 0
+CC_WS = 1
+CC_ID = 2
+CC_DIGIT = 3
+CC_OPERATOR = 4
+CC_MINUS = 5
+CC_DOT = 6
+CC_SLASH = 7
+CC_QUOTE = 8
+
+CHAR_CLASS = [CC_OTHER] * 256
+for _c in " \t\r\n\f":
+    CHAR_CLASS[ord(_c)] = CC_WS
+for _c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_":
+    CHAR_CLASS[ord(_c)] = CC_ID
+for _c in "0123456789":
+    CHAR_CLASS[ord(_c)] = CC_DIGIT
+for _c in OPERATORS:
+    CHAR_CLASS[ord(_c)] = CC_OPERATOR
+CHAR_CLASS[ord("-")] = CC_MINUS
+CHAR_CLASS[ord(".")] = CC_DOT
+CHAR_CLASS[ord("/")] = CC_SLASH
+CHAR_CLASS[ord('"')] = CC_QUOTE
+
+# Longest-match tails for the multi-character token rules
+WS_RE = re.compile(r"[ \t\r\n\f]+")
+ID_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+NUMBER_RE = re.compile(
+    r"-?(?:[0-9]+(?:\.(?:[0-9]+(?:[eE][+-]?[0-9]+)?)?|[eE][+-]?[0-9]+)?"
+    r"|\.[0-9]+(?:[eE][+-]?[0-9]+)?)"
+)
+STR_BODY_RE = re.compile(r'(?:[^"\\\r\n]|\\[bfnrt"\\])*')
+LINE_CMT_RE = re.compile(r"//[^\r\n]*")
+
+
+class TyCFastLexer(TokenSource):
+    """Drop-in replacement for the generated TyCLexer.
+
+    Produces the same CommonToken stream (types, text, start/stop, line and
+    column) and raises the same lexererr exceptions as TyCLexer. As in
+    TyCLexer, the offending token of such an exception is left in _token.
+    """
+
+    grammarFileName = TyCLexer.grammarFileName
+    literalNames = TyCLexer.literalNames
+    symbolicNames = TyCLexer.symbolicNames
+    ruleNames = TyCLexer.ruleNames
+
+    def __init__(self, input: InputStream = None):
+        self._factory = CommonTokenFactory.DEFAULT
+        self.inputStream = input
+
+    @property
+    def inputStream(self):
+        return self._input
+
+    @inputStream.setter
+    def inputStream(self, input: InputStream):
+        self._input = input
+        self._tokenFactorySourcePair = (self, input)
+        self.reset()
+
+    def setInputStream(self, input: InputStream):
+        self.inputStream = input
+
+    @property
+    def sourceName(self):
+        return self._input.sourceName
+
+    def reset(self):
+        self._data = self._input.strdata if self._input is not None else ""
+        self._pos = 0
+        self.line = 1
+        self.column = 0
+        self._token = None
+
+    def getCharIndex(self):
+        return self._pos
+
+    def getAllTokens(self):
+        tokens = []
+        t = self.nextToken()
+        while t.type != Token.EOF:
+            tokens.append(t)
+            t = self.nextToken()
+        return tokens
+
+    def _advance(self, end: int):
+        """Move past data[pos:end], keeping line/column in sync with the ATN lexer."""
+        data = self._data
+        newlines = data.count("\n", self._pos, end)
+        if newlines:
+            self.line += newlines
+            self.column = end - data.rfind("\n", self._pos, end) - 1
+        else:
+            self.column += end - self._pos
+        self._pos = end
+
+    def _emit(self, ttype: int, end: int, text: str = None):
+        start, line, column = self._pos, self.line, self.column
+        self._advance(end)
+        return self._factory.create(
+            self._tokenFactorySourcePair,
+            ttype,
+            text,
+            Token.DEFAULT_CHANNEL,
+            start,
+            end - 1,
+            line,
+            column,
+        )
+
+    def nextToken(self):
+        data = self._data
+        size = len(data)
+        while True:
+            pos = self._pos
+            if pos >= size:
+                return self._factory.create(
+                    self._tokenFactorySourcePair,
+                    Token.EOF,
+                    None,
+                    Token.DEFAULT_CHANNEL,
+                    pos,
+                    pos - 1,
+                    self.line,
+                    self.column,
+                )
+
+            c = data[pos]
+            code = ord(c)
+            cc = CHAR_CLASS[code] if code < 256 else CC_OTHER
+
+            if cc == CC_WS:
+                self._advance(WS_RE.match(data, pos).end())
+                continue
+
+            if cc == CC_ID:
+                end = ID_RE.match(data, pos).end()
+                return self._emit(KEYWORDS.get(data[pos:end], TyCLexer.ID), end)
+
+            if cc == CC_OPERATOR:
+                single, double = OPERATORS[c]
+                if pos + 1 < size and data[pos + 1] in double:
+                    return self._emit(double[data[pos + 1]], pos + 2)
+                if single == TyCLexer.ERROR_CHAR:
+                    return self._error_char(pos)
+                return self._emit(single, pos + 1)
+
+            if cc == CC_DIGIT or cc == CC_MINUS or cc == CC_DOT:
+                m = NUMBER_RE.match(data, pos)
+                if m is not None:
+                    text = m.group()
+                    if "." in text or "e" in text or "E" in text:
+                        return self._emit(TyCLexer.FLOAT_LIT, m.end())
+                    return self._emit(TyCLexer.INT_LIT, m.end())
+                if cc == CC_DOT:
+                    return self._emit(TyCLexer.DOT, pos + 1)
+                if data.startswith("--", pos):
+                    return self._emit(TyCLexer.DEC, pos + 2)
+                return self._emit(TyCLexer.MINUS, pos + 1)
+
+            if cc == CC_SLASH:
+                if data.startswith("/*", pos):
+                    close = data.find("*/", pos + 2)
+                    if close != -1:
+                        self._advance(close + 2)
+                        continue
+                elif data.startswith("//", pos):
+                    self._advance(LINE_CMT_RE.match(data, pos).end())
+                    continue
+                return self._emit(TyCLexer.DIV, pos + 1)
+
+            if cc == CC_QUOTE:
+                return self._string(pos)
+
+            return self._error_char(pos)
+
+    def _error_char(self, pos: int):
+        token = self._emit(TyCLexer.ERROR_CHAR, pos + 1)
+        self._token = token
+        raise ErrorToken(token.text)
+
+    def _string(self, pos: int):
+        data = self._data
+        end = STR_BODY_RE.match(data, pos + 1).end()
+        if end == len(data):
+            token = self._emit(TyCLexer.UNCLOSE_STRING, end, data[pos + 1 : end])
+            self._token = token
+            raise UncloseString(token.text)
+        stop = data[end]
+        if stop == '"':
+            return self._emit(TyCLexer.STRING_LIT, end + 1, data[pos + 1 : end])
+        if stop == "\r" or stop == "\n":
+            token = self._emit(
+                TyCLexer.UNCLOSE_STRING, end + 1, data[pos + 1 : end + 1]
+            )
+            self._token = token
+            raise UncloseString(token.text)
+        # stop is a backslash that does not start a valid escape
+        if end + 1 < len(data):
+            token = self._emit(
+                TyCLexer.ILLEGAL_ESCAPE, end + 2, data[pos + 1 : end + 2]
+            )
+            self._token = token
+            raise IllegalEscape(token.text)
+        return self._error_char(pos)
@@ -0,0 +1,162 @@
+"""
+Call graph for TyC programming language.
+This module builds the graph of calls between a program's functions and
+splits it into strongly connected components, so semantic analysis can type
+callees before their callers: a function's inferred return type (spec
+Rule 5) is then known wherever it is called, except inside a group of
+mutually recursive functions, which are typed together.
+
+Both steps are linear in the size of the program. The components come out
+of an iterative Tarjan's algorithm, callees first, and never recurse, so
+call chains thousands of functions long are fine.
+"""
+
+from typing import Dict, List
+
+from src.utils.nodes import FuncCall, FuncDecl, Program, ReturnStmt
+from src.utils.walker import walk
+
+
+class CallGraph:
+    """Calls between the functions of a program, by name, in source order."""
+
+    def __init__(self):
+        # function name -> FuncDecl, in source order
+        self.functions: Dict[str, FuncDecl] = {}
+        # function name -> distinct declared functions it calls, in first-call order
+        self.callees: Dict[str, List[str]] = {}
+        # function name -> the callees its return type can depend on: for an
+        # inferred function those called up to and including its first
+        # `return expr;`, for the others all of them
+        self.leading_callees: Dict[str, List[str]] = {}
+
+    def components(self) -> List[List[str]]:
+        """strongly_connected_components of the graph."""
+        return strongly_connected_components(self.callees)
+
+
+def _called(root, functions: dict = None, until_return: bool = False) -> List[str]:
+    # Without functions, every called name is kept, builtins included
+    names = {}
+    for node in walk(root):
+        if type(node) is FuncCall and (functions is None or node.name in functions):
+            names[node.name] = None
+        elif until_return and type(node) is ReturnStmt and node.expr is not None:
+            names.update(dict.fromkeys(_called(node.expr, functions)))
+            break
+    return list(names)
+
+
+def build_call_graph(program: Program) -> CallGraph:
+    """The call graph of program's functions; calls to builtins or undeclared functions are left out."""
+    graph = CallGraph()
+    functions = graph.functions
+    for decl in program.decls:
+        if type(decl) is FuncDecl:
+            functions[decl.name] = decl
+    for name, decl in functions.items():
+        callees = graph.callees[name] = _called(decl.body, functions)
+        if decl.return_type is None:
+            graph.leading_callees[name] = _called(decl.body, functions, until_return=True)
+        else:
+            graph.leading_callees[name] = callees
+    return graph
+
+
+def strongly_connected_components(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """Strongly connected components of graph, each listed after every component it reaches.
+
+    graph maps each node to its successors; members of a component keep the
+    order of graph's keys.
+    """
+    position = {node: index for index, node in enumerate(graph)}
+    index_of: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    components = []
+    for root in graph:
+        if root in index_of:
+            continue
+        # Each frame is (node, iterator over its successors)
+        index_of[root] = lowlink[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        frames = [(root, iter(graph[root]))]
+        while frames:
+            node, successors = frames[-1]
+            for successor in successors:
+                if successor not in index_of:
+                    index_of[successor] = lowlink[successor] = len(index_of)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    frames.append((successor, iter(graph[successor])))
+                    break
+                if successor in on_stack and index_of[successor] < lowlink[node]:
+                    lowlink[node] = index_of[successor]
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.sort(key=position.__getitem__)
+                    components.append(component)
+    return components
+
+
+def generate_call_chain_source(functions: int, cycle: int = 4) -> str:
+    """A program of functions without declared return types, each calling the next one.
+
+    Every function is declared before its callee, and every cycle-th one
+    also calls back to the first of its group after its first return,
+    making groups of mutually recursive functions. The last function
+    returns a float, so each caller's `auto` results are floats only once
+    its callee is typed.
+    """
+    lines = []
+    for i in range(functions - 1):
+        if cycle and i % cycle == cycle - 1:
+            body = f"if (n > 0) return r * 2; return f{i - cycle + 1}(n + 1);"
+        else:
+            body = "auto s = r * 2; return s;"
+        lines.append(f"f{i}(int n) {{ auto r = f{i + 1}(n - 1); {body} }}")
+    lines.append(f"f{functions - 1}(int n) {{ return n * 0.5; }}")
+    lines.append("void main() { printFloat(f0(10)); }")
+    return "\n".join(lines) + "\n"
+
+
+def measure_call_graph_inference(sizes=(1_000, 4_000, 16_000)) -> dict:
+    """Seconds to build the call graph and to infer all types of generate_call_chain_source programs."""
+    import time
+
+    from src.astgen.direct_builder import build_ast
+    from src.semantics.type_inference import infer_types
+
+    result = {}
+    for functions in sizes:
+        program = build_ast(generate_call_chain_source(functions))
+        start = time.perf_counter()
+        build_call_graph(program).components()
+        graph = time.perf_counter() - start
+        start = time.perf_counter()
+        infer_types(program)
+        result[functions] = {"graph": graph, "inference": time.perf_counter() - start}
+    return result
+
+
+if __name__ == "__main__":
+    for functions, timings in measure_call_graph_inference().items():
+        print(
+            f"{functions:>6} functions: call graph {timings['graph'] * 1000:7.1f} ms, "
+            f"type inference {timings['inference'] * 1000:8.1f} ms "
+            f"({timings['inference'] / functions * 1e6:.1f} us/function)"
+        )
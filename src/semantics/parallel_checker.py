@@ -0,0 +1,435 @@
+"""
+Parallel type checker for TyC programming language.
+This module type-checks the function bodies of a program in a process pool
+once the global signature table (struct layouts, parameter types, declared
+return types) is known, and reports the first static error of each
+function instead of stopping at the first one in the program.
+
+A body only depends on other functions through their return types, and a
+declared return type is in the signature table from the start. Functions
+whose return type is inferred are typed before their callers: the call
+graph (src.semantics.call_graph) is split into strongly connected
+components, and the components are checked in levels, a component going in
+the level after the last one holding a function with an inferred return
+type that it calls. The components of a level are independent; they are
+split into chunks of similar size and checked in workers with
+TypeInference. The functions reach each worker once per check: a pool
+that check_program starts by forking inherits them, and for an executor
+passed in they are written to a temporary file in the binary AST format
+(src.utils.ast_binary), which each worker loads on its first chunk of the
+check. A chunk then only carries the indices of its functions and the
+signatures they call. The return types inferred in one level are added to
+the signature table for the next.
+
+A component whose return type is left for its callers to bind (a
+`return x;` of an `auto x` only typed by a caller, as infer_types allows)
+is open: it and the components that call its inferred functions, directly
+or not, are deferred and checked after the last level, each group of them
+joined by such calls together in this process, as infer_types would check
+them. A component or group that fails gives one Diagnostic (kind SEMANTIC)
+at the offending node, and the components that call its inferred functions
+are not checked. Diagnostics are sorted by the
+position of their function in the program, whatever the order in which the
+workers finish, so a run gives the same result with any number of workers.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src.semantics.call_graph import build_call_graph
+from src.semantics.static_error import StaticError
+from src.semantics.type_inference import (
+    INT,
+    FLOAT,
+    STRING,
+    VOID,
+    Signatures,
+    TypeInference,
+    collect_signatures,
+)
+from src.utils.ast_binary import dump, load
+from src.utils.diagnostics import SEMANTIC, Diagnostic
+from src.utils.nodes import ASTNode, FuncDecl, Program, StructType, Type
+
+
+# Chunks per worker and level: more chunks balance uneven functions, fewer save overhead
+CHUNKS_PER_WORKER = 2
+# Levels with fewer functions are checked in this process
+MIN_PARALLEL_FUNCTIONS = 64
+
+_TYPE_NAMES = {INT: "int", FLOAT: "float", STRING: "string", VOID: "void"}
+_NAMED_TYPES = {name: type_node for type_node, name in _TYPE_NAMES.items()}
+
+
+class CheckResult:
+    """Diagnostics of a checked program and the return types it inferred."""
+
+    def __init__(self):
+        self.diagnostics: List[Diagnostic] = []
+        # inferred function name -> its return type, for the functions checked without error
+        self.return_types: Dict[str, Type] = {}
+
+    def __repr__(self):
+        return f"CheckResult({len(self.diagnostics)} diagnostics, {len(self.return_types)} return types)"
+
+
+def _encode_type(type_node: Optional[Type]) -> Optional[str]:
+    # Type nodes travel as names: primitives are constants, struct types compare by name
+    if type_node is None:
+        return None
+    if type(type_node) is StructType:
+        return type_node.struct_name
+    return _TYPE_NAMES[type_node]
+
+
+def _decode_type(name: Optional[str]) -> Optional[Type]:
+    if name is None:
+        return None
+    type_node = _NAMED_TYPES.get(name)
+    return type_node if type_node is not None else StructType(name)
+
+
+def diagnostic(error: StaticError, function: FuncDecl) -> Diagnostic:
+    """Diagnostic for error, at its node or else at the function it was found in."""
+    node = getattr(error, "node", None)
+    if not isinstance(node, ASTNode) or node.line is None:
+        node = function
+    return Diagnostic(SEMANTIC, node.line, node.column, type(error).__name__, str(error))
+
+
+def check_component(decls: List[FuncDecl], signatures: Signatures, called: bool = False):
+    """Type-check one strongly connected component; returns (return types, Diagnostic or None).
+
+    When called (other functions call it), a component that leaves an
+    inferred return type to its callers is open and gives (None, None).
+    """
+    signatures.inferred = {decl.name: decl for decl in decls if decl.return_type is None}
+    checker = TypeInference(signatures)
+    try:
+        types = checker.infer(Program(decls), open_returns=called)
+    except StaticError as e:
+        return {}, diagnostic(e, checker.function or decls[0])
+    if types is None:
+        return None, None
+    return {name: types[decl] for name, decl in signatures.inferred.items()}, None
+
+
+def deferred_groups(deferred: List[List[str]], callees: Dict[str, List[str]]) -> List[List[str]]:
+    """The deferred components joined through their calls, each group's functions callees first.
+
+    deferred lists the open components and their callers, callees first.
+    """
+    component_of = {name: index for index, component in enumerate(deferred) for name in component}
+    parent = list(range(len(deferred)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, component in enumerate(deferred):
+        for name in component:
+            for callee in callees[name]:
+                other = component_of.get(callee)
+                if other is not None:
+                    parent[find(other)] = find(index)
+    groups: Dict[int, List[str]] = {}
+    for index, component in enumerate(deferred):
+        groups.setdefault(find(index), []).extend(component)
+    return list(groups.values())
+
+
+def called_from_other_components(callees: Dict[str, List[str]], components: List[List[str]]) -> set:
+    """Names of the functions called from outside their own component."""
+    component_of = {name: index for index, component in enumerate(components) for name in component}
+    return {
+        callee
+        for name, names in callees.items()
+        for callee in names
+        if component_of[callee] != component_of[name]
+    }
+
+
+# (file, FuncDecls) of the program a worker last checked; set before forking a pool, the workers inherit it
+_loaded: Tuple[Optional[str], List[FuncDecl]] = (None, [])
+
+
+def _program_functions(path: str) -> List[FuncDecl]:
+    global _loaded
+    if _loaded[0] != path:
+        with open(path, "rb") as f:
+            _loaded = (path, load(f).decls)
+    return _loaded[1]
+
+
+def _check_chunk(path: str, structs: dict, functions: dict, components: List[List[int]], called: List[bool]) -> list:
+    # Runs in a worker: components hold indices into the functions inherited or written to path
+    decls = _program_functions(path)
+    signatures = Signatures()
+    for struct, members in structs.items():
+        signatures.structs[struct] = {name: _decode_type(member) for name, member in members.items()}
+    for name, (params, return_type) in functions.items():
+        signatures.functions[name] = (tuple(map(_decode_type, params)), _decode_type(return_type))
+    results = []
+    for indices, component_called in zip(components, called):
+        return_types, error = check_component([decls[index] for index in indices], signatures, component_called)
+        if return_types is not None:
+            return_types = {name: _encode_type(t) for name, t in return_types.items()}
+        results.append((return_types, error))
+    return results
+
+
+def _temporary_path() -> str:
+    return os.path.join(tempfile.gettempdir(), f"tyc-check-{uuid.uuid4().hex}.ast")
+
+
+def _split(components: list, count: int) -> List[list]:
+    """components cut into about count runs of similar total size."""
+    size = sum(map(len, components)) / count
+    chunks = [[]]
+    total = 0
+    for component in components:
+        if chunks[-1] and total >= size * len(chunks):
+            chunks.append([])
+        chunks[-1].append(component)
+        total += len(component)
+    return chunks
+
+
+def _levels(graph, components: List[List[str]], inferred: set) -> List[List[int]]:
+    """Indices of components per level; a component comes after the inferred callees it depends on."""
+    component_of = {name: index for index, component in enumerate(components) for name in component}
+    level_of = []
+    levels: List[List[int]] = []
+    # components are listed callees first
+    for index, component in enumerate(components):
+        level = 0
+        for name in component:
+            for callee in graph.callees[name]:
+                other = component_of[callee]
+                if other != index and callee in inferred and level_of[other] + 1 > level:
+                    level = level_of[other] + 1
+        level_of.append(level)
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(index)
+    return levels
+
+
+def check_program(
+    program: Program,
+    workers: int = None,
+    executor: Executor = None,
+    min_parallel_functions: int = MIN_PARALLEL_FUNCTIONS,
+) -> CheckResult:
+    """Type-check program's functions, in a process pool when workers (default: the CPUs) allow.
+
+    Without executor, the pool is started for this call, by forking where
+    that is the default start method so the workers inherit the program;
+    pass executor to reuse a pool across calls, at the cost of sending the
+    program to each of its workers once per call. Errors in the struct and
+    function declarations themselves are reported alone, as nothing can be
+    checked without the signature table.
+    """
+    result = CheckResult()
+    try:
+        signatures = collect_signatures(program)
+    except StaticError as e:
+        result.diagnostics.append(Diagnostic(SEMANTIC, None, None, type(e).__name__, str(e)))
+        return result
+    workers = workers or os.cpu_count() or 1
+    graph = build_call_graph(program)
+    components = graph.components()
+    functions = graph.functions
+    inferred = set(signatures.inferred)
+    position = {name: index for index, name in enumerate(functions)}
+    called = called_from_other_components(graph.callees, components)
+    found = []  # (position of the component's first function, Diagnostic)
+    failed = set()  # inferred functions whose components were not checked or failed
+    deferred = set()  # inferred functions of open components and their callers
+    deferred_indices = []
+    global _loaded
+    pool = None
+    program_file = None  # key of the functions in the workers; a file unless inherited
+    written = False
+
+    def record(names, outcome):
+        return_types, error = outcome
+        if error is not None:
+            found.append((min(position[name] for name in names), error))
+            failed.update(inferred.intersection(names))
+            return
+        for name, return_type in return_types.items():
+            params = signatures.functions[name][0]
+            signatures.functions[name] = (params, return_type)
+            result.return_types[name] = return_type
+
+    try:
+        for level in _levels(graph, components, inferred):
+            runnable = []
+            for index in level:
+                component = components[index]
+                callees = [callee for name in component for callee in graph.callees[name]]
+                if any(callee in failed for callee in callees):
+                    failed.update(inferred.intersection(component))
+                elif any(callee in deferred for callee in callees):
+                    deferred.update(inferred.intersection(component))
+                    deferred_indices.append(index)
+                else:
+                    runnable.append(index)
+            if not runnable:
+                continue
+            parallel = workers > 1 and sum(len(components[index]) for index in runnable) >= min_parallel_functions
+            if parallel and pool is None:
+                program_file = _temporary_path()
+                if executor is None and multiprocessing.get_start_method() == "fork":
+                    _loaded = (program_file, list(functions.values()))
+                    pool = ProcessPoolExecutor(workers)
+                else:
+                    with open(program_file, "wb") as f:
+                        dump(Program(list(functions.values())), f)
+                    written = True
+                    pool = executor or ProcessPoolExecutor(workers)
+            level = [components[index] for index in runnable]
+            outcomes = (
+                _check_level_parallel(level, signatures, graph, called, position, program_file, pool, workers)
+                if parallel
+                else _check_level(level, signatures, functions, called)
+            )
+            for index, outcome in zip(runnable, outcomes):
+                if outcome[0] is None:
+                    deferred.update(inferred.intersection(components[index]))
+                    deferred_indices.append(index)
+                else:
+                    record(components[index], outcome)
+    finally:
+        if pool is not None and executor is None:
+            pool.shutdown()
+        if written:
+            os.remove(program_file)
+        elif program_file is not None:
+            _loaded = (None, [])
+    deferred_indices.sort()
+    for group in deferred_groups([components[index] for index in deferred_indices], graph.callees):
+        if any(callee in failed for name in group for callee in graph.callees[name]):
+            failed.update(inferred.intersection(group))
+        else:
+            record(group, check_component([functions[name] for name in group], signatures))
+    found.sort(key=lambda item: item[0])
+    result.diagnostics = [error for _, error in found]
+    return result
+
+
+def _check_level(components: List[List[str]], signatures: Signatures, functions: dict, called: set) -> list:
+    return [
+        check_component([functions[name] for name in component], signatures, not called.isdisjoint(component))
+        for component in components
+    ]
+
+
+def _check_level_parallel(
+    components, signatures: Signatures, graph, called: set, position: dict, path: str, pool: Executor, workers: int
+) -> list:
+    structs = {
+        struct: {name: _encode_type(member) for name, member in members.items()}
+        for struct, members in signatures.structs.items()
+    }
+    payloads = []
+    for chunk in _split(components, workers * CHUNKS_PER_WORKER):
+        # Signatures of the chunk's functions and of everything they call
+        names = dict.fromkeys(name for component in chunk for name in component)
+        for component in chunk:
+            for name in component:
+                names.update(dict.fromkeys(graph.callees[name]))
+        table = {}
+        for name in names:
+            params, return_type = signatures.functions[name]
+            table[name] = ([_encode_type(param) for param in params], _encode_type(return_type))
+        indices = [[position[name] for name in component] for component in chunk]
+        chunk_called = [not called.isdisjoint(component) for component in chunk]
+        payloads.append((path, structs, table, indices, chunk_called))
+    outcomes = []
+    for results in pool.map(_check_chunk, *zip(*payloads)):
+        for return_types, error in results:
+            if return_types is not None:
+                return_types = {name: _decode_type(t) for name, t in return_types.items()}
+            outcomes.append((return_types, error))
+    return outcomes
+
+
+def generate_checker_source(functions: int, chains: int = 1) -> str:
+    """A program of functions in chains, each calling the one before it; every fourth has an inferred return type.
+
+    Function i is in chain i % chains; main calls the last function of each chain.
+    """
+    lines = []
+    for i in range(functions):
+        header = f"f{i}(int a, int b)" if i % 4 == 3 else f"int f{i}(int a, int b)"
+        call = f"f{i - chains}(x, y)" if i >= chains else "x"
+        lines.append(
+            f"{header} {{\n"
+            "    auto x = a + b * 2;\n"
+            "    int y = x - 1;\n"
+            "    if (x > y) x = x + 1; else y = y + 1;\n"
+            "    for (int i = 0; i < b; ++i) { x = x + i; auto z; z = x % 3; y = y + z; }\n"
+            "    float f = x / 2.0;\n"
+            "    while (f > 1.0) f = f / 2;\n"
+            f"    y = {call};\n"
+            "    printInt(x);\n"
+            "    return x + y;\n"
+            "}"
+        )
+    calls = " ".join(f"printInt(f{i}(1, 2));" for i in range(max(functions - chains, 0), functions))
+    lines.append(f"void main() {{ {calls} }}")
+    return "\n".join(lines) + "\n"
+
+
+def measure_parallel_check(functions: int = 4_000, chains: int = 64, workers: int = None, repeat: int = 3) -> dict:
+    """Best-of-repeat seconds to check a generated program in this process and in a pool.
+
+    The program's chains make levels of chains components each. "parallel"
+    starts a pool per check, which inherits the program where workers are
+    forked; "executor" reuses a pool started before timing, which is sent
+    the program on each check.
+    """
+    import time
+
+    from src.astgen.direct_builder import build_ast
+
+    # At least two workers, so the pool is used even on one CPU
+    workers = max(workers or os.cpu_count() or 1, 2)
+    program = build_ast(generate_checker_source(functions, chains))
+    result = {"functions": functions, "chains": chains, "workers": workers}
+    with ProcessPoolExecutor(workers) as executor:
+        steps = {
+            "sequential": lambda: check_program(program, workers=1),
+            "parallel": lambda: check_program(program, workers),
+            "executor": lambda: check_program(program, workers, executor=executor),
+        }
+        for name, step in steps.items():
+            step()  # warm-up, also starts the workers
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                step()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            result[name] = best
+    return result
+
+
+if __name__ == "__main__":
+    result = measure_parallel_check()
+    print(
+        f"generated program: {result['functions']} functions in {result['chains']} chains, "
+        f"{result['workers']} worker(s)"
+    )
+    print(f"sequential check: {result['sequential'] * 1000:.0f} ms")
+    print(f"parallel check:   {result['parallel'] * 1000:.0f} ms")
+    print(f"reused pool:      {result['executor'] * 1000:.0f} ms")
+    print(f"speed-up: {result['sequential'] / result['parallel']:.2f}x")
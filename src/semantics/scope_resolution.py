@@ -0,0 +1,229 @@
+"""
+Scope resolution for TyC programming language.
+This module binds every variable of a program to a slot of its function's
+frame, so passes after it find a variable with an integer index instead of
+looking its name up through a chain of nested scopes.
+
+Following the spec's scope rules, parameters and the variables declared in
+a function body share the function's scope, nested blocks (and the bodies
+of `for` and `switch`) open scopes whose variables shadow outer ones, and a
+variable is visible from its declaration to the end of its block. Each
+Param and VarDecl gets the next free slot of the frame, and an Identifier
+the slot of the declaration it refers to. A block's slots are free again
+once it ends, so sibling blocks share them, and a function's frame size is
+the most slots live at once.
+
+Names are looked up in a chain of dicts here, once per Identifier; the
+resulting ScopeResolver.slots and frame_sizes are keyed by node. Redeclared
+and UndeclaredIdentifier are raised as in src.semantics.static_error.
+"""
+
+from typing import Dict, List
+
+from src.semantics.static_error import Redeclared, UndeclaredIdentifier
+from src.utils.nodes import ASTNode, FuncDecl, Program, SwitchStmt
+from src.utils.visitor import TableVisitor
+
+
+def switch_sections(node: SwitchStmt) -> list:
+    """The case and default sections of a switch in source order."""
+    sections = list(node.cases)
+    if node.default_case is not None:
+        # default can appear anywhere among the cases
+        sections.append(node.default_case)
+        sections.sort(key=lambda section: (section.line or 0, section.column or 0))
+    return sections
+
+
+class ScopeResolver(TableVisitor):
+    """Assigns frame slots to the parameters, variables and identifiers of functions."""
+
+    def __init__(self):
+        # Param, VarDecl or Identifier -> slot in its function's frame
+        self.slots: Dict[ASTNode, int] = {}
+        # FuncDecl -> number of slots its frame needs
+        self.frame_sizes: Dict[FuncDecl, int] = {}
+        self._scopes: List[Dict[str, int]] = []
+        self._next = 0  # first free slot
+        self._size = 0  # most slots used so far in the function
+
+    def resolve(self, program: Program) -> "ScopeResolver":
+        """Resolve every function of program."""
+        for decl in program.decls:
+            if type(decl) is FuncDecl:
+                self.resolve_function(decl)
+        return self
+
+    def resolve_function(self, node: FuncDecl) -> int:
+        """Resolve one function; returns its frame size."""
+        self.visit_func_decl(node)
+        return self.frame_sizes[node]
+
+    def _declare(self, node, kind: str):
+        scope = self._scopes[-1]
+        if node.name in scope:
+            raise Redeclared(kind, node.name)
+        slot = scope[node.name] = self.slots[node] = self._next
+        self._next = slot + 1
+        if self._next > self._size:
+            self._size = self._next
+
+    def _enter(self):
+        self._scopes.append({})
+        return self._next
+
+    def _leave(self, saved: int):
+        self._scopes.pop()
+        self._next = saved
+
+    def visit_func_decl(self, node: FuncDecl, o=None):
+        self._scopes = [{}]
+        self._next = self._size = 0
+        for param in node.params:
+            self._declare(param, "Parameter")
+        # The body's top-level declarations share the parameters' scope
+        self.visit_block_stmt(node.body, top_level=True)
+        self.frame_sizes[node] = self._size
+
+    def visit_block_stmt(self, node, o=None, top_level: bool = False):
+        saved = None if top_level else self._enter()
+        table = self._dispatch_table
+        for stmt in node.statements:
+            table[type(stmt)](self, stmt)
+        if saved is not None:
+            self._leave(saved)
+
+    def visit_var_decl(self, node, o=None):
+        # The initializer is resolved first: `int x = x;` reads an outer x
+        if node.init_value is not None:
+            self.visit(node.init_value)
+        self._declare(node, "Variable")
+
+    def visit_for_stmt(self, node, o=None):
+        saved = self._enter()
+        super().visit_for_stmt(node)
+        self._leave(saved)
+
+    def visit_switch_stmt(self, node, o=None):
+        self.visit(node.expr)
+        saved = self._enter()
+        for section in switch_sections(node):
+            self.visit(section)
+        self._leave(saved)
+
+    def visit_identifier(self, node, o=None):
+        name = node.name
+        for scope in reversed(self._scopes):
+            slot = scope.get(name)
+            if slot is not None:
+                self.slots[node] = slot
+                return
+        raise UndeclaredIdentifier(name)
+
+
+def resolve_scopes(program: Program) -> ScopeResolver:
+    """Frame slots of program's variables and frame sizes of its functions."""
+    return ScopeResolver().resolve(program)
+
+
+class _SlotReader(TableVisitor):
+    # Stores to and loads from a frame by slot, as a pass after resolution would
+    def __init__(self, resolver: ScopeResolver):
+        self.slots = resolver.slots
+        self.frame_sizes = resolver.frame_sizes
+        self.frame = []
+
+    def visit_func_decl(self, node, o=None):
+        frame = self.frame = [None] * self.frame_sizes[node]
+        for param in node.params:
+            frame[self.slots[param]] = param
+        self.visit(node.body)
+
+    def visit_var_decl(self, node, o=None):
+        super().visit_var_decl(node)
+        self.frame[self.slots[node]] = node
+
+    def visit_identifier(self, node, o=None):
+        return self.frame[self.slots[node]]
+
+
+class _NameReader(TableVisitor):
+    # The same pass looking names up in a chain of scopes
+    def __init__(self):
+        self.scopes = []
+
+    def visit_func_decl(self, node, o=None):
+        self.scopes = [{param.name: param for param in node.params}]
+        table = self._dispatch_table
+        for stmt in node.body.statements:
+            table[type(stmt)](self, stmt)
+
+    def visit_block_stmt(self, node, o=None):
+        self.scopes.append({})
+        super().visit_block_stmt(node)
+        self.scopes.pop()
+
+    def visit_for_stmt(self, node, o=None):
+        self.scopes.append({})
+        super().visit_for_stmt(node)
+        self.scopes.pop()
+
+    def visit_switch_stmt(self, node, o=None):
+        self.visit(node.expr)
+        self.scopes.append({})
+        for section in switch_sections(node):
+            self.visit(section)
+        self.scopes.pop()
+
+    def visit_var_decl(self, node, o=None):
+        super().visit_var_decl(node)
+        self.scopes[-1][node.name] = node
+
+    def visit_identifier(self, node, o=None):
+        name = node.name
+        for scope in reversed(self.scopes):
+            found = scope.get(name)
+            if found is not None:
+                return found
+
+
+def generate_scope_source(depth: int, uses: int) -> str:
+    """A function with blocks nested depth deep, each declaring a variable, using them uses times innermost."""
+    lines = ["void main() {", "    int v0 = 0;"]
+    for level in range(1, depth + 1):
+        lines.append("    " * level + f"{{ int v{level} = v{level - 1};")
+    indent = "    " * (depth + 1)
+    lines.extend(f"{indent}v{depth} = v{i % depth} + v0;" for i in range(uses))
+    lines.append("    " + "}" * depth)
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def measure_scope_resolution(depths=(4, 16, 64), uses: int = 20_000, passes: int = 5) -> dict:
+    """Seconds for the resolution and for a pass reading every variable by slot and by name, per nesting depth."""
+    import time
+
+    from src.astgen.direct_builder import build_ast
+
+    result = {}
+    for depth in depths:
+        program = build_ast(generate_scope_source(depth, uses))
+        start = time.perf_counter()
+        resolver = resolve_scopes(program)
+        timings = {"resolution": time.perf_counter() - start}
+        for name, reader in (("slots", _SlotReader(resolver)), ("names", _NameReader())):
+            start = time.perf_counter()
+            for _ in range(passes):
+                reader.visit(program)
+            timings[name] = (time.perf_counter() - start) / passes
+        result[depth] = timings
+    return result
+
+
+if __name__ == "__main__":
+    for depth, timings in measure_scope_resolution().items():
+        print(
+            f"depth {depth:>3}: resolution {timings['resolution'] * 1000:7.1f} ms, "
+            f"pass by slot {timings['slots'] * 1000:7.1f} ms, by name {timings['names'] * 1000:7.1f} ms "
+            f"({timings['names'] / timings['slots']:.2f}x)"
+        )
@@ -0,0 +1,69 @@
+"""
+Static errors for TyC programming language.
+This module defines the exceptions raised by semantic analysis. Each
+message names the error and its subject: a name, or the offending node in
+the textual AST form of src.utils.ast_writer.
+"""
+
+from src.utils.nodes import ASTNode
+
+
+class StaticError(Exception):
+    """Base class for semantic errors."""
+
+
+class Redeclared(StaticError):
+    """A name declared twice in the same scope; kind is Variable, Parameter, Function, Struct or Member."""
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        super().__init__(f"Redeclared({kind}, {name})")
+
+
+class UndeclaredIdentifier(StaticError):
+    """A variable or parameter used where no declaration is visible."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"UndeclaredIdentifier({name})")
+
+
+class UndeclaredFunction(StaticError):
+    """A call to a function that is neither declared nor built in."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"UndeclaredFunction({name})")
+
+
+class UndeclaredStruct(StaticError):
+    """A struct type name without a struct declaration."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"UndeclaredStruct({name})")
+
+
+class TypeCannotBeInferred(StaticError):
+    """A statement that uses an `auto` variable or inferred function whose type is still unknown."""
+
+    def __init__(self, node: ASTNode):
+        self.node = node
+        super().__init__(f"TypeCannotBeInferred({node})")
+
+
+class TypeMismatchInStatement(StaticError):
+    """A statement whose parts have types it does not accept."""
+
+    def __init__(self, node: ASTNode):
+        self.node = node
+        super().__init__(f"TypeMismatchInStatement({node})")
+
+
+class TypeMismatchInExpression(StaticError):
+    """An expression whose operands or arguments have types it does not accept."""
+
+    def __init__(self, node: ASTNode):
+        self.node = node
+        super().__init__(f"TypeMismatchInExpression({node})")
@@ -0,0 +1,585 @@
+"""
+Type inference for TyC programming language.
+This module types every function body of a program in one pass, inferring
+the types of `auto` variables (spec Rule 2) and of functions declared
+without a return type (Rule 5) with union-find over type variables.
+
+Each `auto` variable declared without an initializer and each function
+without a declared return type gets a type variable. Expressions are typed
+in source order by the rules of Rule 3, and the first usage that determines
+a variable's type binds its class to that type: an assignment to the type
+of the right-hand side, an argument to the parameter type, `%` and `&&` to
+int, an arithmetic operator to the type of the other operand. A usage that
+only relates two unknown types, such as `a = b` with both undetermined,
+unions their classes instead, and binding either later types both. Classes
+are merged by size with path halving, so the pass is linear in the program
+up to the inverse Ackermann factor, where re-walking a function until no
+more variables get a type is quadratic in its length.
+
+Functions are checked callees first, one strongly connected component of
+the call graph (src.semantics.call_graph) at a time, so the return type of
+a function is known before its callers use it. Within a group of mutually
+recursive functions, the pass repeatedly checks the members whose first
+`return expr;` only calls functions already typed, in source order; when
+none is left, the first remaining member goes next and its calls are typed
+by their usage. Every body is checked once, so a program with thousands of
+functions is checked in linear time; only the rounds over a large group of
+mutually recursive functions re-read the callee lists of its members.
+
+Before a body is checked, src.semantics.scope_resolution assigns its
+variables frame slots (raising Redeclared and UndeclaredIdentifier), and
+the types of the variables are kept in a list indexed by slot.
+
+A variable whose class is still unbound at the end of its function, and an
+inferred return type still unbound at the end of the program, raise
+TypeCannotBeInferred at the first statement that left it undetermined (or
+at the declaration of a variable never used). The first static error found
+is raised, as a StaticError from src.semantics.static_error.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.semantics.call_graph import CallGraph, build_call_graph
+from src.semantics.scope_resolution import ScopeResolver, switch_sections
+from src.semantics.static_error import (
+    Redeclared,
+    TypeCannotBeInferred,
+    TypeMismatchInExpression,
+    TypeMismatchInStatement,
+    UndeclaredFunction,
+    UndeclaredStruct,
+)
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    StructDecl,
+    FuncDecl,
+    INT_TYPE,
+    FLOAT_TYPE,
+    STRING_TYPE,
+    VOID_TYPE,
+    StructType,
+    Type,
+    VarDecl,
+    StructLiteral,
+)
+from src.utils.visitor import TableVisitor
+
+
+INT = INT_TYPE
+FLOAT = FLOAT_TYPE
+STRING = STRING_TYPE
+VOID = VOID_TYPE
+
+# name -> (parameter types, return type)
+BUILTINS = {
+    "readInt": ((), INT),
+    "readFloat": ((), FLOAT),
+    "readString": ((), STRING),
+    "printInt": ((INT,), VOID),
+    "printFloat": ((FLOAT,), VOID),
+    "printString": ((STRING,), VOID),
+}
+
+RELATIONAL_OPS = {"==", "!=", "<", "<=", ">", ">="}
+INT_OPS = {"%", "&&", "||"}
+
+# A type term is either a Type (primitive types are constants compared by
+# identity, struct types compare by name) or the int index of a type variable.
+
+
+class Signatures:
+    """Struct layouts and function signatures of a program."""
+
+    def __init__(self):
+        # struct name -> {member name: member type}, in declaration order
+        self.structs: Dict[str, Dict[str, Type]] = {}
+        # function name -> (parameter types, return type or None when inferred)
+        self.functions: Dict[str, Tuple[tuple, Optional[Type]]] = dict(BUILTINS)
+        # inferred function name -> its FuncDecl
+        self.inferred: Dict[str, FuncDecl] = {}
+
+
+def collect_signatures(program: Program) -> Signatures:
+    """Signatures of program's declarations; raises Redeclared or UndeclaredStruct."""
+    signatures = Signatures()
+    structs = signatures.structs
+    for decl in program.decls:
+        if type(decl) is StructDecl:
+            if decl.name in structs:
+                raise Redeclared("Struct", decl.name)
+            structs[decl.name] = {}
+    for decl in program.decls:
+        if type(decl) is StructDecl:
+            members = structs[decl.name]
+            for member in decl.members:
+                if member.name in members:
+                    raise Redeclared("Member", member.name)
+                members[member.name] = declared_type(member.member_type, structs)
+            continue
+        if decl.name in signatures.functions:
+            raise Redeclared("Function", decl.name)
+        params = tuple(declared_type(param.param_type, structs) for param in decl.params)
+        if decl.return_type is None:
+            signatures.inferred[decl.name] = decl
+        else:
+            declared_type(decl.return_type, structs)
+        signatures.functions[decl.name] = (params, decl.return_type)
+    return signatures
+
+
+def declared_type(type_node: Type, structs: dict) -> Type:
+    """type_node, checking that a struct type names a declared struct."""
+    if type(type_node) is StructType and type_node.struct_name not in structs:
+        raise UndeclaredStruct(type_node.struct_name)
+    return type_node
+
+
+class TypeInference(TableVisitor):
+    """Infers the types of a program's auto variables, identifiers, calls and inferred functions.
+
+    infer() returns a dict mapping every VarDecl declared `auto`, Identifier,
+    FuncCall and FuncDecl without a declared return type to its Type.
+    used_structs and used_functions name, per checked function, the struct
+    layouts and function signatures its body looked up.
+    """
+
+    def __init__(self, signatures: Signatures = None):
+        self.signatures = signatures
+        # Union-find over type variables, indexed by variable
+        self._parent: List[int] = []
+        self._size: List[int] = []
+        self._bound: List[Optional[Type]] = []  # type of the class, at its root
+        # Earliest (order, statement) that left the class undetermined, at its root
+        self._pending: List[Optional[Tuple[int, ASTNode]]] = []
+        self._shared: List[bool] = []  # the class holds a function's return type
+        self._terms: List[Tuple[ASTNode, object]] = []  # nodes typed once all classes are bound
+        self._returns: Dict[str, int] = {}  # inferred function -> its return type variable
+        self._value_returns: Dict[str, ASTNode] = {}  # inferred function -> first `return expr;`
+        self.resolver = ScopeResolver()
+        self._slots = self.resolver.slots
+        self._frame: list = []  # type term of each slot of the current function
+        self._autos: List[Tuple[int, VarDecl, int]] = []  # (order, decl, variable) in the function
+        self.function: Optional[FuncDecl] = None  # the function being checked
+        # function name -> the structs and functions whose declarations its body used
+        self.used_structs: Dict[str, Set[str]] = {}
+        self.used_functions: Dict[str, Set[str]] = {}
+        self._structs_used: Set[str] = set()
+        self._functions_used: Set[str] = set()
+        self._return_term = None
+        self._stmt: Optional[ASTNode] = None
+        self._order = 0
+
+    # ------------------------------------------------------------------
+    # Union-find
+    # ------------------------------------------------------------------
+
+    def _new_var(self, shared: bool = False) -> int:
+        var = len(self._parent)
+        self._parent.append(var)
+        self._size.append(1)
+        self._bound.append(None)
+        self._pending.append(None)
+        self._shared.append(shared)
+        return var
+
+    def _find(self, var: int) -> int:
+        parent = self._parent
+        while parent[var] != var:
+            parent[var] = parent[parent[var]]
+            var = parent[var]
+        return var
+
+    def _resolve(self, term):
+        """The Type of term, or the root variable of its class while unbound."""
+        if type(term) is not int:
+            return term
+        root = self._find(term)
+        bound = self._bound[root]
+        return root if bound is None else bound
+
+    def _unify(self, left, right) -> bool:
+        """Make left and right the same type; False when they are different types."""
+        left = self._resolve(left)
+        right = self._resolve(right)
+        if type(left) is not int:
+            if type(right) is not int:
+                # Primitive types are constants; struct types compare by name
+                return left is right or left == right
+            self._bound[right] = left
+            return True
+        if type(right) is not int:
+            self._bound[left] = right
+            return True
+        if left != right:
+            if self._size[left] < self._size[right]:
+                left, right = right, left
+            self._parent[right] = left
+            self._size[left] += self._size[right]
+            self._shared[left] = self._shared[left] or self._shared[right]
+            pending = self._pending[right]
+            if pending is not None and (self._pending[left] is None or pending[0] < self._pending[left][0]):
+                self._pending[left] = pending
+        self._defer(left)
+        return True
+
+    def _defer(self, root: int):
+        # The current statement uses the class without determining its type
+        if self._pending[root] is None:
+            self._pending[root] = (self._order, self._stmt)
+
+    def _known(self, term) -> Type:
+        """The Type of term; raises TypeCannotBeInferred for the current statement while unbound."""
+        resolved = self._resolve(term)
+        if type(resolved) is int:
+            raise TypeCannotBeInferred(self._stmt)
+        return resolved
+
+    # ------------------------------------------------------------------
+    # Program and functions
+    # ------------------------------------------------------------------
+
+    def infer(self, program: Program, open_returns: bool = False) -> Optional[Dict[ASTNode, Type]]:
+        """Types of program's nodes; raises the first StaticError.
+
+        With open_returns, an inferred return type still unbound at the end,
+        which a caller outside program could bind, gives None instead.
+        """
+        if self.signatures is None:
+            self.signatures = collect_signatures(program)
+        inferred = self.signatures.inferred
+        for name in inferred:
+            self._returns[name] = self._new_var(shared=True)
+        graph = build_call_graph(program)
+        for component in graph.components():
+            self._check_component(component, graph)
+        for name, decl in inferred.items():
+            return_type = self._resolve(self._returns[name])
+            if type(return_type) is int:
+                if open_returns:
+                    return None
+                raise TypeCannotBeInferred(self._value_returns.get(name, decl))
+            if return_type is VOID and name in self._value_returns:
+                # `return g();` with g found to be void later on
+                raise TypeMismatchInStatement(self._value_returns[name])
+        types = {}
+        for node, term in self._terms:
+            node_type = types[node] = self._resolve(term)
+            if node_type is VOID and type(node) is VarDecl:
+                raise TypeMismatchInStatement(node)
+        for name, decl in inferred.items():
+            types[decl] = self._resolve(self._returns[name])
+        return types
+
+    def _check_component(self, component: List[str], graph: CallGraph):
+        functions = graph.functions
+        if len(component) == 1:
+            self.visit_func_decl(functions[component[0]])
+            return
+        # Bounded fixpoint: each round checks the members whose return type
+        # only depends on typed functions, or else the first one left
+        pending = component
+        while pending:
+            remaining = []
+            for name in pending:
+                if self._typed(graph.leading_callees[name]):
+                    self.visit_func_decl(functions[name])
+                else:
+                    remaining.append(name)
+            if len(remaining) == len(pending):
+                self.visit_func_decl(functions[remaining.pop(0)])
+            pending = remaining
+
+    def _typed(self, names: List[str]) -> bool:
+        returns = self._returns
+        for name in names:
+            if name in returns and type(self._resolve(returns[name])) is int:
+                return False
+        return True
+
+    def visit_func_decl(self, node: FuncDecl, o=None):
+        name = node.name
+        self.function = node
+        self._autos = []
+        self._structs_used = self.used_structs.setdefault(name, set())
+        self._functions_used = self.used_functions.setdefault(name, set())
+        self._return_term = node.return_type if node.return_type is not None else self._returns[name]
+        # Variables are read and written by frame slot
+        slots = self._slots
+        frame = self._frame = [None] * self.resolver.resolve_function(node)
+        for param in node.params:
+            frame[slots[param]] = param.param_type
+        self._statements(node.body.statements)
+        if node.return_type is None and name not in self._value_returns:
+            # No `return expr;`: the function is void
+            if not self._unify(self._returns[name], VOID):
+                raise TypeMismatchInStatement(node.body)
+        unresolved = []
+        for order, decl, var in self._autos:
+            root = self._find(var)
+            if self._bound[root] is None and not self._shared[root]:
+                unresolved.append(self._pending[root] or (order, decl))
+        if unresolved:
+            raise TypeCannotBeInferred(min(unresolved, key=lambda pending: pending[0])[1])
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+
+    def _statement(self, stmt):
+        self._order += 1
+        self._stmt = stmt
+        self._dispatch_table[type(stmt)](self, stmt)
+
+    def _statements(self, statements: list):
+        for stmt in statements:
+            self._statement(stmt)
+
+    def _condition(self, expr, stmt):
+        if not self._unify(self.visit(expr), INT):
+            raise TypeMismatchInStatement(stmt)
+
+    def visit_block_stmt(self, node, o=None):
+        self._statements(node.statements)
+
+    def visit_var_decl(self, node, o=None):
+        var_type = node.var_type
+        init = node.init_value
+        if var_type is not None:
+            if type(var_type) is StructType:
+                self._structs_used.add(var_type.struct_name)
+            declared_type(var_type, self.signatures.structs)
+            if type(init) is StructLiteral:
+                self._struct_literal(init, var_type, TypeMismatchInStatement, node)
+            elif init is not None and not self._unify(var_type, self.visit(init)):
+                raise TypeMismatchInStatement(node)
+            self._frame[self._slots[node]] = var_type
+            return
+        if init is None:
+            term = self._new_var()
+            self._autos.append((self._order, node, term))
+        elif type(init) is StructLiteral:
+            raise TypeCannotBeInferred(node)
+        else:
+            term = self._resolve(self.visit(init))
+            if term is VOID:
+                raise TypeMismatchInStatement(node)
+            if type(term) is int:
+                # Typed along with the initializer, once that is
+                self._defer(term)
+                self._autos.append((self._order, node, term))
+        self._terms.append((node, term))
+        self._frame[self._slots[node]] = term
+
+    def visit_expr_stmt(self, node, o=None):
+        value = self._resolve(self.visit(node.expr))
+        if type(value) is int:
+            self._defer(value)
+
+    def visit_if_stmt(self, node, o=None):
+        self._condition(node.condition, node)
+        self._statement(node.then_stmt)
+        if node.else_stmt is not None:
+            self._statement(node.else_stmt)
+
+    def visit_while_stmt(self, node, o=None):
+        self._condition(node.condition, node)
+        self._statement(node.body)
+
+    def visit_for_stmt(self, node, o=None):
+        if node.init is not None:
+            self._statement(node.init)
+            self._stmt = node
+        if node.condition is not None:
+            self._condition(node.condition, node)
+        if node.update is not None:
+            self.visit(node.update)
+        self._statement(node.body)
+
+    def visit_switch_stmt(self, node, o=None):
+        self._condition(node.expr, node)
+        for section in switch_sections(node):
+            if section is not node.default_case:
+                self._stmt = node
+                self._condition(section.expr, node)
+            self._statements(section.statements)
+
+    def visit_break_stmt(self, node, o=None):
+        pass
+
+    def visit_continue_stmt(self, node, o=None):
+        pass
+
+    def visit_return_stmt(self, node, o=None):
+        expected = self._return_term
+        expr = node.expr
+        if expr is None:
+            if not self._unify(expected, VOID):
+                raise TypeMismatchInStatement(node)
+            return
+        if type(expected) is int:
+            self._value_returns.setdefault(self.function.name, node)
+        if type(expr) is StructLiteral:
+            self._struct_literal(expr, self._known(expected), TypeMismatchInStatement, node)
+            return
+        value = self.visit(expr)
+        if self._resolve(expected) is VOID or self._resolve(value) is VOID or not self._unify(expected, value):
+            raise TypeMismatchInStatement(node)
+
+    # ------------------------------------------------------------------
+    # Expressions: each returns a type term
+    # ------------------------------------------------------------------
+
+    def _struct_literal(self, node, expected: Type, error: type, subject: ASTNode):
+        """Check a struct literal against the struct type its context expects."""
+        if type(expected) is not StructType:
+            raise error(subject)
+        self._structs_used.add(expected.struct_name)
+        members = self.signatures.structs[expected.struct_name]
+        if len(members) != len(node.values):
+            raise error(subject)
+        for member_type, value in zip(members.values(), node.values):
+            if type(value) is StructLiteral:
+                self._struct_literal(value, member_type, error, subject)
+            elif not self._unify(member_type, self.visit(value)):
+                raise error(subject)
+
+    def visit_struct_literal(self, node, o=None):
+        # Only a declared type, parameter, member or return type gives one its type
+        raise TypeCannotBeInferred(self._stmt)
+
+    def visit_int_literal(self, node, o=None):
+        return INT
+
+    def visit_float_literal(self, node, o=None):
+        return FLOAT
+
+    def visit_string_literal(self, node, o=None):
+        return STRING
+
+    def visit_identifier(self, node, o=None):
+        term = self._frame[self._slots[node]]
+        self._terms.append((node, term))
+        return term
+
+    def visit_func_call(self, node, o=None):
+        self._functions_used.add(node.name)
+        signature = self.signatures.functions.get(node.name)
+        if signature is None:
+            raise UndeclaredFunction(node.name)
+        params, return_type = signature
+        if len(params) != len(node.args):
+            raise TypeMismatchInExpression(node)
+        for param_type, arg in zip(params, node.args):
+            if type(arg) is StructLiteral:
+                self._struct_literal(arg, param_type, TypeMismatchInExpression, node)
+            elif not self._unify(param_type, self.visit(arg)):
+                raise TypeMismatchInExpression(node)
+        term = return_type if return_type is not None else self._returns[node.name]
+        self._terms.append((node, term))
+        return term
+
+    def visit_member_access(self, node, o=None):
+        obj_type = self._known(self.visit(node.obj))
+        if type(obj_type) is not StructType:
+            raise TypeMismatchInExpression(node)
+        self._structs_used.add(obj_type.struct_name)
+        member_type = self.signatures.structs[obj_type.struct_name].get(node.member)
+        if member_type is None:
+            raise TypeMismatchInExpression(node)
+        return member_type
+
+    def visit_assign_expr(self, node, o=None):
+        target = self.visit(node.lhs)
+        if type(node.rhs) is StructLiteral:
+            self._struct_literal(node.rhs, self._known(target), TypeMismatchInExpression, node)
+            return target
+        value = self.visit(node.rhs)
+        if self._resolve(value) is VOID or not self._unify(target, value):
+            raise TypeMismatchInExpression(node)
+        return target
+
+    def visit_binary_op(self, node, o=None):
+        left = self._resolve(self.visit(node.left))
+        right = self._resolve(self.visit(node.right))
+        operator = node.operator
+        if operator in INT_OPS:
+            if not (self._unify(left, INT) and self._unify(right, INT)):
+                raise TypeMismatchInExpression(node)
+            return INT
+        # + - * / and the relational operators take int or float
+        if type(left) is int:
+            if type(right) is int:
+                raise TypeCannotBeInferred(self._stmt)
+            if right is INT or right is FLOAT:
+                self._unify(left, right)
+            left = right
+        elif type(right) is int:
+            if left is INT or left is FLOAT:
+                self._unify(right, left)
+            right = left
+        if not (left is INT or left is FLOAT) or not (right is INT or right is FLOAT):
+            raise TypeMismatchInExpression(node)
+        if operator in RELATIONAL_OPS or (left is INT and right is INT):
+            return INT
+        return FLOAT
+
+    def visit_prefix_op(self, node, o=None):
+        operand = self.visit(node.operand)
+        if node.operator in ("+", "-"):
+            operand = self._known(operand)
+            if operand is not INT and operand is not FLOAT:
+                raise TypeMismatchInExpression(node)
+            return operand
+        # ! ++ --
+        if not self._unify(operand, INT):
+            raise TypeMismatchInExpression(node)
+        return INT
+
+    def visit_postfix_op(self, node, o=None):
+        if not self._unify(self.visit(node.operand), INT):
+            raise TypeMismatchInExpression(node)
+        return INT
+
+
+def infer_types(program: Program) -> Dict[ASTNode, Type]:
+    """Types of program's auto variables, identifiers, calls and inferred functions.
+
+    Raises the first StaticError in the program.
+    """
+    return TypeInference().infer(program)
+
+
+def generate_auto_source(variables: int) -> str:
+    """A function with many auto variables, typed by a chain of assignments ending in a literal.
+
+    Each variable's first usage assigns it the next variable, still unknown,
+    so a re-walk-until-fixpoint inference needs one pass per variable.
+    """
+    lines = ["void main() {"]
+    lines.extend(f"    auto v{i};" for i in range(variables))
+    lines.extend(f"    v{i} = v{i + 1};" for i in range(variables - 1))
+    lines.append(f"    v{variables - 1} = 1;")
+    lines.extend(f"    printInt(v{i} + {i});" for i in range(variables))
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def measure_type_inference(sizes=(1_000, 4_000, 16_000)) -> dict:
+    """Seconds to infer the types of generate_auto_source programs, per number of variables."""
+    import time
+
+    from src.astgen.direct_builder import build_ast
+
+    result = {}
+    for variables in sizes:
+        program = build_ast(generate_auto_source(variables))
+        start = time.perf_counter()
+        infer_types(program)
+        result[variables] = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    for variables, seconds in measure_type_inference().items():
+        print(f"{variables:>6} auto variables: {seconds * 1000:8.1f} ms ({seconds / variables * 1e6:.2f} us/variable)")
@@ -0,0 +1,307 @@
+"""
+Array-backed AST arena for TyC programming language.
+This module stores a whole AST as parallel array('i') columns, one entry per
+node, instead of one Python object per node:
+
+    kinds          node kind tag (the ast_binary tags, MISSING or LIST)
+    first_child    index of the first child, -1 for none
+    next_sibling   index of the next child of the same parent, -1 for none
+    lines/columns  source position, -1 for None
+    payloads       index into the string table, ints or floats, -1 for none
+
+Nodes are laid out in pre-order, so a linear scan of the columns visits
+them in source order and every subtree is a contiguous slice. Each child
+field of a node takes one child slot, in field order: a missing child is a
+MISSING entry and a list field is a LIST entry whose children are the items.
+NodeView gives attribute access to an arena node without copying it, and
+to_node() converts a subtree back to the class-based nodes on demand.
+"""
+
+from array import array
+from typing import Iterator, List, Optional
+
+from src.utils.ast_binary import INT, NAME, NODE, NODES, SCHEMAS
+from src.utils.nodes import ASTNode, StructType, Type, TypeTable
+
+
+# Kind of a missing child and of a list field; node kinds are the ast_binary tags
+MISSING = 0
+LIST = -1
+
+_KINDS = {node_class: tag for tag, (node_class, _) in enumerate(SCHEMAS, 1)}
+_CLASSES = [None] + [node_class for node_class, _ in SCHEMAS]
+_FIELDS = [()] + [schema for _, schema in SCHEMAS]
+# Per kind: the scalar field (name, payload kind), or None
+_PAYLOADS = [None] + [
+    next(((field, kind) for field, kind in schema if kind not in (NODE, NODES)), None)
+    for _, schema in SCHEMAS
+]
+# Per kind: (field, kind) of the fields taking a child slot, in field order
+_CHILD_SLOTS = [()] + [
+    tuple((field, kind) for field, kind in schema if kind in (NODE, NODES)) for _, schema in SCHEMAS
+]
+_REVERSED_CHILD_SLOTS = [tuple(reversed(slots)) for slots in _CHILD_SLOTS]
+_IS_TYPE = [False] + [issubclass(node_class, Type) for node_class, _ in SCHEMAS]
+
+
+class ASTArena:
+    """Struct-of-arrays storage of an AST; node 0 is the root."""
+
+    def __init__(self):
+        self.kinds = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.payloads = array("i")
+        self.strings: List[str] = []
+        self.ints = array("q")
+        self.floats = array("d")
+        self._string_index = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def intern(self, value: str) -> int:
+        """Index of value in the shared string table, adding it if needed."""
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    @classmethod
+    def from_tree(cls, root: ASTNode) -> "ASTArena":
+        """Build an arena holding a copy of the tree rooted at root."""
+        arena = cls()
+        kinds, lines, columns, payloads = arena.kinds, arena.lines, arena.columns, arena.payloads
+        first_child, next_sibling = arena.first_child, arena.next_sibling
+        last_child = array("i")
+        intern = arena.intern
+        ints, floats = arena.ints, arena.floats
+        # Entries are (value, is_list, parent index)
+        stack = [(root, False, -1)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            value, is_list, parent = pop()
+            index = len(kinds)
+            if is_list:
+                kinds.append(LIST)
+                lines.append(-1)
+                columns.append(-1)
+                payloads.append(-1)
+                for item in reversed(value):
+                    push((item, False, index))
+            elif value is None:
+                kinds.append(MISSING)
+                lines.append(-1)
+                columns.append(-1)
+                payloads.append(-1)
+            else:
+                kind = _KINDS.get(type(value))
+                if kind is None:
+                    raise TypeError(f"Cannot store {type(value).__name__} nodes")
+                payload = -1
+                scalar = _PAYLOADS[kind]
+                if scalar is not None:
+                    data = getattr(value, scalar[0])
+                    if scalar[1] == NAME:
+                        payload = intern(data)
+                    elif scalar[1] == INT:
+                        payload = len(ints)
+                        ints.append(data)
+                    else:
+                        payload = len(floats)
+                        floats.append(data)
+                kinds.append(kind)
+                line, column = value.line, value.column
+                lines.append(-1 if line is None else line)
+                columns.append(-1 if column is None else column)
+                payloads.append(payload)
+                for field, field_kind in _REVERSED_CHILD_SLOTS[kind]:
+                    push((getattr(value, field), field_kind == NODES, index))
+            first_child.append(-1)
+            next_sibling.append(-1)
+            last_child.append(-1)
+            if parent >= 0:
+                previous = last_child[parent]
+                if previous < 0:
+                    first_child[parent] = index
+                else:
+                    next_sibling[previous] = index
+                last_child[parent] = index
+        return arena
+
+    def children(self, index: int) -> Iterator[int]:
+        """Indices of the child slots of entry index, in order."""
+        child = self.first_child[index]
+        next_sibling = self.next_sibling
+        while child >= 0:
+            yield child
+            child = next_sibling[child]
+
+    def node_class(self, index: int) -> Optional[type]:
+        """Node class of entry index, or None for MISSING and LIST entries."""
+        kind = self.kinds[index]
+        return _CLASSES[kind] if kind > 0 else None
+
+    def scalar(self, index: int):
+        """Name, operator or literal value stored with entry index, or None."""
+        kind = self.kinds[index]
+        scalar = _PAYLOADS[kind] if kind > 0 else None
+        if scalar is None:
+            return None
+        payload = self.payloads[index]
+        if scalar[1] == NAME:
+            return self.strings[payload]
+        if scalar[1] == INT:
+            return self.ints[payload]
+        return self.floats[payload]
+
+    def indices_of(self, *node_classes: type) -> Iterator[int]:
+        """Indices of the nodes of the given classes, found by a linear scan of kinds."""
+        wanted = {_KINDS[node_class] for node_class in node_classes}
+        return (index for index, kind in enumerate(self.kinds) if kind in wanted)
+
+    def view(self, index: int = 0) -> "NodeView":
+        """Zero-copy view of the node at index."""
+        return NodeView(self, index)
+
+    def to_node(self, index: int = 0, type_table: TypeTable = None) -> Optional[ASTNode]:
+        """Class-based copy of the subtree at index (the whole tree by default)."""
+        new = object.__new__
+        struct_type = (type_table or TypeTable()).struct_type
+        kinds, lines, columns, payloads = self.kinds, self.lines, self.columns, self.payloads
+        first_child, next_sibling = self.first_child, self.next_sibling
+        strings, ints, floats = self.strings, self.ints, self.floats
+        # Walking the subtree's entries backwards finishes the children of a
+        # node last to first, so they are on top of the stack, first child on
+        # top, when the node itself is reached.
+        stack = []
+        pop = stack.pop
+        push = stack.append
+        for entry in range(self._subtree_end(index) - 1, index - 1, -1):
+            kind = kinds[entry]
+            if kind == MISSING:
+                push(None)
+                continue
+            if kind == LIST:
+                items = []
+                child = first_child[entry]
+                while child >= 0:
+                    items.append(pop())
+                    child = next_sibling[child]
+                push(items)
+                continue
+            values = []
+            for field, field_kind in _FIELDS[kind]:
+                if field_kind == NODE or field_kind == NODES:
+                    values.append(pop())
+                elif field_kind == NAME:
+                    values.append(strings[payloads[entry]])
+                elif field_kind == INT:
+                    values.append(ints[payloads[entry]])
+                else:
+                    values.append(floats[payloads[entry]])
+            node_class = _CLASSES[kind]
+            if _IS_TYPE[kind]:
+                # Type nodes are shared and carry no position
+                push(struct_type(*values) if node_class is StructType else node_class())
+                continue
+            node = new(node_class)
+            line, column = lines[entry], columns[entry]
+            node.line = None if line < 0 else line
+            node.column = None if column < 0 else column
+            for (field, _), value in zip(_FIELDS[kind], values):
+                setattr(node, field, value)
+            push(node)
+        return stack[0]
+
+    def _subtree_end(self, index: int) -> int:
+        # In pre-order the last entry of a subtree is reached through last children
+        last = index
+        child = self.first_child[last]
+        while child >= 0:
+            while self.next_sibling[child] >= 0:
+                child = self.next_sibling[child]
+            last = child
+            child = self.first_child[last]
+        return last + 1
+
+    def nbytes(self) -> int:
+        """Bytes used by the columns and the literal arrays (strings not included)."""
+        columns = (
+            self.kinds, self.first_child, self.next_sibling, self.lines,
+            self.columns, self.payloads, self.ints, self.floats,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+class NodeView:
+    """Read-only view of an arena node with the attributes of its node class."""
+
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena: ASTArena, index: int):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def node_class(self) -> type:
+        return self.arena.node_class(self.index)
+
+    @property
+    def line(self) -> Optional[int]:
+        line = self.arena.lines[self.index]
+        return None if line < 0 else line
+
+    @property
+    def column(self) -> Optional[int]:
+        column = self.arena.columns[self.index]
+        return None if column < 0 else column
+
+    def __getattr__(self, name: str):
+        arena = self.arena
+        kind = arena.kinds[self.index]
+        if kind > 0:
+            scalar = _PAYLOADS[kind]
+            if scalar is not None and scalar[0] == name:
+                return arena.scalar(self.index)
+            for (field, field_kind), child in zip(_CHILD_SLOTS[kind], arena.children(self.index)):
+                if field == name:
+                    if field_kind == NODES:
+                        return [NodeView(arena, item) for item in arena.children(child)]
+                    return None if arena.kinds[child] == MISSING else NodeView(arena, child)
+        raise AttributeError(f"{type(self).__name__} of entry {self.index} has no attribute {name!r}")
+
+    def to_node(self) -> ASTNode:
+        """Class-based copy of the viewed subtree."""
+        return self.arena.to_node(self.index)
+
+    def __str__(self):
+        return str(self.to_node())
+
+
+def measure_arena_memory(lines: int = 20_000) -> dict:
+    """Bytes per node of a generated program's AST as class-based nodes and in an arena."""
+    from src.utils.node_memory import count_nodes, generate_program, measure_node_memory
+
+    program = generate_program(lines)
+    nodes = count_nodes(program)
+    arena = ASTArena.from_tree(program)
+    strings = sum(len(value) for value in arena.strings)
+    return {
+        "lines": lines,
+        "nodes": nodes,
+        "entries": len(arena),
+        "objects": measure_node_memory(lines)["slots"],
+        "arena": (arena.nbytes() + strings) / nodes,
+    }
+
+
+if __name__ == "__main__":
+    result = measure_arena_memory()
+    print(f"generated program: {result['lines']} lines, {result['nodes']} nodes, {result['entries']} arena entries")
+    print(f"bytes per node as objects: {result['objects']:.1f}")
+    print(f"bytes per node in arena:   {result['arena']:.1f}")
@@ -0,0 +1,374 @@
+"""
+Binary AST format for TyC programming language.
+This module dumps an AST built from src/utils/nodes.py into a compact,
+versioned byte string and loads it back, so parsed programs can be cached
+between runs instead of being lexed and parsed again.
+
+Layout (all integers are unsigned LEB128 varints unless noted):
+    magic  b"TYCAST"
+    format version
+    string table: count, then for each string its UTF-8 length and bytes
+    node records in post-order (children before their parent):
+        kind tag (0 stands for a missing child)
+        line: 0 for None, otherwise 1 + the zigzag-encoded difference from
+        the line of the previous record that had one
+        column + 1 (0 stands for None)
+        one payload per field of the node class, in field order:
+            name / operator / string literal: string table index
+            int literal: zigzag-encoded varint
+            float literal: 8-byte little-endian IEEE 754 double
+            child node list: number of children
+            single child node: nothing (its record precedes this one)
+
+Loading keeps the nodes built so far on a stack and pops the children of
+each record, so neither dumping nor loading recurses over the tree.
+"""
+
+import struct
+from sys import intern
+from typing import BinaryIO
+
+from src.utils.nodes import (
+    ASTNode,
+    Type,
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    TypeTable,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+
+
+MAGIC = b"TYCAST"
+
+# Bump whenever the layout, the kind tags or a field schema changes
+FORMAT_VERSION = 1
+
+# Field payload kinds
+NODE = 0
+NODES = 1
+NAME = 2
+INT = 3
+FLOAT = 4
+
+# Kind tag of each node class is its position in this tuple plus one
+SCHEMAS = (
+    (Program, (("decls", NODES),)),
+    (StructDecl, (("name", NAME), ("members", NODES))),
+    (MemberDecl, (("member_type", NODE), ("name", NAME))),
+    (FuncDecl, (("return_type", NODE), ("name", NAME), ("params", NODES), ("body", NODE))),
+    (Param, (("param_type", NODE), ("name", NAME))),
+    (IntType, ()),
+    (FloatType, ()),
+    (StringType, ()),
+    (VoidType, ()),
+    (StructType, (("struct_name", NAME),)),
+    (BlockStmt, (("statements", NODES),)),
+    (VarDecl, (("var_type", NODE), ("name", NAME), ("init_value", NODE))),
+    (IfStmt, (("condition", NODE), ("then_stmt", NODE), ("else_stmt", NODE))),
+    (WhileStmt, (("condition", NODE), ("body", NODE))),
+    (ForStmt, (("init", NODE), ("condition", NODE), ("update", NODE), ("body", NODE))),
+    (SwitchStmt, (("expr", NODE), ("cases", NODES), ("default_case", NODE))),
+    (CaseStmt, (("expr", NODE), ("statements", NODES))),
+    (DefaultStmt, (("statements", NODES),)),
+    (BreakStmt, ()),
+    (ContinueStmt, ()),
+    (ReturnStmt, (("expr", NODE),)),
+    (ExprStmt, (("expr", NODE),)),
+    (BinaryOp, (("left", NODE), ("operator", NAME), ("right", NODE))),
+    (PrefixOp, (("operator", NAME), ("operand", NODE))),
+    (PostfixOp, (("operator", NAME), ("operand", NODE))),
+    (AssignExpr, (("lhs", NODE), ("rhs", NODE))),
+    (MemberAccess, (("obj", NODE), ("member", NAME))),
+    (FuncCall, (("name", NAME), ("args", NODES))),
+    (Identifier, (("name", NAME),)),
+    (StructLiteral, (("values", NODES),)),
+    (IntLiteral, (("value", INT),)),
+    (FloatLiteral, (("value", FLOAT),)),
+    (StringLiteral, (("value", NAME),)),
+)
+
+_TAGS = {node_class: tag for tag, (node_class, _) in enumerate(SCHEMAS, 1)}
+
+_DOUBLE = struct.Struct("<d")
+
+
+class ASTFormatError(ValueError):
+    """Raised when bytes passed to loads are not a valid binary AST."""
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def dumps(node: ASTNode) -> bytes:
+    """Encode the AST rooted at node."""
+    strings = {}
+    records = bytearray()
+
+    def string_index(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    # Entries are (node, expanded): a node is written once its children are
+    stack = [(node, False)]
+    last_line = 0
+    while stack:
+        current, expanded = stack.pop()
+        if current is None:
+            records.append(0)
+            continue
+        node_class = type(current)
+        tag = _TAGS.get(node_class)
+        if tag is None:
+            raise TypeError(f"Cannot encode {node_class.__name__} nodes")
+        schema = SCHEMAS[tag - 1][1]
+        if not expanded:
+            stack.append((current, True))
+            for field, kind in reversed(schema):
+                if kind == NODE:
+                    stack.append((getattr(current, field), False))
+                elif kind == NODES:
+                    stack.extend((child, False) for child in reversed(getattr(current, field)))
+            continue
+        records.append(tag)
+        if current.line is None:
+            records.append(0)
+        else:
+            delta = current.line - last_line
+            last_line = current.line
+            _write_varint(records, (delta << 1 if delta >= 0 else (-delta << 1) - 1) + 1)
+        _write_varint(records, 0 if current.column is None else current.column + 1)
+        for field, kind in schema:
+            if kind == NODE:
+                continue
+            value = getattr(current, field)
+            if kind == NAME:
+                _write_varint(records, string_index(value))
+            elif kind == NODES:
+                _write_varint(records, len(value))
+            elif kind == INT:
+                _write_varint(records, value << 1 if value >= 0 else (-value << 1) - 1)
+            else:
+                records += _DOUBLE.pack(value)
+
+    out = bytearray(MAGIC)
+    _write_varint(out, FORMAT_VERSION)
+    _write_varint(out, len(strings))
+    for value in strings:
+        encoded = value.encode("utf-8")
+        _write_varint(out, len(encoded))
+        out += encoded
+    out += records
+    return bytes(out)
+
+
+def loads(data: bytes, type_table: TypeTable = None) -> ASTNode:
+    """Decode an AST encoded by dumps, taking its struct types from type_table if given."""
+    if data[: len(MAGIC)] != MAGIC:
+        raise ASTFormatError("Not a binary TyC AST")
+    pos = len(MAGIC)
+    end = len(data)
+    struct_type = (type_table or TypeTable()).struct_type
+
+    def varint() -> int:
+        nonlocal pos
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    try:
+        version = varint()
+        if version != FORMAT_VERSION:
+            raise ASTFormatError(f"Unsupported binary AST version: {version}")
+        strings = []
+        for _ in range(varint()):
+            size = varint()
+            strings.append(intern(data[pos : pos + size].decode("utf-8")))
+            pos += size
+
+        # Per tag: class, whether it is a type node, field names,
+        # payload kinds in field order and child fields in reverse order
+        decoders = [None]
+        for node_class, schema in SCHEMAS:
+            kinds = tuple(kind for _, kind in schema)
+            children = tuple(
+                (index, kind) for index, kind in reversed(list(enumerate(kinds))) if kind in (NODE, NODES)
+            )
+            fields = tuple(field for field, _ in schema)
+            decoders.append((node_class, issubclass(node_class, Type), fields, kinds, children))
+        new = object.__new__
+        unpack_double = _DOUBLE.unpack_from
+        stack = []
+        last_line = 0
+        pop = stack.pop
+        push = stack.append
+        while pos < end:
+            tag = data[pos]
+            pos += 1
+            if not tag:
+                push(None)
+                continue
+            node_class, is_type, fields, kinds, children = decoders[tag]
+            line = data[pos]
+            if line < 0x80:
+                pos += 1
+            else:
+                line = varint()
+            column = data[pos]
+            if column < 0x80:
+                pos += 1
+            else:
+                column = varint()
+            if line:
+                line -= 1
+                last_line += -((line + 1) >> 1) if line & 1 else line >> 1
+                line = last_line
+            else:
+                line = None
+            values = []
+            for kind in kinds:
+                if kind == NODE:
+                    values.append(None)
+                    continue
+                if kind == FLOAT:
+                    values.append(unpack_double(data, pos)[0])
+                    pos += 8
+                    continue
+                value = data[pos]
+                if value < 0x80:
+                    pos += 1
+                else:
+                    value = varint()
+                if kind == NAME:
+                    values.append(strings[value])
+                elif kind == INT:
+                    values.append(-((value + 1) >> 1) if value & 1 else value >> 1)
+                else:
+                    values.append(value)
+            for index, kind in children:
+                if kind == NODE:
+                    values[index] = pop()
+                else:
+                    count = values[index]
+                    if count:
+                        values[index] = stack[-count:]
+                        del stack[-count:]
+                    else:
+                        values[index] = []
+            if is_type:
+                # Type nodes are shared and carry no position
+                push(struct_type(*values) if node_class is StructType else node_class())
+                continue
+            node = new(node_class)
+            node.line = line
+            node.column = column - 1 if column else None
+            for field, value in zip(fields, values):
+                setattr(node, field, value)
+            push(node)
+    except (IndexError, TypeError, UnicodeDecodeError, struct.error) as e:
+        raise ASTFormatError("Truncated or corrupt binary AST") from e
+    if len(stack) != 1:
+        raise ASTFormatError("Truncated or corrupt binary AST")
+    return stack[0]
+
+
+def dump(node: ASTNode, file: BinaryIO):
+    """Write the encoding of node to a binary file object."""
+    file.write(dumps(node))
+
+
+def load(file: BinaryIO) -> ASTNode:
+    """Read an AST written by dump from a binary file object."""
+    return loads(file.read())
+
+
+def measure_load_time(lines: int = 10_000, repeat: int = 5) -> dict:
+    """Best-of-repeat seconds to parse a generated program versus loading its cached AST.
+
+    AST generation is not counted in the parse time, so the ratio is a lower bound.
+    """
+    import pickle
+    import time
+
+    from src.utils.node_memory import generate_program, generate_source
+    from src.utils.parsing import parse_source
+
+    source = generate_source(lines)
+    program = generate_program(lines)
+    data = dumps(program)
+    pickled = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+    steps = {
+        "parse": lambda: parse_source(source),
+        "load": lambda: loads(data),
+        "unpickle": lambda: pickle.loads(pickled),
+        "dump": lambda: dumps(program),
+        "pickle": lambda: pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL),
+    }
+    timings = {}
+    for name, step in steps.items():
+        best = None
+        for _ in range(1 if name == "parse" else repeat):
+            start = time.perf_counter()
+            step()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    timings["size"] = len(data)
+    timings["pickle_size"] = len(pickled)
+    return timings
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # The generated parser imports lexererr from the build directory
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.path.join(project_root, "build"))
+    timings = measure_load_time()
+    print(f"parse source:  {timings['parse'] * 1000:.1f} ms")
+    print(f"load binary:   {timings['load'] * 1000:.1f} ms ({timings['size']} bytes)")
+    print(f"unpickle:      {timings['unpickle'] * 1000:.1f} ms ({timings['pickle_size']} bytes)")
+    print(f"dump binary:   {timings['dump'] * 1000:.1f} ms")
+    print(f"pickle:        {timings['pickle'] * 1000:.1f} ms")
+    print(f"load speed-up: {timings['parse'] / timings['load']:.0f}x")
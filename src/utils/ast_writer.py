@@ -0,0 +1,170 @@
+"""
+AST serializer for TyC programming language.
+This module writes the textual form of an AST (the format returned by the
+node classes' __str__) to any writable stream. It walks the tree with an
+explicit stack instead of recursing, so the depth of the tree is not limited
+by the interpreter's recursion limit, and output is written in chunks instead
+of being built from nested intermediate strings.
+"""
+
+import io
+from typing import TextIO
+
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+
+
+# Pending output is handed to stream.write once this many pieces are collected
+CHUNK_PARTS = 4096
+
+
+def _joined(items: list) -> list:
+    parts = []
+    for item in items or ():
+        parts.append(item)
+        parts.append(", ")
+    if parts:
+        parts.pop()
+    return parts
+
+
+# Nodes without child nodes are written straight from a format function
+_LEAVES = {
+    IntType: lambda n: "IntType()",
+    FloatType: lambda n: "FloatType()",
+    StringType: lambda n: "StringType()",
+    VoidType: lambda n: "VoidType()",
+    StructType: lambda n: f"StructType({n.struct_name})",
+    BreakStmt: lambda n: "BreakStmt()",
+    ContinueStmt: lambda n: "ContinueStmt()",
+    Identifier: lambda n: f"Identifier({n.name})",
+    IntLiteral: lambda n: f"IntLiteral({n.value})",
+    FloatLiteral: lambda n: f"FloatLiteral({n.value})",
+    StringLiteral: lambda n: f"StringLiteral({n.value!r})",
+}
+
+# Other nodes are laid out as a list of parts: strings are written as they
+# are and child nodes are expanded in their place. None stands for a missing
+# child that is written as "None".
+_LAYOUTS = {
+    Program: lambda n: ["Program([", *_joined(n.decls), "])"],
+    StructDecl: lambda n: [f"StructDecl({n.name}, [", *_joined(n.members), "])"],
+    MemberDecl: lambda n: ["MemberDecl(", n.member_type, f", {n.name})"],
+    FuncDecl: lambda n: [
+        "FuncDecl(", n.return_type if n.return_type else "auto", f", {n.name}, [",
+        *_joined(n.params), "], ", n.body, ")",
+    ],
+    Param: lambda n: ["Param(", n.param_type, f", {n.name})"],
+    BlockStmt: lambda n: ["BlockStmt([", *_joined(n.statements), "])"],
+    VarDecl: lambda n: [
+        "VarDecl(", "auto" if n.var_type is None else n.var_type, f", {n.name}",
+        *((" = ", n.init_value) if n.init_value else ()), ")",
+    ],
+    IfStmt: lambda n: [
+        "IfStmt(if ", n.condition, " then ", n.then_stmt,
+        *((", else ", n.else_stmt) if n.else_stmt else ()), ")",
+    ],
+    WhileStmt: lambda n: ["WhileStmt(while ", n.condition, " do ", n.body, ")"],
+    ForStmt: lambda n: [
+        "ForStmt(for ", n.init if n.init else "None", "; ", n.condition if n.condition else "None",
+        "; ", n.update if n.update else "None", " do ", n.body, ")",
+    ],
+    SwitchStmt: lambda n: [
+        "SwitchStmt(switch ", n.expr, " cases [", *_joined(n.cases), "]",
+        *((", default ", n.default_case) if n.default_case else ()), ")",
+    ],
+    CaseStmt: lambda n: ["CaseStmt(case ", n.expr, ": [", *_joined(n.statements), "])"],
+    DefaultStmt: lambda n: ["DefaultStmt(default: [", *_joined(n.statements), "])"],
+    ReturnStmt: lambda n: ["ReturnStmt(return", *((" ", n.expr) if n.expr else ()), ")"],
+    ExprStmt: lambda n: ["ExprStmt(", n.expr, ")"],
+    BinaryOp: lambda n: ["BinaryOp(", n.left, f", {n.operator}, ", n.right, ")"],
+    PrefixOp: lambda n: [f"PrefixOp({n.operator}", n.operand, ")"],
+    PostfixOp: lambda n: ["PostfixOp(", n.operand, f"{n.operator})"],
+    AssignExpr: lambda n: ["AssignExpr(", n.lhs, " = ", n.rhs, ")"],
+    MemberAccess: lambda n: ["MemberAccess(", n.obj, f".{n.member})"],
+    FuncCall: lambda n: [f"FuncCall({n.name}, [", *_joined(n.args), "])"],
+    StructLiteral: lambda n: ["StructLiteral({", *_joined(n.values), "})"],
+}
+
+
+def _inherit_format(node_class: type):
+    """Give node_class the format of its nearest base class that has one, as __str__ would be inherited."""
+    for base in node_class.__mro__[1:]:
+        if base in _LAYOUTS:
+            _LAYOUTS[node_class] = _LAYOUTS[base]
+            return
+        if base in _LEAVES:
+            _LEAVES[node_class] = _LEAVES[base]
+            return
+    _LEAVES[node_class] = lambda n: f"{type(n).__name__}()"
+
+
+def write_ast(node: ASTNode, stream: TextIO):
+    """Write the textual form of node to stream."""
+    leaves = _LEAVES
+    layouts = _LAYOUTS
+    pending = []
+    stack = [node]
+    while stack:
+        part = stack.pop()
+        if type(part) is not str:
+            node_class = type(part)
+            if node_class in leaves:
+                part = leaves[node_class](part)
+            elif node_class in layouts:
+                stack.extend(reversed(layouts[node_class](part)))
+                continue
+            elif isinstance(part, ASTNode):
+                # A subclass: format it as its base class and try again
+                _inherit_format(node_class)
+                stack.append(part)
+                continue
+            else:
+                part = str(part)
+        pending.append(part)
+        if len(pending) >= CHUNK_PARTS:
+            stream.write("".join(pending))
+            pending.clear()
+    if pending:
+        stream.write("".join(pending))
+
+
+def ast_to_string(node: ASTNode) -> str:
+    """Textual form of node, as returned by str(node)."""
+    output = io.StringIO()
+    write_ast(node, output)
+    return output.getvalue()
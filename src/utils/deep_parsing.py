@@ -0,0 +1,259 @@
+"""
+Deep-nesting-safe parsing for TyC programming language.
+This module runs TyCParser (and ASTGeneration) or the direct AST builder in
+a dedicated thread whose recursion limit and stack size grow with a
+configurable nesting limit, so programs nested tens of thousands of levels
+deep (parenthesized expressions, unary chains, nested blocks) parse instead
+of overflowing Python's default recursion limit of 1000.
+
+Once a program parses, or the parse runs out of recursion, its tokens are
+scanned for their nesting depth: open parentheses and braces plus prefix
+operators still waiting for their operand. A program nested deeper than the
+limit is rejected with a NestingError at the first token past it; errors the
+parse reports first, such as a syntax error before the deep part, are raised
+as they are. Constructs the scan does not count (long `else if` chains,
+`a = b = c = ...`) recurse less per level than parentheses, so they fit in
+the same budget; if one still exhausts it, the RecursionError becomes a
+NestingError at the deepest token as well.
+
+The recursion limit is process-wide: while a deep parse runs, other threads
+may recurse as deep, past what their own stacks hold. It is restored when
+the last deep parse finishes, and never raised above MAX_RECURSION_LIMIT.
+
+Everything else behaves as in src.utils.parsing and build_ast: the same
+parse results, lexer exceptions and syntax error messages.
+"""
+
+import os
+import sys
+import threading
+from typing import Callable, Tuple
+
+from build.TyCParser import TyCParser
+from src.astgen.direct_builder import PREFIX_OPS, build_ast, tokenize
+from src.utils.error_listener import SyntaxException
+from src.utils.nodes import Program
+from src.utils.parsing import ParseResult, create_parser, parse_program
+
+
+# Deepest nesting accepted. Setting TYC_MAX_NESTING also switches the test
+# wrappers to this module.
+DEFAULT_MAX_NESTING = 50_000
+MAX_NESTING = int(os.environ.get("TYC_MAX_NESTING") or DEFAULT_MAX_NESTING)
+DEEP_MODE = bool(os.environ.get("TYC_MAX_NESTING"))
+
+# Python frames per nesting level: a nested struct literal takes 14 in
+# TyCParser, a parenthesized expression 11, the direct builder at most 4
+FRAMES_PER_LEVEL = 16
+# Frames below the outermost level: the thread, the parse entry points and
+# the rules down to the first expression
+RECURSION_HEADROOM = 1_000
+# Python-to-Python calls do not use the C stack on CPython 3.11+; this
+# leaves room for the C calls made at each level
+STACK_BYTES_PER_FRAME = 128
+MIN_STACK_BYTES = 16 << 20
+# Highest recursion limit run_deep sets, enough for DEFAULT_MAX_NESTING
+MAX_RECURSION_LIMIT = 1_000_000
+
+_OPEN = {TyCParser.LPAREN, TyCParser.LBRACE}
+_CLOSE = {TyCParser.RPAREN, TyCParser.RBRACE}
+# Tokens after which `-`, `+`, `++` and `--` are binary or postfix
+_OPERAND_END = {
+    TyCParser.ID,
+    TyCParser.INT_LIT,
+    TyCParser.FLOAT_LIT,
+    TyCParser.STRING_LIT,
+    TyCParser.RPAREN,
+    TyCParser.RBRACE,
+}
+
+# sys.setrecursionlimit is process-wide: raised while any deep parse runs
+_limit_lock = threading.Lock()
+_running = 0
+_saved_limit = None
+
+
+class NestingError(SyntaxException):
+    """A program nested deeper than the parser is allowed to recurse."""
+
+    def __init__(self, token, limit: int):
+        self.token = token
+        self.limit = limit
+        text = "<EOF>" if token.type == TyCParser.EOF else token.text
+        super().__init__(f"Error on line {token.line} col {token.column}: {text} nested deeper than {limit} levels")
+
+
+def nesting_depth(tokens: list, limit: int = None) -> Tuple[int, int]:
+    """Deepest nesting level in tokens and the index of the first token at it.
+
+    With limit, the scan stops at the first token nested deeper than limit.
+    """
+    depth = 0  # levels of the enclosing parentheses and braces
+    prefixes = 0  # prefix operators of the current level waiting for an operand
+    saved = []  # prefixes of the enclosing levels
+    deepest = where = 0
+    after_operand = False
+    for index, token in enumerate(tokens):
+        token_type = token.type
+        if token_type in _OPEN:
+            saved.append(prefixes)
+            depth += prefixes + 1
+            prefixes = 0
+            after_operand = False
+        elif token_type in _CLOSE:
+            if saved:
+                prefixes = saved.pop()
+                depth -= prefixes + 1
+            prefixes = 0
+            after_operand = True
+        elif token_type in PREFIX_OPS and not after_operand:
+            prefixes += 1
+        elif token_type in _OPERAND_END:
+            prefixes = 0
+            after_operand = True
+        elif token_type != TyCParser.INC and token_type != TyCParser.DEC:
+            # Any other token starts a new operand; postfix ++/-- end one
+            after_operand = False
+        level = depth + prefixes
+        if level > deepest:
+            deepest, where = level, index
+            if limit is not None and level > limit:
+                break
+    return deepest, where
+
+
+def check_nesting(tokens: list, limit: int = None):
+    """Raise NestingError when tokens are nested deeper than limit."""
+    limit = MAX_NESTING if limit is None else limit
+    deepest, where = nesting_depth(tokens, limit)
+    if deepest > limit:
+        raise NestingError(tokens[where], limit)
+
+
+def run_deep(function: Callable, *args, limit: int = None):
+    """function(*args) in a thread with room for limit nesting levels; returns or raises what it does.
+
+    Raises ValueError when limit needs a recursion limit above MAX_RECURSION_LIMIT.
+    """
+    global _running, _saved_limit
+    limit = MAX_NESTING if limit is None else limit
+    frames = RECURSION_HEADROOM + limit * FRAMES_PER_LEVEL
+    if frames > MAX_RECURSION_LIMIT:
+        raise ValueError(f"Nesting limit {limit} needs a recursion limit above {MAX_RECURSION_LIMIT}")
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = function(*args)
+        except BaseException as e:
+            outcome["error"] = e
+
+    with _limit_lock:
+        if _running == 0:
+            _saved_limit = sys.getrecursionlimit()
+        _running += 1
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), frames))
+        thread = threading.Thread(target=target, name="tyc-deep-parse")
+        # Whole MiB: some platforms need a multiple of the page size
+        stack_mib = -(-max(frames * STACK_BYTES_PER_FRAME, MIN_STACK_BYTES) >> 20)
+        previous = threading.stack_size(stack_mib << 20)
+        try:
+            thread.start()
+        finally:
+            threading.stack_size(previous)
+    try:
+        thread.join()
+    finally:
+        with _limit_lock:
+            _running -= 1
+            if _running == 0:
+                sys.setrecursionlimit(_saved_limit)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+def _too_deep(tokens: list, limit: int) -> NestingError:
+    # For a parse that ran out of recursion: at the first token past limit, or else the deepest one
+    return NestingError(tokens[nesting_depth(tokens, limit)[1]], limit)
+
+
+def parse_source_deep(source: str, mode: str = None, backend: str = None, limit: int = None) -> ParseResult:
+    """parse_source for programs nested up to limit levels deep; deeper ones raise NestingError."""
+    limit = MAX_NESTING if limit is None else limit
+    parser = create_parser(source, backend)
+    stream = parser.getTokenStream()
+    try:
+        result = run_deep(parse_program, parser, mode, limit=limit)
+    except RecursionError:
+        try:
+            stream.fill()
+        except Exception:
+            # A lexer error past the deep part: scan the tokens before it
+            pass
+        raise _too_deep(stream.tokens, limit) from None
+    check_nesting(stream.tokens, limit)
+    return result
+
+
+def build_ast_deep(source: str, backend: str = None, limit: int = None) -> Program:
+    """build_ast for programs nested up to limit levels deep; deeper ones raise NestingError."""
+    limit = MAX_NESTING if limit is None else limit
+    try:
+        tokens = tokenize(source, backend)
+    except Exception:
+        # A lexer error: build_ast reports it, or a syntax error before it
+        return run_deep(build_ast, source, backend, limit=limit)
+    try:
+        program = run_deep(build_ast, source, backend, tokens, limit=limit)
+    except RecursionError:
+        raise _too_deep(tokens, limit) from None
+    check_nesting(tokens, limit)
+    return program
+
+
+def generate_nested_source(depth: int, kind: str = "parens") -> str:
+    """A program nested depth levels deep with one kind of construct.
+
+    kind is "parens" (`((...1...))`), "unary" (`- - ... 1`), "blocks"
+    (`{ int x; { int x; ... } }`), "struct" (`{{...}}` as an initializer) or
+    "else-if" (an `if ... else if ...` chain).
+    """
+    if kind == "parens":
+        body = "int x = " + "(" * depth + "1" + ")" * depth + ";"
+    elif kind == "unary":
+        body = "int x = " + "- " * depth + "1;"
+    elif kind == "blocks":
+        body = "{ int x; " * depth + "}" * depth
+    elif kind == "struct":
+        body = "P p = " + "{" * depth + "}" * depth + ";"
+    elif kind == "else-if":
+        body = "int x = 0; " + "if (x) x = 1; else " * depth + "x = 2;"
+    else:
+        raise ValueError(f"Unknown nesting kind: {kind}")
+    return f"void main() {{ {body} }}\n"
+
+
+def measure_deep_parsing(depths=(1_000, 10_000, 40_000), kinds=("parens", "unary", "blocks")) -> dict:
+    """Seconds to parse and to build the AST of generated programs, per kind and depth."""
+    import time
+
+    result = {}
+    for kind in kinds:
+        for depth in depths:
+            source = generate_nested_source(depth, kind)
+            timings = {}
+            for name, step in (("parse", parse_source_deep), ("direct", build_ast_deep)):
+                start = time.perf_counter()
+                step(source)
+                timings[name] = time.perf_counter() - start
+            result[kind, depth] = timings
+    return result
+
+
+if __name__ == "__main__":
+    for (kind, depth), timings in measure_deep_parsing().items():
+        print(
+            f"{kind:7} depth {depth:>6}: parse {timings['parse'] * 1000:8.0f} ms, "
+            f"direct build {timings['direct'] * 1000:8.0f} ms"
+        )
@@ -0,0 +1,142 @@
+"""
+Persistent DFA cache for the TyC lexer and parser simulators.
+This module snapshots the DFA states that TyCLexer and TyCParser build
+while predicting (decisionsToDFA) into a versioned file, and reloads them
+into a fresh process so that it starts with a warm prediction cache.
+"""
+
+import hashlib
+import os
+import pickle
+
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.SemanticContext import SemanticContext
+from antlr4.dfa.DFA import DFA
+from antlr4.PredictionContext import PredictionContext
+
+from build import TyCLexer as lexer_module
+from build import TyCParser as parser_module
+from build.TyCLexer import TyCLexer
+from build.TyCParser import TyCParser
+
+
+# Bump whenever the layout of the cache file changes
+CACHE_VERSION = 1
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GRAMMAR_FILE = os.path.join(PROJECT_ROOT, "src", "grammar", "TyC.g4")
+DEFAULT_CACHE_FILE = os.path.join(PROJECT_ROOT, "build", "TyC.dfa")
+
+RECOGNIZERS = {"lexer": TyCLexer, "parser": TyCParser}
+
+
+def grammar_hash(grammar_file: str = GRAMMAR_FILE) -> str:
+    """Hash of TyC.g4 together with the generated ATNs the DFA states refer to."""
+    digest = hashlib.sha256()
+    with open(grammar_file, "rb") as f:
+        digest.update(f.read())
+    for module in (lexer_module, parser_module):
+        digest.update(repr(module.serializedATN()).encode())
+    return digest.hexdigest()
+
+
+def _shared_objects():
+    """Objects owned by the ATNs or the runtime that must be restored by identity."""
+    shared = {
+        id(PredictionContext.EMPTY): ("empty-context",),
+        id(SemanticContext.NONE): ("no-predicate",),
+        id(ATNSimulator.ERROR): ("error-state",),
+    }
+    for name, recognizer in RECOGNIZERS.items():
+        for state in recognizer.atn.states:
+            if state is not None:
+                shared[id(state)] = ("atn-state", name, state.stateNumber)
+        for index, action in enumerate(recognizer.atn.lexerActions or []):
+            shared.setdefault(id(action), ("lexer-action", name, index))
+    return shared
+
+
+class _DFAPickler(pickle.Pickler):
+    def __init__(self, file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = _shared_objects()
+
+    def persistent_id(self, obj):
+        return self.shared.get(id(obj))
+
+
+class _DFAUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "empty-context":
+            return PredictionContext.EMPTY
+        if kind == "no-predicate":
+            return SemanticContext.NONE
+        if kind == "error-state":
+            return ATNSimulator.ERROR
+        if kind == "atn-state":
+            return RECOGNIZERS[pid[1]].atn.states[pid[2]]
+        if kind == "lexer-action":
+            return RECOGNIZERS[pid[1]].atn.lexerActions[pid[2]]
+        raise pickle.UnpicklingError(f"Unknown persistent id: {pid}")
+
+
+def _snapshot(decisions_to_dfa: list) -> list:
+    # DFA states are stored as lists; the state dictionaries hash their keys and
+    # are rebuilt after loading, once every state is complete.
+    return [(dfa.s0, list(dfa.states)) for dfa in decisions_to_dfa]
+
+
+def _restore(decisions_to_dfa: list, snapshot: list):
+    for dfa, (s0, states) in zip(decisions_to_dfa, snapshot):
+        dfa.s0 = s0
+        dfa._states = {state: state for state in states}
+
+
+def count_dfa_states() -> dict:
+    """Number of DFA states currently cached by the lexer and the parser."""
+    return {
+        name: sum(len(dfa.states) for dfa in recognizer.decisionsToDFA)
+        for name, recognizer in RECOGNIZERS.items()
+    }
+
+
+def clear_dfa_cache():
+    """Drop every cached DFA state, as in a freshly started process."""
+    for recognizer in RECOGNIZERS.values():
+        for dfa in recognizer.decisionsToDFA:
+            fresh = DFA(dfa.atnStartState, dfa.decision)
+            dfa.s0 = fresh.s0
+            dfa._states = fresh._states
+
+
+def save_dfa_cache(cache_file: str = DEFAULT_CACHE_FILE):
+    """Write the current lexer and parser DFA states to cache_file."""
+    header = {"version": CACHE_VERSION, "grammar": grammar_hash()}
+    payload = {
+        name: _snapshot(recognizer.decisionsToDFA)
+        for name, recognizer in RECOGNIZERS.items()
+    }
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        _DFAPickler(f).dump(payload)
+    os.replace(tmp_file, cache_file)
+
+
+def load_dfa_cache(cache_file: str = DEFAULT_CACHE_FILE) -> bool:
+    """Load DFA states saved by save_dfa_cache.
+
+    Returns False, leaving the current DFAs untouched, when the file is missing
+    or was written for another cache version or another grammar.
+    """
+    if not os.path.exists(cache_file):
+        return False
+    with open(cache_file, "rb") as f:
+        header = pickle.load(f)
+        if header.get("version") != CACHE_VERSION or header.get("grammar") != grammar_hash():
+            return False
+        payload = _DFAUnpickler(f).load()
+    for name, recognizer in RECOGNIZERS.items():
+        _restore(recognizer.decisionsToDFA, payload[name])
+    return True
@@ -0,0 +1,181 @@
+"""
+Multi-error diagnostics for TyC programming language.
+This module lexes and parses a program once and collects every lexical and
+syntax error instead of stopping at the first one, for tools such as CI
+checks that want all problems of a file in one run.
+
+Lexical errors are resynchronized by dropping the offending token and
+lexing on from the character after it (after an illegal escape, from the
+end of the string literal, so its closing quote does not open another
+string); syntax errors are recovered from with ANTLR's
+DefaultErrorStrategy (single-token insertion/deletion, then
+resynchronization on the follow set). When recovery unwinds to the program
+rule, which would skip the rest of the file, parsing resumes at the next
+top-level declaration instead. Each error becomes a Diagnostic whose
+message is the text the default single-error mode raises for it.
+
+The default pipeline in src.utils.parsing is unchanged and still stops at
+the first error.
+"""
+
+from typing import List
+
+from antlr4 import CommonTokenStream, InputStream, Token
+from antlr4.Lexer import TokenSource
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+
+# src.utils.parsing first: it puts the build directory, with lexererr, on the path
+from src.utils.parsing import create_lexer
+from build.TyCParser import TyCParser
+from lexererr import IllegalEscape, LexerError
+
+
+LEXICAL = "lexical"
+SYNTAX = "syntax"
+SEMANTIC = "semantic"  # from src.semantics.parallel_checker
+
+
+class Diagnostic:
+    """One lexical, syntax or static error: kind, position and offending text."""
+
+    __slots__ = ("kind", "line", "column", "text", "message")
+
+    def __init__(self, kind: str, line: int, column: int, text: str, message: str):
+        self.kind = kind  # LEXICAL, SYNTAX or SEMANTIC
+        self.line = line
+        self.column = column
+        self.text = text
+        self.message = message  # what the single-error mode raises for this error
+
+    def __repr__(self):
+        return f"Diagnostic({self.kind!r}, {self.line}, {self.column}, {self.text!r})"
+
+    def __str__(self):
+        return self.message
+
+
+class ResyncLexer(TokenSource):
+    """Token source over a lexer that records lexer errors and keeps lexing.
+
+    Both lexer backends leave the offending token in _token and are positioned
+    after it when they raise, so the next nextToken call resumes there.
+    """
+
+    def __init__(self, lexer, diagnostics: list):
+        self.lexer = lexer
+        self.diagnostics = diagnostics
+
+    def __getattr__(self, name):
+        # Everything else (token factory, input stream, names) is the lexer's
+        return getattr(self.lexer, name)
+
+    def nextToken(self):
+        while True:
+            try:
+                return self.lexer.nextToken()
+            except LexerError as e:
+                token = self.lexer._token
+                self.diagnostics.append(Diagnostic(LEXICAL, token.line, token.column, token.text, str(e)))
+                if isinstance(e, IllegalEscape):
+                    self._skip_string_rest()
+
+    def _skip_string_rest(self):
+        # Up to and including the closing quote, stopping at the end of the line
+        lexer = self.lexer
+        data = lexer.inputStream.strdata
+        start = end = lexer.getCharIndex()
+        while end < len(data) and data[end] not in '"\r\n':
+            end += 2 if data[end] == "\\" else 1
+        end = min(end + (end < len(data) and data[end] == '"'), len(data))
+        # No newline is skipped, so only the column moves
+        if hasattr(lexer, "_interp"):
+            lexer._interp.column += end - start
+            lexer.inputStream.seek(end)
+        else:
+            lexer.column += end - start
+            lexer._pos = end
+
+
+class CollectingErrorListener(ErrorListener):
+    """Records syntax errors as diagnostics, formatted like NewErrorListener."""
+
+    def __init__(self, diagnostics: list):
+        self.diagnostics = diagnostics
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        text = getattr(offendingSymbol, "text", str(offendingSymbol))
+        self.diagnostics.append(
+            Diagnostic(SYNTAX, line, column, text, f"Error on line {line} col {column}: {text}")
+        )
+
+
+class CollectingErrorStrategy(DefaultErrorStrategy):
+    """DefaultErrorStrategy that leaves recovery in the program rule to collect_diagnostics."""
+
+    def recover(self, recognizer, e):
+        # The program rule has no follow set: the default recovery would consume to EOF
+        if recognizer._ctx.parentCtx is not None:
+            super().recover(recognizer, e)
+
+
+def declaration_starts(tokens: list) -> List[int]:
+    """Indices of the tokens that start a top-level declaration.
+
+    A declaration starts after a `}` or `;` at brace depth 0; the `;` that
+    ends a struct declaration belongs to the declaration before it.
+    """
+    starts = [0]
+    depth = 0
+    for index, token in enumerate(tokens):
+        if token.type == TyCParser.LBRACE:
+            depth += 1
+        elif token.type == TyCParser.RBRACE:
+            depth -= 1
+            if depth == 0 and (index + 1 == len(tokens) or tokens[index + 1].type != TyCParser.SEMI):
+                starts.append(index + 1)
+        elif token.type == TyCParser.SEMI and depth == 0:
+            starts.append(index + 1)
+    return starts
+
+
+def collect_diagnostics(source: str, backend: str = None) -> List[Diagnostic]:
+    """Every lexical and syntax error of source, in source order."""
+    diagnostics = []
+    lexer = ResyncLexer(create_lexer(InputStream(source), backend), diagnostics)
+    parser = TyCParser(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    parser.addErrorListener(CollectingErrorListener(diagnostics))
+    parser._errHandler = CollectingErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.LL
+    stream = parser.getTokenStream()
+    parser.program()
+    while stream.LA(1) != Token.EOF:
+        # The error unwound to the program rule: go on with the next declaration
+        stream.fill()
+        index = stream.index
+        stream.seek(next((start for start in declaration_starts(stream.tokens) if start > index), len(stream.tokens) - 1))
+        parser._errHandler.reset(parser)
+        parser.program()
+    # Lookahead can lex past a syntax error before it is reported
+    diagnostics.sort(key=lambda diagnostic: (diagnostic.line, diagnostic.column))
+    return diagnostics
+
+
+def check_file(file_path: str, backend: str = None) -> List[Diagnostic]:
+    """collect_diagnostics for a TyC source file."""
+    with open(file_path, encoding="utf-8") as f:
+        return collect_diagnostics(f.read(), backend)
+
+
+if __name__ == "__main__":
+    import sys
+
+    errors = 0
+    for file_path in sys.argv[1:]:
+        for diagnostic in check_file(file_path):
+            errors += 1
+            print(f"{file_path}:{diagnostic.line}:{diagnostic.column}: {diagnostic.kind}: {diagnostic.message}")
+    print(f"{errors} error(s) in {len(sys.argv) - 1} file(s)")
+    sys.exit(1 if errors else 0)
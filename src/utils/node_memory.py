@@ -0,0 +1,227 @@
+"""
+AST node memory benchmark for TyC programming language.
+This module builds the AST of a generated TyC program and measures how many
+bytes each node takes with the __slots__ layout of src/utils/nodes.py,
+compared with the same tree stored in plain objects with a __dict__ (the
+layout the node classes had before __slots__ was added).
+"""
+
+import tracemalloc
+
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    FuncDecl,
+    Param,
+    IntType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    ForStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    AssignExpr,
+    FuncCall,
+    Identifier,
+    IntLiteral,
+)
+
+
+# Source lines taken by each generated function (header, body and closing brace)
+LINES_PER_FUNCTION = 10
+
+
+def node_fields(node_class: type) -> tuple:
+    """All slot names of a node class, base class fields first."""
+    return tuple(
+        field
+        for klass in reversed(node_class.__mro__)
+        for field in klass.__dict__.get("__slots__", ())
+    )
+
+
+def _function(index: int, line: int) -> FuncDecl:
+    # int f<i>(int a, int b) {
+    #     int x = a + b * 2;
+    #     int y = x - 1;
+    #     if (x > y) x = x + 1; else y = y + 1;
+    #     for (int i = 0; i < b; ++i) x = x + i;
+    #     printInt(x);
+    #     y = f<i-1>(x, y);
+    #     x = x * y;
+    #     return x + y;
+    # }
+    def ident(name, col):
+        node = Identifier(name)
+        node.line, node.column = line, col
+        return node
+
+    def lit(value, col):
+        node = IntLiteral(value)
+        node.line, node.column = line, col
+        return node
+
+    def at(node, body_line, col=4):
+        node.line, node.column = body_line, col
+        return node
+
+    callee = f"f{index - 1}" if index else "printInt"
+    body = [
+        at(VarDecl(IntType(), "x", BinaryOp(ident("a", 12), "+", BinaryOp(ident("b", 16), "*", lit(2, 20)))), line + 1),
+        at(VarDecl(IntType(), "y", BinaryOp(ident("x", 12), "-", lit(1, 16))), line + 2),
+        at(
+            IfStmt(
+                BinaryOp(ident("x", 8), ">", ident("y", 12)),
+                ExprStmt(AssignExpr(ident("x", 15), BinaryOp(ident("x", 19), "+", lit(1, 23)))),
+                ExprStmt(AssignExpr(ident("y", 31), BinaryOp(ident("y", 35), "+", lit(1, 39)))),
+            ),
+            line + 3,
+        ),
+        at(
+            ForStmt(
+                VarDecl(IntType(), "i", lit(0, 17)),
+                BinaryOp(ident("i", 20), "<", ident("b", 24)),
+                PrefixOp("++", ident("i", 29)),
+                ExprStmt(AssignExpr(ident("x", 32), BinaryOp(ident("x", 36), "+", ident("i", 40)))),
+            ),
+            line + 4,
+        ),
+        at(ExprStmt(FuncCall("printInt", [ident("x", 13)])), line + 5),
+        at(ExprStmt(AssignExpr(ident("y", 4), FuncCall(callee, [ident("x", 11), ident("y", 14)]))), line + 6),
+        at(ExprStmt(AssignExpr(ident("x", 4), BinaryOp(ident("x", 8), "*", ident("y", 12)))), line + 7),
+        at(ReturnStmt(BinaryOp(ident("x", 11), "+", ident("y", 15))), line + 8),
+    ]
+    params = [Param(IntType(), "a"), Param(IntType(), "b")]
+    return at(FuncDecl(IntType(), f"f{index}", params, at(BlockStmt(body), line, 23)), line, 0)
+
+
+def generate_program(lines: int = 100_000) -> Program:
+    """AST of a generated TyC program of about the given number of source lines."""
+    decls = [
+        _function(index, 1 + index * LINES_PER_FUNCTION)
+        for index in range(max(1, lines // LINES_PER_FUNCTION))
+    ]
+    program = Program(decls)
+    program.line, program.column = 1, 0
+    return program
+
+
+_FUNCTION_SOURCE = """int f{index}(int a, int b) {{
+    int x = a + b * 2;
+    int y = x - 1;
+    if (x > y) x = x + 1; else y = y + 1;
+    for (int i = 0; i < b; ++i) x = x + i;
+    printInt(x);
+    y = {callee}(x, y);
+    x = x * y;
+    return x + y;
+}}
+"""
+
+
+def generate_source(lines: int = 100_000) -> str:
+    """TyC source of the program whose AST generate_program builds."""
+    return "".join(
+        _FUNCTION_SOURCE.format(index=index, callee=f"f{index - 1}" if index else "printInt")
+        for index in range(max(1, lines // LINES_PER_FUNCTION))
+    )
+
+
+_EXPRESSION_FUNCTION_SOURCE = """int g{index}(int a, int b, int c) {{
+    int x = (a + b) * (c - a) / 2 + a % 3 * (b - c);
+    int y = -x + (a * a - b * b) / (c + 1) - (a + b + c) % 7;
+    x = x * 2 + y * 3 - (x - y) * (x + y) / 4 + a * b * c;
+    y = (x > y && a <= b || c != 0) + (x == y) * (a + 1);
+    x = {callee}(x + 1, y - 1, (a + b) * c) + x * (y + a) - b / (c + 2);
+    y = ((a + 1) * (b + 2) - (c + 3) * (x + 4)) % (y * y + 1);
+    x = x + y * (a - b) - c * (x - y) + (a * b - c) / 3;
+    return x * y + (a - b) * (c + x) - y;
+}}
+"""
+
+
+def generate_expression_source(lines: int = 100_000) -> str:
+    """TyC source of an expression-heavy generated program of about the given number of lines."""
+    return "".join(
+        _EXPRESSION_FUNCTION_SOURCE.format(index=index, callee=f"g{index - 1}" if index else "g0")
+        for index in range(max(1, lines // LINES_PER_FUNCTION))
+    )
+
+
+class _DictNode:
+    """Stand-in for a node class without __slots__."""
+
+
+def _dict_layout_classes() -> dict:
+    classes = {}
+    pending = [ASTNode]
+    while pending:
+        node_class = pending.pop()
+        classes[node_class] = type(node_class.__name__, (_DictNode,), {})
+        pending.extend(node_class.__subclasses__())
+    return classes
+
+
+def _copy_tree(value, make_node, fields):
+    # Copies the node objects and child lists; names and literal values are shared
+    if isinstance(value, list):
+        return [_copy_tree(item, make_node, fields) for item in value]
+    if not isinstance(value, ASTNode):
+        return value
+    node_class = type(value)
+    copy = make_node(node_class)
+    for field in fields[node_class]:
+        setattr(copy, field, _copy_tree(getattr(value, field), make_node, fields))
+    return copy
+
+
+def count_nodes(value) -> int:
+    """Number of AST nodes reachable from value."""
+    if isinstance(value, list):
+        return sum(count_nodes(item) for item in value)
+    if not isinstance(value, ASTNode):
+        return 0
+    return 1 + sum(count_nodes(getattr(value, field)) for field in node_fields(type(value)))
+
+
+def _traced_bytes(build) -> int:
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        tree = build()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    del tree
+    return size
+
+
+def measure_node_memory(lines: int = 100_000) -> dict:
+    """Bytes per node of a generated program's AST with and without __slots__.
+
+    Both figures are for the node objects and their child lists; strings and
+    literal values are shared between the two trees and are not counted.
+    """
+    program = generate_program(lines)
+    nodes = count_nodes(program)
+    dict_classes = _dict_layout_classes()
+    fields = {node_class: node_fields(node_class) for node_class in dict_classes}
+    layouts = {
+        "dict": lambda node_class: dict_classes[node_class](),
+        "slots": lambda node_class: object.__new__(node_class),
+    }
+    result = {"lines": lines, "nodes": nodes}
+    for name, make_node in layouts.items():
+        size = _traced_bytes(lambda: _copy_tree(program, make_node, fields))
+        result[name] = size / nodes
+    return result
+
+
+if __name__ == "__main__":
+    result = measure_node_memory()
+    print(f"generated program: {result['lines']} lines, {result['nodes']} nodes")
+    print(f"bytes per node with __dict__:  {result['dict']:.1f}")
+    print(f"bytes per node with __slots__: {result['slots']:.1f}")
+    print(f"saving:                        {1 - result['slots'] / result['dict']:.0%}")
@@ -2,10 +2,20 @@
 AST Node classes for TyC programming language.
 This module defines all the AST node types used to represent
 the abstract syntax tree for TyC programs.
+
+Every node class lists the fields it adds in __slots__ (ASTNode holds line
+and column), so nodes carry no per-instance __dict__. A subclass must
+declare __slots__ as well, even if empty, or it gets a __dict__ back.
+
+Names (declared names, struct names, identifiers, callees and members) are
+interned with sys.intern, so later passes can compare them by identity.
+Primitive type nodes are module constants, and a compilation's struct types
+come from its TypeTable (see Type).
 """
 
-from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Union, TYPE_CHECKING
+from abc import ABC, ABCMeta, abstractmethod
+from sys import intern
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .visitor import ASTVisitor
@@ -14,6 +24,8 @@ if TYPE_CHECKING:
 class ASTNode(ABC):
     """Base class for all AST nodes."""
 
+    __slots__ = ("line", "column")
+
     def __init__(self):
         self.line = None
         self.column = None
@@ -24,8 +36,10 @@ class ASTNode(ABC):
         pass
 
     def __str__(self):
-        """Default string representation."""
-        return f"{self.__class__.__name__}()"
+        """Textual form of the node, written by src.utils.ast_writer."""
+        from src.utils.ast_writer import ast_to_string
+
+        return ast_to_string(self)
 
 
 # ============================================================================
@@ -36,6 +50,8 @@ class ASTNode(ABC):
 class Program(ASTNode):
     """Root node representing the entire TyC program."""
 
+    __slots__ = ("decls",)
+
     def __init__(self, decls: List["Decl"]):
         super().__init__()
         self.decls = decls
@@ -43,50 +59,46 @@ class Program(ASTNode):
     def accept(self, visitor, o=None):
         return visitor.visit_program(self, o)
 
-    def __str__(self):
-        decls_str = ", ".join(str(d) for d in self.decls) if self.decls else ""
-        return f"Program([{decls_str}])"
-
 
 class Decl(ASTNode):
     """Base class for declarations (struct or function)."""
-    pass
+
+    __slots__ = ()
 
 
 class StructDecl(Decl):
     """Struct declaration node."""
 
+    __slots__ = ("name", "members")
+
     def __init__(self, name: str, members: List["MemberDecl"]):
         super().__init__()
-        self.name = name
+        self.name = intern(name)
         self.members = members
 
     def accept(self, visitor, o=None):
         return visitor.visit_struct_decl(self, o)
 
-    def __str__(self):
-        members_str = ", ".join(str(m) for m in self.members) if self.members else ""
-        return f"StructDecl({self.name}, [{members_str}])"
-
 
 class MemberDecl(ASTNode):
     """Struct member declaration node."""
 
+    __slots__ = ("member_type", "name")
+
     def __init__(self, member_type: "Type", name: str):
         super().__init__()
         self.member_type = member_type
-        self.name = name
+        self.name = intern(name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_member_decl(self, o)
 
-    def __str__(self):
-        return f"MemberDecl({self.member_type}, {self.name})"
-
 
 class FuncDecl(Decl):
     """Function declaration node."""
 
+    __slots__ = ("return_type", "name", "params", "body")
+
     def __init__(
         self,
         return_type: Optional["Type"],
@@ -96,33 +108,27 @@ class FuncDecl(Decl):
     ):
         super().__init__()
         self.return_type = return_type
-        self.name = name
+        self.name = intern(name)
         self.params = params
         self.body = body
 
     def accept(self, visitor, o=None):
         return visitor.visit_func_decl(self, o)
 
-    def __str__(self):
-        return_type_str = str(self.return_type) if self.return_type else "auto"
-        params_str = ", ".join(str(p) for p in self.params) if self.params else ""
-        return f"FuncDecl({return_type_str}, {self.name}, [{params_str}], {self.body})"
-
 
 class Param(ASTNode):
     """Function parameter node."""
 
+    __slots__ = ("param_type", "name")
+
     def __init__(self, param_type: "Type", name: str):
         super().__init__()
         self.param_type = param_type
-        self.name = name
+        self.name = intern(name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_param(self, o)
 
-    def __str__(self):
-        return f"Param({self.param_type}, {self.name})"
-
 
 # ============================================================================
 # Type System
@@ -130,74 +136,134 @@ class Param(ASTNode):
 
 
 class Type(ASTNode):
-    """Base class for type annotations."""
-    pass
+    """Base class for type annotations.
+
+    IntType(), FloatType(), StringType() and VoidType() always return the
+    module constants INT_TYPE, FLOAT_TYPE, STRING_TYPE and VOID_TYPE, which
+    compare by identity. StructType(name) is a new node each time and compares
+    equal to every StructType of the same name; within one compilation a
+    TypeTable hands out one StructType per name, so a program's struct types
+    are shared without keeping any name alive once the program is gone.
+    Type nodes have no line/column of their own; setting a position on a
+    primitive type constant raises AttributeError, as it would show in every
+    tree that uses the constant.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Rebuilt through the constructor, so a primitive type stays its constant
+        return type(self), tuple(getattr(self, field) for field in type(self).__slots__)
+
 
+class _PrimitiveTypeMeta(ABCMeta):
+    """Calling a primitive type class returns its one instance, without running __init__ again."""
 
-class IntType(Type):
+    def __call__(cls):
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = cls._instance = super().__call__()
+        return instance
+
+
+class _PrimitiveType(Type, metaclass=_PrimitiveTypeMeta):
+    """Base of the primitive type nodes, shared constants whose position stays None."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any):
+        if value is not None:
+            raise AttributeError(f"{type(self).__name__}() is shared by every tree and has no {name}")
+        super().__setattr__(name, value)
+
+
+class IntType(_PrimitiveType):
     """Integer type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_int_type(self, o)
 
-    def __str__(self):
-        return "IntType()"
 
-
-class FloatType(Type):
+class FloatType(_PrimitiveType):
     """Float type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_float_type(self, o)
 
-    def __str__(self):
-        return "FloatType()"
-
 
-class StringType(Type):
+class StringType(_PrimitiveType):
     """String type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_string_type(self, o)
 
-    def __str__(self):
-        return "StringType()"
-
 
-class VoidType(Type):
+class VoidType(_PrimitiveType):
     """Void type node."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_void_type(self, o)
 
-    def __str__(self):
-        return "VoidType()"
-
 
 class StructType(Type):
     """Struct type node."""
 
+    __slots__ = ("struct_name",)
+
     def __init__(self, struct_name: str):
         super().__init__()
-        self.struct_name = struct_name
+        self.struct_name = intern(struct_name)
+
+    def __eq__(self, other):
+        return type(other) is StructType and other.struct_name is self.struct_name
+
+    def __hash__(self):
+        return hash(self.struct_name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_struct_type(self, o)
 
-    def __str__(self):
-        return f"StructType({self.struct_name})"
+
+INT_TYPE = IntType()
+FLOAT_TYPE = FloatType()
+STRING_TYPE = StringType()
+VOID_TYPE = VoidType()
+
+
+class TypeTable:
+    """The type nodes of one compilation: a builder asks it for each type it builds."""
+
+    __slots__ = ("_structs",)
+
+    def __init__(self):
+        self._structs: Dict[str, StructType] = {}
+
+    def struct_type(self, name: str) -> StructType:
+        """The compilation's StructType for name."""
+        node = self._structs.get(name)
+        if node is None:
+            node = self._structs[name] = StructType(name)
+        return node
 
 
 # ============================================================================
@@ -207,12 +273,15 @@ class StructType(Type):
 
 class Stmt(ASTNode):
     """Base class for all statement nodes."""
-    pass
+
+    __slots__ = ()
 
 
 class BlockStmt(Stmt):
     """Block statement containing statements."""
 
+    __slots__ = ("statements",)
+
     def __init__(self, statements: List[Stmt]):
         super().__init__()
         self.statements = statements
@@ -220,16 +289,14 @@ class BlockStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_block_stmt(self, o)
 
-    def __str__(self):
-        stmts_str = ", ".join(str(s) for s in self.statements) if self.statements else ""
-        return f"BlockStmt([{stmts_str}])"
-
 
 class VarDecl(Stmt):
     """Variable declaration statement.
     If var_type is None, it means 'auto' (type inference).
     """
 
+    __slots__ = ("var_type", "name", "init_value")
+
     def __init__(
         self,
         var_type: Optional["Type"],
@@ -238,21 +305,18 @@ class VarDecl(Stmt):
     ):
         super().__init__()
         self.var_type = var_type  # None means 'auto'
-        self.name = name
+        self.name = intern(name)
         self.init_value = init_value
 
     def accept(self, visitor, o=None):
         return visitor.visit_var_decl(self, o)
 
-    def __str__(self):
-        type_str = "auto" if self.var_type is None else str(self.var_type)
-        init_str = f" = {self.init_value}" if self.init_value else ""
-        return f"VarDecl({type_str}, {self.name}{init_str})"
-
 
 class IfStmt(Stmt):
     """If statement."""
 
+    __slots__ = ("condition", "then_stmt", "else_stmt")
+
     def __init__(
         self, condition: "Expr", then_stmt: Stmt, else_stmt: Optional[Stmt] = None
     ):
@@ -264,14 +328,12 @@ class IfStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_if_stmt(self, o)
 
-    def __str__(self):
-        else_str = f", else {self.else_stmt}" if self.else_stmt else ""
-        return f"IfStmt(if {self.condition} then {self.then_stmt}{else_str})"
-
 
 class WhileStmt(Stmt):
     """While statement."""
 
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: "Expr", body: Stmt):
         super().__init__()
         self.condition = condition
@@ -280,13 +342,12 @@ class WhileStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_while_stmt(self, o)
 
-    def __str__(self):
-        return f"WhileStmt(while {self.condition} do {self.body})"
-
 
 class ForStmt(Stmt):
     """For statement."""
 
+    __slots__ = ("init", "condition", "update", "body")
+
     def __init__(
         self,
         init: Optional[Union["VarDecl", "ExprStmt"]],
@@ -303,16 +364,12 @@ class ForStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_for_stmt(self, o)
 
-    def __str__(self):
-        init_str = str(self.init) if self.init else "None"
-        cond_str = str(self.condition) if self.condition else "None"
-        update_str = str(self.update) if self.update else "None"
-        return f"ForStmt(for {init_str}; {cond_str}; {update_str} do {self.body})"
-
 
 class SwitchStmt(Stmt):
     """Switch statement."""
 
+    __slots__ = ("expr", "cases", "default_case")
+
     def __init__(
         self,
         expr: "Expr",
@@ -327,15 +384,12 @@ class SwitchStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_switch_stmt(self, o)
 
-    def __str__(self):
-        cases_str = ", ".join(str(c) for c in self.cases) if self.cases else ""
-        default_str = f", default {self.default_case}" if self.default_case else ""
-        return f"SwitchStmt(switch {self.expr} cases [{cases_str}]{default_str})"
-
 
 class CaseStmt(ASTNode):
     """Case statement in switch."""
 
+    __slots__ = ("expr", "statements")
+
     def __init__(self, expr: "Expr", statements: List[Stmt]):
         super().__init__()
         self.expr = expr
@@ -344,14 +398,12 @@ class CaseStmt(ASTNode):
     def accept(self, visitor, o=None):
         return visitor.visit_case_stmt(self, o)
 
-    def __str__(self):
-        stmts_str = ", ".join(str(s) for s in self.statements) if self.statements else ""
-        return f"CaseStmt(case {self.expr}: [{stmts_str}])"
-
 
 class DefaultStmt(ASTNode):
     """Default statement in switch."""
 
+    __slots__ = ("statements",)
+
     def __init__(self, statements: List[Stmt]):
         super().__init__()
         self.statements = statements
@@ -359,40 +411,36 @@ class DefaultStmt(ASTNode):
     def accept(self, visitor, o=None):
         return visitor.visit_default_stmt(self, o)
 
-    def __str__(self):
-        stmts_str = ", ".join(str(s) for s in self.statements) if self.statements else ""
-        return f"DefaultStmt(default: [{stmts_str}])"
-
 
 class BreakStmt(Stmt):
     """Break statement."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_break_stmt(self, o)
 
-    def __str__(self):
-        return "BreakStmt()"
-
 
 class ContinueStmt(Stmt):
     """Continue statement."""
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
     def accept(self, visitor, o=None):
         return visitor.visit_continue_stmt(self, o)
 
-    def __str__(self):
-        return "ContinueStmt()"
-
 
 class ReturnStmt(Stmt):
     """Return statement."""
 
+    __slots__ = ("expr",)
+
     def __init__(self, expr: Optional["Expr"] = None):
         super().__init__()
         self.expr = expr
@@ -400,14 +448,12 @@ class ReturnStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_return_stmt(self, o)
 
-    def __str__(self):
-        expr_str = f" {self.expr}" if self.expr else ""
-        return f"ReturnStmt(return{expr_str})"
-
 
 class ExprStmt(Stmt):
     """Expression statement."""
 
+    __slots__ = ("expr",)
+
     def __init__(self, expr: "Expr"):
         super().__init__()
         self.expr = expr
@@ -415,9 +461,6 @@ class ExprStmt(Stmt):
     def accept(self, visitor, o=None):
         return visitor.visit_expr_stmt(self, o)
 
-    def __str__(self):
-        return f"ExprStmt({self.expr})"
-
 
 # ============================================================================
 # Expressions
@@ -426,12 +469,15 @@ class ExprStmt(Stmt):
 
 class Expr(ASTNode):
     """Base class for all expression nodes."""
-    pass
+
+    __slots__ = ()
 
 
 class BinaryOp(Expr):
     """Binary operation expression."""
 
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: str, right: Expr):
         super().__init__()
         self.left = left
@@ -441,13 +487,12 @@ class BinaryOp(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_binary_op(self, o)
 
-    def __str__(self):
-        return f"BinaryOp({self.left}, {self.operator}, {self.right})"
-
 
 class PrefixOp(Expr):
     """Prefix unary operation expression (++x, --x, +x, -x, !x)."""
 
+    __slots__ = ("operator", "operand")
+
     def __init__(self, operator: str, operand: Expr):
         super().__init__()
         self.operator = operator  # '++', '--', '+', '-', '!'
@@ -456,13 +501,12 @@ class PrefixOp(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_prefix_op(self, o)
 
-    def __str__(self):
-        return f"PrefixOp({self.operator}{self.operand})"
-
 
 class PostfixOp(Expr):
     """Postfix unary operation expression (x++, x--)."""
 
+    __slots__ = ("operator", "operand")
+
     def __init__(self, operator: str, operand: Expr):
         super().__init__()
         self.operator = operator  # '++', '--'
@@ -471,15 +515,14 @@ class PostfixOp(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_postfix_op(self, o)
 
-    def __str__(self):
-        return f"PostfixOp({self.operand}{self.operator})"
-
 
 class AssignExpr(Expr):
     """Assignment expression (can be used in expressions like (a = 5) + 7).
     lhs can be Identifier or MemberAccess.
     """
 
+    __slots__ = ("lhs", "rhs")
+
     def __init__(self, lhs: "Expr", rhs: "Expr"):
         super().__init__()
         self.lhs = lhs  # Identifier or MemberAccess
@@ -488,9 +531,6 @@ class AssignExpr(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_assign_expr(self, o)
 
-    def __str__(self):
-        return f"AssignExpr({self.lhs} = {self.rhs})"
-
 
 class MemberAccess(Expr):
     """Member access expression (struct member access).
@@ -498,51 +538,49 @@ class MemberAccess(Expr):
     Can be nested: MemberAccess(MemberAccess(obj, "member1"), "member2")
     """
 
+    __slots__ = ("obj", "member")
+
     def __init__(self, obj: Expr, member: str):
         super().__init__()
         self.obj = obj
-        self.member = member
+        self.member = intern(member)
 
     def accept(self, visitor, o=None):
         return visitor.visit_member_access(self, o)
 
-    def __str__(self):
-        return f"MemberAccess({self.obj}.{self.member})"
-
 
 class FuncCall(Expr):
     """Function call expression."""
 
+    __slots__ = ("name", "args")
+
     def __init__(self, name: str, args: List[Expr]):
         super().__init__()
-        self.name = name
+        self.name = intern(name)
         self.args = args
 
     def accept(self, visitor, o=None):
         return visitor.visit_func_call(self, o)
 
-    def __str__(self):
-        args_str = ", ".join(str(arg) for arg in self.args) if self.args else ""
-        return f"FuncCall({self.name}, [{args_str}])"
-
 
 class Identifier(Expr):
     """Identifier expression."""
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         super().__init__()
-        self.name = name
+        self.name = intern(name)
 
     def accept(self, visitor, o=None):
         return visitor.visit_identifier(self, o)
 
-    def __str__(self):
-        return f"Identifier({self.name})"
-
 
 class StructLiteral(Expr):
     """Struct literal expression (initialization with {})."""
 
+    __slots__ = ("values",)
+
     def __init__(self, values: List[Expr]):
         super().__init__()
         self.values = values
@@ -550,10 +588,6 @@ class StructLiteral(Expr):
     def accept(self, visitor, o=None):
         return visitor.visit_struct_literal(self, o)
 
-    def __str__(self):
-        values_str = ", ".join(str(v) for v in self.values) if self.values else ""
-        return f"StructLiteral({{{values_str}}})"
-
 
 # ============================================================================
 # Literal Expressions
@@ -563,6 +597,8 @@ class StructLiteral(Expr):
 class Literal(Expr):
     """Base class for literal expressions."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: Any):
         super().__init__()
         self.value = value
@@ -571,37 +607,34 @@ class Literal(Expr):
 class IntLiteral(Literal):
     """Integer literal expression."""
 
+    __slots__ = ()
+
     def __init__(self, value: int):
         super().__init__(value)
 
     def accept(self, visitor, o=None):
         return visitor.visit_int_literal(self, o)
 
-    def __str__(self):
-        return f"IntLiteral({self.value})"
-
 
 class FloatLiteral(Literal):
     """Float literal expression."""
 
+    __slots__ = ()
+
     def __init__(self, value: float):
         super().__init__(value)
 
     def accept(self, visitor, o=None):
         return visitor.visit_float_literal(self, o)
 
-    def __str__(self):
-        return f"FloatLiteral({self.value})"
-
 
 class StringLiteral(Literal):
     """String literal expression."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         super().__init__(value)
 
     def accept(self, visitor, o=None):
         return visitor.visit_string_literal(self, o)
-
-    def __str__(self):
-        return f"StringLiteral({self.value!r})"
@@ -0,0 +1,250 @@
+"""
+Parser profiling for TyC programming language.
+This module parses a program with a profiling prediction simulator and
+reports, per grammar decision and per rule, how much work TyCParser spent
+on it, to find the decisions of TyC.g4 that need long or full-context
+lookahead.
+
+The Python ANTLR runtime has no ProfilingATNSimulator, so
+ProfilingATNSimulator here follows the Java one: it wraps adaptivePredict
+and records, per decision, invocations, prediction time, SLL lookahead
+depth, fallbacks to full-context (LL) prediction with their lookahead
+depth, ambiguities, context sensitivities and DFA misses (ATN
+transitions). Rule invocations and times come from a parse listener.
+
+The program is parsed once in LL mode (SLL prediction with a full-context
+fallback per conflicting decision), the mode that exposes both; the
+parser's shared DFA is warm when something was parsed before in the same
+process.
+"""
+
+import time
+from typing import List
+
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.tree.Tree import ParseTreeListener
+
+from src.utils.parsing import create_parser, parse_ll
+
+
+class DecisionProfile:
+    """Prediction statistics of one grammar decision."""
+
+    __slots__ = (
+        "decision",
+        "rule",
+        "state",
+        "invocations",
+        "time_ns",
+        "sll_lookahead",
+        "sll_max_lookahead",
+        "ll_fallbacks",
+        "ll_lookahead",
+        "ll_max_lookahead",
+        "ambiguities",
+        "context_sensitivities",
+        "atn_transitions",
+    )
+
+    def __init__(self, decision: int, rule: str, state: int):
+        self.decision = decision
+        self.rule = rule
+        self.state = state  # ATN state number of the decision
+        self.invocations = 0
+        self.time_ns = 0
+        self.sll_lookahead = 0  # total tokens looked at by SLL prediction
+        self.sll_max_lookahead = 0
+        self.ll_fallbacks = 0
+        self.ll_lookahead = 0  # total tokens looked at by full-context prediction
+        self.ll_max_lookahead = 0
+        self.ambiguities = 0
+        self.context_sensitivities = 0
+        self.atn_transitions = 0  # DFA misses, each a step of ATN simulation
+
+    def __repr__(self):
+        return f"DecisionProfile({self.decision}, {self.rule!r}, invocations={self.invocations})"
+
+
+class RuleProfile:
+    """Invocations and time of one grammar rule."""
+
+    __slots__ = ("rule", "invocations", "time_ns", "self_time_ns", "prediction_ns")
+
+    def __init__(self, rule: str):
+        self.rule = rule
+        self.invocations = 0
+        self.time_ns = 0  # including nested rules
+        self.self_time_ns = 0
+        self.prediction_ns = 0  # spent in this rule's decisions
+
+    def __repr__(self):
+        return f"RuleProfile({self.rule!r}, invocations={self.invocations})"
+
+
+class ProfilingATNSimulator(ParserATNSimulator):
+    """ParserATNSimulator that records a DecisionProfile per decision."""
+
+    def __init__(self, parser, atn, decisionToDFA, sharedContextCache):
+        super().__init__(parser, atn, decisionToDFA, sharedContextCache)
+        self.decisions = [
+            DecisionProfile(decision, parser.ruleNames[state.ruleIndex], state.stateNumber)
+            for decision, state in enumerate(atn.decisionToState)
+        ]
+        self._current = None
+        self._sll_stop = None
+        self._ll_stop = None
+
+    def adaptivePredict(self, input, decision, outerContext):
+        profile = self._current = self.decisions[decision]
+        self._sll_stop = self._ll_stop = None
+        start_index = input.index
+        start = time.perf_counter_ns()
+        try:
+            return super().adaptivePredict(input, decision, outerContext)
+        finally:
+            profile.time_ns += time.perf_counter_ns() - start
+            profile.invocations += 1
+            if self._sll_stop is not None:
+                depth = self._sll_stop - start_index + 1
+                profile.sll_lookahead += depth
+                profile.sll_max_lookahead = max(profile.sll_max_lookahead, depth)
+            if self._ll_stop is not None:
+                depth = self._ll_stop - start_index + 1
+                profile.ll_lookahead += depth
+                profile.ll_max_lookahead = max(profile.ll_max_lookahead, depth)
+
+    def execATN(self, dfa, s0, input, startIndex, outerContext):
+        try:
+            return super().execATN(dfa, s0, input, startIndex, outerContext)
+        finally:
+            # Set on a fallback to full context, where SLL prediction stopped
+            if self._sll_stop is None:
+                self._sll_stop = input.index
+
+    def execATNWithFullContext(self, dfa, D, s0, input, startIndex, outerContext):
+        self._current.ll_fallbacks += 1
+        try:
+            return super().execATNWithFullContext(dfa, D, s0, input, startIndex, outerContext)
+        finally:
+            self._ll_stop = input.index
+
+    def computeTargetState(self, dfa, previousD, t):
+        self._current.atn_transitions += 1
+        return super().computeTargetState(dfa, previousD, t)
+
+    def reportAttemptingFullContext(self, dfa, conflictingAlts, configs, startIndex, stopIndex):
+        self._sll_stop = stopIndex
+        super().reportAttemptingFullContext(dfa, conflictingAlts, configs, startIndex, stopIndex)
+
+    def reportContextSensitivity(self, dfa, prediction, configs, startIndex, stopIndex):
+        self._current.context_sensitivities += 1
+        super().reportContextSensitivity(dfa, prediction, configs, startIndex, stopIndex)
+
+    def reportAmbiguity(self, dfa, D, startIndex, stopIndex, exact, ambigAlts, configs):
+        self._current.ambiguities += 1
+        super().reportAmbiguity(dfa, D, startIndex, stopIndex, exact, ambigAlts, configs)
+
+
+class RuleTimer(ParseTreeListener):
+    """Parse listener that records a RuleProfile per rule."""
+
+    def __init__(self, rule_names: list):
+        self.rules = [RuleProfile(name) for name in rule_names]
+        self._stack = []  # [rule index, start time, time of nested rules]
+
+    def enterEveryRule(self, ctx):
+        self._stack.append([ctx.getRuleIndex(), time.perf_counter_ns(), 0])
+
+    def exitEveryRule(self, ctx):
+        rule_index, start, nested = self._stack.pop()
+        elapsed = time.perf_counter_ns() - start
+        profile = self.rules[rule_index]
+        profile.invocations += 1
+        profile.time_ns += elapsed
+        profile.self_time_ns += elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+
+class ParserProfile:
+    """Decision and rule profiles of one parse, most expensive first."""
+
+    def __init__(self, decisions: List[DecisionProfile], rules: List[RuleProfile], tokens: int, seconds: float):
+        self.decisions = sorted(
+            (decision for decision in decisions if decision.invocations),
+            key=lambda decision: decision.time_ns,
+            reverse=True,
+        )
+        self.rules = sorted(
+            (rule for rule in rules if rule.invocations),
+            key=lambda rule: rule.self_time_ns,
+            reverse=True,
+        )
+        self.tokens = tokens
+        self.seconds = seconds
+
+    def format(self, top: int = None) -> str:
+        """Both tables as text, each cut to its top rows when top is given."""
+        lines = [f"{self.tokens} tokens parsed in {self.seconds * 1000:.1f} ms (LL mode, profiled)", ""]
+        lines.append("Decisions by prediction time:")
+        lines.append(
+            f"{'decision':>8} {'rule':<20} {'state':>5} {'calls':>7} {'ms':>8} "
+            f"{'SLL avg':>7} {'SLL max':>7} {'LL fb':>6} {'LL avg':>7} {'LL max':>6} "
+            f"{'ambig':>5} {'ctx':>4} {'ATN':>6}"
+        )
+        for d in self.decisions[:top]:
+            ll_average = d.ll_lookahead / d.ll_fallbacks if d.ll_fallbacks else 0
+            lines.append(
+                f"{d.decision:>8} {d.rule:<20} {d.state:>5} {d.invocations:>7} {d.time_ns / 1e6:>8.2f} "
+                f"{d.sll_lookahead / d.invocations:>7.2f} {d.sll_max_lookahead:>7} {d.ll_fallbacks:>6} "
+                f"{ll_average:>7.2f} {d.ll_max_lookahead:>6} "
+                f"{d.ambiguities:>5} {d.context_sensitivities:>4} {d.atn_transitions:>6}"
+            )
+        lines.append("")
+        lines.append("Rules by self time:")
+        lines.append(f"{'rule':<20} {'calls':>7} {'self ms':>8} {'total ms':>9} {'predict ms':>10}")
+        for r in self.rules[:top]:
+            lines.append(
+                f"{r.rule:<20} {r.invocations:>7} {r.self_time_ns / 1e6:>8.2f} "
+                f"{r.time_ns / 1e6:>9.2f} {r.prediction_ns / 1e6:>10.2f}"
+            )
+        return "\n".join(lines)
+
+
+def profile_parse(source: str, backend: str = None) -> ParserProfile:
+    """Profile of parsing source with TyCParser; raises on the first syntax error."""
+    parser = create_parser(source, backend)
+    interp = parser._interp
+    profiler = ProfilingATNSimulator(parser, parser.atn, interp.decisionToDFA, interp.sharedContextCache)
+    parser._interp = profiler
+    timer = RuleTimer(parser.ruleNames)
+    parser.addParseListener(timer)
+    start = time.perf_counter()
+    parse_ll(parser)
+    seconds = time.perf_counter() - start
+    for decision in profiler.decisions:
+        timer.rules[parser.atn.decisionToState[decision.decision].ruleIndex].prediction_ns += decision.time_ns
+    tokens = len(parser.getTokenStream().tokens)
+    return ParserProfile(profiler.decisions, timer.rules, tokens, seconds)
+
+
+def profile_file(file_path: str, backend: str = None) -> ParserProfile:
+    """profile_parse for a TyC source file."""
+    with open(file_path, encoding="utf-8") as f:
+        return profile_parse(f.read(), backend)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    arguments = argparse.ArgumentParser(description="Profile TyCParser's decisions and rules on a TyC file")
+    arguments.add_argument("file")
+    arguments.add_argument("--top", type=int, default=None, help="rows per table")
+    args = arguments.parse_args()
+    try:
+        profile = profile_file(args.file)
+    except Exception as e:
+        print(f"{args.file}: {e}")
+        sys.exit(1)
+    print(profile.format(args.top))
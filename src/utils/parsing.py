@@ -0,0 +1,166 @@
+"""
+Parsing entry point for TyC programming language.
+This module builds the lexer/parser pipeline and runs TyCParser either in
+plain LL mode or in the two-stage mode: a fast SLL pass with
+BailErrorStrategy, re-parsed with full LL prediction only when SLL fails.
+"""
+
+import os
+import sys
+import threading
+
+# The generated lexer imports lexererr from the build directory, which is not
+# on the path when a module is run with `python -m` or imported by a test
+_BUILD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "build")
+if _BUILD_DIR not in sys.path:
+    sys.path.insert(0, _BUILD_DIR)
+
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+from build.TyCLexer import TyCLexer
+from build.TyCParser import TyCParser
+from src.grammar.fast_lexer import TyCFastLexer
+from src.utils.error_listener import NewErrorListener
+from src.utils.dfa_cache import DEFAULT_CACHE_FILE, load_dfa_cache, save_dfa_cache
+
+
+# Lexer backends: "antlr" is the generated TyCLexer, "fast" the hand-written scanner.
+# The default can be switched with the TYC_LEXER environment variable for A/B runs.
+LEXER_BACKENDS = {"antlr": TyCLexer, "fast": TyCFastLexer}
+LEXER_BACKEND = os.environ.get("TYC_LEXER", "antlr")
+
+# Parse modes: "two-stage" tries SLL first and falls back to LL, "ll" always uses LL.
+PARSE_MODES = ("two-stage", "ll")
+PARSE_MODE = os.environ.get("TYC_PARSE_MODE", "two-stage")
+
+# Warmed lexer/parser DFA states saved by dfa_cache.save_dfa_cache, loaded at startup
+DFA_CACHE_FILE = os.environ.get("TYC_DFA_CACHE")
+if DFA_CACHE_FILE:
+    load_dfa_cache(DFA_CACHE_FILE)
+
+# Prediction path reported for each parse
+SLL = "SLL"
+LL = "LL"
+
+
+class ParseResult:
+    """Parse tree of a program together with the prediction path that produced it."""
+
+    def __init__(self, tree, prediction: str):
+        self.tree = tree
+        self.prediction = prediction  # SLL or LL
+
+
+def create_lexer(input_stream: InputStream, backend: str = None):
+    """Create a lexer over input_stream using the selected backend."""
+    backend = backend or LEXER_BACKEND
+    if backend not in LEXER_BACKENDS:
+        raise ValueError(f"Unknown lexer backend: {backend}")
+    return LEXER_BACKENDS[backend](input_stream)
+
+
+def create_parser(source: str, backend: str = None) -> TyCParser:
+    """Create a TyCParser over source reporting errors through NewErrorListener."""
+    lexer = create_lexer(InputStream(source), backend)
+    parser = TyCParser(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    parser.addErrorListener(NewErrorListener.INSTANCE)
+    return parser
+
+
+class FrontEndPool:
+    """Lexer and parser instances reused across compilations.
+
+    Each thread gets its own lexer, token stream and parser per lexer backend;
+    they are pointed at new input with setInputStream/setTokenSource/setTokenStream
+    instead of being constructed again for every source string.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _instances(self, backend: str = None):
+        backend = backend or LEXER_BACKEND
+        instances = self._local.__dict__.setdefault("instances", {})
+        if backend not in instances:
+            lexer = create_lexer(None, backend)
+            token_stream = CommonTokenStream(lexer)
+            parser = TyCParser(token_stream)
+            parser.removeErrorListeners()
+            parser.addErrorListener(NewErrorListener.INSTANCE)
+            instances[backend] = (lexer, token_stream, parser)
+        return instances[backend]
+
+    def lexer(self, source: str, backend: str = None):
+        """This thread's lexer for backend, reset to the start of source."""
+        lexer, _, _ = self._instances(backend)
+        lexer.inputStream = InputStream(source)
+        return lexer
+
+    def parser(self, source: str, backend: str = None) -> TyCParser:
+        """This thread's parser for backend, reset to the start of source."""
+        lexer, token_stream, parser = self._instances(backend)
+        lexer.inputStream = InputStream(source)
+        token_stream.setTokenSource(lexer)
+        parser.setTokenStream(token_stream)
+        return parser
+
+
+POOL = FrontEndPool()
+
+
+def parse_ll(parser: TyCParser) -> ParseResult:
+    """Parse a program with full LL prediction, raising on the first syntax error."""
+    parser._interp.predictionMode = PredictionMode.LL
+    parser._errHandler = DefaultErrorStrategy()
+    parser.removeErrorListeners()
+    parser.addErrorListener(NewErrorListener.INSTANCE)
+    return ParseResult(parser.program(), LL)
+
+
+def parse_two_stage(parser: TyCParser) -> ParseResult:
+    """Parse a program with SLL prediction, falling back to full LL when SLL fails.
+
+    The SLL stage bails out on the first error without reporting it. The parser
+    is then reset to the start of the (already buffered) token stream and run
+    again with parse_ll, so syntax errors are reported exactly as in LL mode.
+    """
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser._errHandler = BailErrorStrategy()
+    parser.removeErrorListeners()
+    try:
+        return ParseResult(parser.program(), SLL)
+    except ParseCancellationException:
+        parser.reset()
+        return parse_ll(parser)
+
+
+def parse_program(parser: TyCParser, mode: str = None) -> ParseResult:
+    """Parse a whole program with the given parse mode."""
+    mode = mode or PARSE_MODE
+    if mode == "two-stage":
+        return parse_two_stage(parser)
+    if mode == "ll":
+        return parse_ll(parser)
+    raise ValueError(f"Unknown parse mode: {mode}")
+
+
+def parse_source(source: str, mode: str = None, backend: str = None) -> ParseResult:
+    """Lex and parse source, returning the parse tree and the prediction path taken."""
+    return parse_program(create_parser(source, backend), mode)
+
+
+def parse_file(file_path: str, mode: str = None, backend: str = None) -> ParseResult:
+    """Parse a TyC source file; ParseResult.prediction tells which path was taken."""
+    with open(file_path, encoding="utf-8") as f:
+        return parse_source(f.read(), mode, backend)
+
+
+def warm_dfa_cache(file_paths: list, cache_file: str = DEFAULT_CACHE_FILE):
+    """Parse representative source files and save the warmed DFA states to cache_file."""
+    for file_path in file_paths:
+        parse_file(file_path)
+    save_dfa_cache(cache_file)
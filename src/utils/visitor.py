@@ -7,6 +7,8 @@ and processing AST nodes.
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any
 
+from . import nodes
+
 if TYPE_CHECKING:
     from .nodes import *
 
@@ -297,3 +299,204 @@ class BaseVisitor(ASTVisitor):
 
     def visit_string_literal(self, node: "StringLiteral", o: Any = None):
         pass
+
+
+# visit_* method handling each node class, used by TableVisitor
+VISIT_METHODS = {
+    nodes.Program: "visit_program",
+    nodes.StructDecl: "visit_struct_decl",
+    nodes.MemberDecl: "visit_member_decl",
+    nodes.FuncDecl: "visit_func_decl",
+    nodes.Param: "visit_param",
+    nodes.IntType: "visit_int_type",
+    nodes.FloatType: "visit_float_type",
+    nodes.StringType: "visit_string_type",
+    nodes.VoidType: "visit_void_type",
+    nodes.StructType: "visit_struct_type",
+    nodes.BlockStmt: "visit_block_stmt",
+    nodes.VarDecl: "visit_var_decl",
+    nodes.IfStmt: "visit_if_stmt",
+    nodes.WhileStmt: "visit_while_stmt",
+    nodes.ForStmt: "visit_for_stmt",
+    nodes.SwitchStmt: "visit_switch_stmt",
+    nodes.CaseStmt: "visit_case_stmt",
+    nodes.DefaultStmt: "visit_default_stmt",
+    nodes.BreakStmt: "visit_break_stmt",
+    nodes.ContinueStmt: "visit_continue_stmt",
+    nodes.ReturnStmt: "visit_return_stmt",
+    nodes.ExprStmt: "visit_expr_stmt",
+    nodes.BinaryOp: "visit_binary_op",
+    nodes.PrefixOp: "visit_prefix_op",
+    nodes.PostfixOp: "visit_postfix_op",
+    nodes.AssignExpr: "visit_assign_expr",
+    nodes.MemberAccess: "visit_member_access",
+    nodes.FuncCall: "visit_func_call",
+    nodes.Identifier: "visit_identifier",
+    nodes.StructLiteral: "visit_struct_literal",
+    nodes.IntLiteral: "visit_int_literal",
+    nodes.FloatLiteral: "visit_float_literal",
+    nodes.StringLiteral: "visit_string_literal",
+}
+
+
+def _accept(visitor, node: "ASTNode", o: Any = None):
+    return node.accept(visitor, o)
+
+
+def _node_classes(base: type = nodes.ASTNode):
+    for node_class in base.__subclasses__():
+        yield node_class
+        yield from _node_classes(node_class)
+
+
+def _add_node_classes(table: dict):
+    # Node classes without a visit_* function go through accept()
+    for node_class in _node_classes():
+        table.setdefault(node_class, _accept)
+
+
+class TableVisitor(BaseVisitor):
+    """BaseVisitor that dispatches through a table of visit functions.
+
+    visit() is a single dictionary lookup on type(node) instead of the
+    visit -> node.accept -> visit_xxx double dispatch. Each visitor class
+    builds its table once, when its first instance is created, from the
+    visit_* functions it defines or inherits then; every other node class
+    maps to a function calling accept().
+
+    The default traversals below dispatch children through the table
+    directly, not through visit(): a subclass that overrides visit() sees
+    the nodes it is called with, not their children, so override the
+    visit_* functions instead. Node classes defined after the table was
+    built are added when visit() first meets a node of one of them; until
+    then the traversals cannot dispatch their nodes.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        if "_dispatch_table" not in cls.__dict__:
+            table = {node_class: getattr(cls, name) for node_class, name in VISIT_METHODS.items()}
+            _add_node_classes(table)
+            cls._dispatch_table = table
+        return super().__new__(cls)
+
+    def visit(self, node: "ASTNode", o: Any = None):
+        """Visit a node with a single table lookup."""
+        try:
+            function = self._dispatch_table[type(node)]
+        except KeyError:
+            _add_node_classes(self._dispatch_table)
+            function = self._dispatch_table[type(node)]
+        return function(self, node, o)
+
+    def visit_program(self, node: "Program", o: Any = None):
+        table = self._dispatch_table
+        for decl in node.decls:
+            table[type(decl)](self, decl, o)
+
+    def visit_struct_decl(self, node: "StructDecl", o: Any = None):
+        table = self._dispatch_table
+        for member in node.members:
+            table[type(member)](self, member, o)
+
+    def visit_member_decl(self, node: "MemberDecl", o: Any = None):
+        self._dispatch_table[type(node.member_type)](self, node.member_type, o)
+
+    def visit_func_decl(self, node: "FuncDecl", o: Any = None):
+        table = self._dispatch_table
+        if node.return_type:
+            table[type(node.return_type)](self, node.return_type, o)
+        for param in node.params:
+            table[type(param)](self, param, o)
+        table[type(node.body)](self, node.body, o)
+
+    def visit_param(self, node: "Param", o: Any = None):
+        self._dispatch_table[type(node.param_type)](self, node.param_type, o)
+
+    def visit_block_stmt(self, node: "BlockStmt", o: Any = None):
+        table = self._dispatch_table
+        for stmt in node.statements:
+            table[type(stmt)](self, stmt, o)
+
+    def visit_var_decl(self, node: "VarDecl", o: Any = None):
+        table = self._dispatch_table
+        if node.var_type:
+            table[type(node.var_type)](self, node.var_type, o)
+        if node.init_value:
+            table[type(node.init_value)](self, node.init_value, o)
+
+    def visit_if_stmt(self, node: "IfStmt", o: Any = None):
+        table = self._dispatch_table
+        table[type(node.condition)](self, node.condition, o)
+        table[type(node.then_stmt)](self, node.then_stmt, o)
+        if node.else_stmt:
+            table[type(node.else_stmt)](self, node.else_stmt, o)
+
+    def visit_while_stmt(self, node: "WhileStmt", o: Any = None):
+        table = self._dispatch_table
+        table[type(node.condition)](self, node.condition, o)
+        table[type(node.body)](self, node.body, o)
+
+    def visit_for_stmt(self, node: "ForStmt", o: Any = None):
+        table = self._dispatch_table
+        if node.init:
+            table[type(node.init)](self, node.init, o)
+        if node.condition:
+            table[type(node.condition)](self, node.condition, o)
+        if node.update:
+            table[type(node.update)](self, node.update, o)
+        table[type(node.body)](self, node.body, o)
+
+    def visit_switch_stmt(self, node: "SwitchStmt", o: Any = None):
+        table = self._dispatch_table
+        table[type(node.expr)](self, node.expr, o)
+        for case in node.cases:
+            table[type(case)](self, case, o)
+        if node.default_case:
+            table[type(node.default_case)](self, node.default_case, o)
+
+    def visit_case_stmt(self, node: "CaseStmt", o: Any = None):
+        table = self._dispatch_table
+        table[type(node.expr)](self, node.expr, o)
+        for stmt in node.statements:
+            table[type(stmt)](self, stmt, o)
+
+    def visit_default_stmt(self, node: "DefaultStmt", o: Any = None):
+        table = self._dispatch_table
+        for stmt in node.statements:
+            table[type(stmt)](self, stmt, o)
+
+    def visit_return_stmt(self, node: "ReturnStmt", o: Any = None):
+        if node.expr:
+            self._dispatch_table[type(node.expr)](self, node.expr, o)
+
+    def visit_expr_stmt(self, node: "ExprStmt", o: Any = None):
+        self._dispatch_table[type(node.expr)](self, node.expr, o)
+
+    def visit_binary_op(self, node: "BinaryOp", o: Any = None):
+        table = self._dispatch_table
+        table[type(node.left)](self, node.left, o)
+        table[type(node.right)](self, node.right, o)
+
+    def visit_prefix_op(self, node: "PrefixOp", o: Any = None):
+        self._dispatch_table[type(node.operand)](self, node.operand, o)
+
+    def visit_postfix_op(self, node: "PostfixOp", o: Any = None):
+        self._dispatch_table[type(node.operand)](self, node.operand, o)
+
+    def visit_assign_expr(self, node: "AssignExpr", o: Any = None):
+        table = self._dispatch_table
+        table[type(node.lhs)](self, node.lhs, o)
+        table[type(node.rhs)](self, node.rhs, o)
+
+    def visit_member_access(self, node: "MemberAccess", o: Any = None):
+        self._dispatch_table[type(node.obj)](self, node.obj, o)
+
+    def visit_func_call(self, node: "FuncCall", o: Any = None):
+        table = self._dispatch_table
+        for arg in node.args:
+            table[type(arg)](self, arg, o)
+
+    def visit_struct_literal(self, node: "StructLiteral", o: Any = None):
+        table = self._dispatch_table
+        for value in node.values:
+            table[type(value)](self, value, o)
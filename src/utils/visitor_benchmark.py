@@ -0,0 +1,63 @@
+"""
+Visitor dispatch benchmark for TyC programming language.
+This module walks the AST of a generated TyC program with the same counting
+visitor built on BaseVisitor (visit -> node.accept -> visit_xxx) and on
+TableVisitor (one table lookup per node), and reports the time per node.
+"""
+
+import time
+
+from src.utils.node_memory import count_nodes, generate_program
+from src.utils.visitor import BaseVisitor, TableVisitor
+
+
+class _Counter:
+    """Counts identifiers and binary operations, visiting every node."""
+
+    def __init__(self):
+        self.identifiers = 0
+        self.binary_ops = 0
+
+    def visit_identifier(self, node, o=None):
+        self.identifiers += 1
+
+    def visit_binary_op(self, node, o=None):
+        self.binary_ops += 1
+        self.visit(node.left, o)
+        self.visit(node.right, o)
+
+
+class AcceptCounter(_Counter, BaseVisitor):
+    """Counting visitor using accept() double dispatch."""
+
+
+class TableCounter(_Counter, TableVisitor):
+    """Counting visitor using table dispatch."""
+
+
+VISITORS = {"accept": AcceptCounter, "table": TableCounter}
+
+
+def measure_dispatch(lines: int = 100_000, repeat: int = 5) -> dict:
+    """Best-of-repeat nanoseconds per node to walk a generated program with each visitor."""
+    program = generate_program(lines)
+    nodes = count_nodes(program)
+    result = {"lines": lines, "nodes": nodes}
+    for name, visitor_class in VISITORS.items():
+        best = None
+        for _ in range(repeat):
+            visitor = visitor_class()
+            start = time.perf_counter()
+            visitor.visit(program)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        result[name] = best * 1e9 / nodes
+    return result
+
+
+if __name__ == "__main__":
+    result = measure_dispatch()
+    print(f"generated program: {result['lines']} lines, {result['nodes']} nodes")
+    print(f"accept() dispatch: {result['accept']:.0f} ns per node")
+    print(f"table dispatch:    {result['table']:.0f} ns per node")
+    print(f"speed-up:          {result['accept'] / result['table']:.2f}x")
@@ -0,0 +1,270 @@
+"""
+AST walker for TyC programming language.
+This module traverses ASTs built from src/utils/nodes.py with generators and
+an explicit stack or queue, so walks are not limited by the recursion limit.
+Nodes are yielded in pre-order, post-order or level order, optionally with
+their parent and depth, and a descend predicate prunes subtrees.
+"""
+
+from collections import deque
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+
+
+PRE_ORDER = "pre"
+POST_ORDER = "post"
+LEVEL_ORDER = "level"
+
+# Fields of each node class holding a child node or a list of child nodes, in
+# source order (the order BaseVisitor visits them in). A field may be None.
+CHILD_FIELDS = {
+    Program: ("decls",),
+    StructDecl: ("members",),
+    MemberDecl: ("member_type",),
+    FuncDecl: ("return_type", "params", "body"),
+    Param: ("param_type",),
+    IntType: (),
+    FloatType: (),
+    StringType: (),
+    VoidType: (),
+    StructType: (),
+    BlockStmt: ("statements",),
+    VarDecl: ("var_type", "init_value"),
+    IfStmt: ("condition", "then_stmt", "else_stmt"),
+    WhileStmt: ("condition", "body"),
+    ForStmt: ("init", "condition", "update", "body"),
+    SwitchStmt: ("expr", "cases", "default_case"),
+    CaseStmt: ("expr", "statements"),
+    DefaultStmt: ("statements",),
+    BreakStmt: (),
+    ContinueStmt: (),
+    ReturnStmt: ("expr",),
+    ExprStmt: ("expr",),
+    BinaryOp: ("left", "right"),
+    PrefixOp: ("operand",),
+    PostfixOp: ("operand",),
+    AssignExpr: ("lhs", "rhs"),
+    MemberAccess: ("obj",),
+    FuncCall: ("args",),
+    Identifier: (),
+    StructLiteral: ("values",),
+    IntLiteral: (),
+    FloatLiteral: (),
+    StringLiteral: (),
+}
+
+
+def child_fields(node_class: type) -> tuple:
+    """Child fields of node_class, inherited from the nearest known base class."""
+    fields = CHILD_FIELDS.get(node_class)
+    if fields is None:
+        base = next((klass for klass in node_class.__mro__ if klass in CHILD_FIELDS), None)
+        fields = CHILD_FIELDS[node_class] = CHILD_FIELDS[base] if base else ()
+    return fields
+
+
+def children(node: ASTNode) -> list:
+    """Child nodes of node in source order, skipping missing ones."""
+    fields = CHILD_FIELDS.get(type(node))
+    if fields is None:
+        fields = child_fields(type(node))
+    result = []
+    for field in fields:
+        value = getattr(node, field)
+        if value is None:
+            continue
+        if type(value) is list:
+            result.extend(value)
+        else:
+            result.append(value)
+    return result
+
+
+# CHILD_FIELDS reversed, for pushing children onto a stack
+_REVERSED_FIELDS = {}
+
+
+def _reversed_fields(node_class: type) -> tuple:
+    fields = _REVERSED_FIELDS.get(node_class)
+    if fields is None:
+        fields = _REVERSED_FIELDS[node_class] = tuple(reversed(child_fields(node_class)))
+    return fields
+
+
+def walk(
+    root: ASTNode,
+    order: str = PRE_ORDER,
+    descend: Optional[Callable[[ASTNode], bool]] = None,
+    context: bool = False,
+) -> Iterator[Any]:
+    """Yield every node under root (root included) in the given order.
+
+    With context=True each item is a (node, parent, depth) tuple, the root
+    having parent None and depth 0. When descend is given, the children of
+    a node for which it returns False are not visited (the node itself is).
+    """
+    if order == PRE_ORDER:
+        if not context:
+            return _pre_order_nodes(root, descend)
+        return _pre_order(root, descend)
+    if order == POST_ORDER:
+        steps = _post_order(root, descend)
+    elif order == LEVEL_ORDER:
+        steps = _level_order(root, descend)
+    else:
+        raise ValueError(f"Unknown walk order: {order}")
+    if context:
+        return steps
+    return (node for node, _, _ in steps)
+
+
+def _pre_order_nodes(root, descend) -> Iterator[ASTNode]:
+    # The common case: plain nodes, children pushed straight onto the stack
+    reversed_fields = _REVERSED_FIELDS
+    stack = [root]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        yield node
+        if descend is not None and not descend(node):
+            continue
+        fields = reversed_fields.get(type(node))
+        if fields is None:
+            fields = _reversed_fields(type(node))
+        for field in fields:
+            value = getattr(node, field)
+            if value is None:
+                continue
+            if type(value) is list:
+                stack.extend(value[::-1])
+            else:
+                push(value)
+
+
+def _pre_order(root, descend) -> Iterator[Tuple[ASTNode, Optional[ASTNode], int]]:
+    stack = [(root, None, 0)]
+    while stack:
+        step = stack.pop()
+        yield step
+        node, _, depth = step
+        if descend is None or descend(node):
+            depth += 1
+            stack.extend([(child, node, depth) for child in reversed(children(node))])
+
+
+def _post_order(root, descend) -> Iterator[Tuple[ASTNode, Optional[ASTNode], int]]:
+    # Entries are (node, parent, depth, expanded): a node is yielded once its children are
+    stack = [(root, None, 0, False)]
+    while stack:
+        node, parent, depth, expanded = stack.pop()
+        if expanded or (descend is not None and not descend(node)):
+            yield node, parent, depth
+            continue
+        stack.append((node, parent, depth, True))
+        depth += 1
+        stack.extend([(child, node, depth, False) for child in reversed(children(node))])
+
+
+def _level_order(root, descend) -> Iterator[Tuple[ASTNode, Optional[ASTNode], int]]:
+    queue = deque([(root, None, 0)])
+    while queue:
+        step = queue.popleft()
+        yield step
+        node, _, depth = step
+        if descend is None or descend(node):
+            depth += 1
+            queue.extend([(child, node, depth) for child in children(node)])
+
+
+def find_all(root: ASTNode, predicate: Callable[[ASTNode], bool]) -> Iterator[ASTNode]:
+    """Nodes under root for which predicate holds, in pre-order."""
+    return (node for node in walk(root) if predicate(node))
+
+
+def find(root: ASTNode, predicate: Callable[[ASTNode], bool]) -> Optional[ASTNode]:
+    """First node under root (pre-order) for which predicate holds, or None."""
+    return next(find_all(root, predicate), None)
+
+
+def count(root: ASTNode, predicate: Optional[Callable[[ASTNode], bool]] = None) -> int:
+    """Number of nodes under root, or of those for which predicate holds."""
+    if predicate is None:
+        return sum(1 for _ in walk(root))
+    return sum(1 for _ in find_all(root, predicate))
+
+
+def replace_child(parent: ASTNode, old: ASTNode, new: Optional[ASTNode]):
+    """Replace the child old of parent with new, in place.
+
+    Inside a list field, new=None removes old from the list. Raises
+    ValueError when old is not a child of parent.
+    """
+    for field in child_fields(type(parent)):
+        value = getattr(parent, field)
+        if value is old:
+            setattr(parent, field, new)
+            return
+        if type(value) is list:
+            for index, item in enumerate(value):
+                if item is old:
+                    if new is None:
+                        del value[index]
+                    else:
+                        value[index] = new
+                    return
+    raise ValueError(f"{type(old).__name__} is not a child of {type(parent).__name__}")
+
+
+def transform(root: ASTNode, rewrite: Callable[[ASTNode], Optional[ASTNode]]) -> ASTNode:
+    """Rewrite the tree bottom-up and return the (possibly replaced) root.
+
+    rewrite is called on every node in post-order, after its children were
+    rewritten; when it returns a node other than its argument, that node
+    takes the argument's place in the parent.
+    """
+    for node, parent, _ in list(walk(root, POST_ORDER, context=True)):
+        replacement = rewrite(node)
+        if replacement is None or replacement is node:
+            continue
+        if parent is None:
+            root = replacement
+        else:
+            replace_child(parent, node, replacement)
+    return root
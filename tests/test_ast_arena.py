@@ -0,0 +1,163 @@
+"""
+AST arena test cases for TyC compiler.
+Covers building an ASTArena from class-based nodes, views, linear scans and
+conversion back to nodes.
+"""
+
+import pytest
+from src.utils.ast_arena import LIST, MISSING, ASTArena, NodeView, measure_arena_memory
+from src.utils.node_memory import count_nodes, generate_program
+from src.utils.nodes import (
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    StructType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+from src.utils.walker import walk
+
+
+def sample_program():
+    body = BlockStmt(
+        [
+            VarDecl(None, "a", IntLiteral(-7)),
+            VarDecl(StringType(), "s", StringLiteral("hi")),
+            VarDecl(StructType("P"), "p", StructLiteral([FloatLiteral(0.5)])),
+            IfStmt(Identifier("a"), BreakStmt()),
+            ForStmt(None, Identifier("a"), PostfixOp("--", Identifier("a")), BlockStmt([])),
+            SwitchStmt(Identifier("a"), [CaseStmt(IntLiteral(1), [])], DefaultStmt([ReturnStmt()])),
+            ExprStmt(AssignExpr(MemberAccess(Identifier("p"), "x"), FuncCall("f", [Identifier("a")]))),
+            ReturnStmt(BinaryOp(Identifier("a"), "*", IntLiteral(2))),
+        ]
+    )
+    program = Program(
+        [
+            StructDecl("P", [MemberDecl(FloatType(), "x")]),
+            FuncDecl(None, "f", [Param(IntType(), "a")], body),
+        ]
+    )
+    for line, stmt in enumerate(body.statements, 2):
+        stmt.line, stmt.column = line, 4
+    return program
+
+
+def test_round_trip():
+    program = sample_program()
+    arena = ASTArena.from_tree(program)
+    assert str(arena.to_node()) == str(program)
+    assert str(arena.view()) == str(program)
+    big = generate_program(500)
+    assert str(ASTArena.from_tree(big).to_node()) == str(big)
+
+
+def test_positions_and_shared_types_survive():
+    arena = ASTArena.from_tree(sample_program())
+    program = arena.to_node()
+    statements = program.decls[1].body.statements
+    assert [(stmt.line, stmt.column) for stmt in statements] == [(line, 4) for line in range(2, 10)]
+    assert program.decls[1].line is None
+    assert statements[1].var_type is StringType()
+    assert statements[2].var_type == StructType("P")
+
+
+def test_entries_are_in_pre_order():
+    program = generate_program(200)
+    arena = ASTArena.from_tree(program)
+    node_entries = [index for index in range(len(arena)) if arena.kinds[index] > 0]
+    assert len(node_entries) == count_nodes(program)
+    walked = [type(node) for node in walk(program)]
+    assert [arena.node_class(index) for index in node_entries] == walked
+
+
+def test_missing_children_and_lists():
+    arena = ASTArena.from_tree(ForStmt(None, None, None, BlockStmt([])))
+    assert list(arena.kinds[:5]) == [arena.kinds[0], MISSING, MISSING, MISSING, arena.kinds[4]]
+    assert arena.kinds[5] == LIST
+    assert list(arena.children(0)) == [1, 2, 3, 4]
+    assert list(arena.children(5)) == []
+
+
+def test_views():
+    arena = ASTArena.from_tree(sample_program())
+    view = arena.view()
+    assert isinstance(view, NodeView) and view.node_class is Program
+    func = view.decls[1]
+    assert func.name == "f" and func.return_type is None
+    assert func.params[0].param_type.node_class is IntType
+    first, _, third = func.body.statements[:3]
+    assert first.var_type is None and first.init_value.value == -7
+    assert third.init_value.values[0].value == 0.5
+    assert (first.line, first.column) == (2, 4)
+    call = func.body.statements[6].expr.rhs
+    assert call.name == "f" and call.args[0].name == "a"
+    assert str(func.body.statements[7].expr) == "BinaryOp(Identifier(a), *, IntLiteral(2))"
+    with pytest.raises(AttributeError):
+        func.operator
+
+
+def test_subtree_conversion():
+    arena = ASTArena.from_tree(generate_program(300))
+    body = arena.view().decls[4].body
+    stmt = body.statements[4]
+    assert str(stmt.to_node()) == "ExprStmt(FuncCall(printInt, [Identifier(x)]))"
+    assert str(arena.to_node(body.statements[5].index)) == (
+        "ExprStmt(AssignExpr(Identifier(y) = FuncCall(f3, [Identifier(x), Identifier(y)])))"
+    )
+
+
+def test_linear_scans():
+    program = generate_program(1000)
+    arena = ASTArena.from_tree(program)
+    identifiers = list(arena.indices_of(Identifier))
+    assert len(identifiers) == 2400
+    assert [arena.scalar(index) for index in identifiers[:4]] == ["a", "b", "x", "x"]
+    calls = [arena.scalar(index) for index in arena.indices_of(FuncCall)]
+    assert calls.count("printInt") == 101
+    assert arena.strings.count("x") == 1
+
+
+def test_deep_tree():
+    expr = IntLiteral(0)
+    for i in range(50_000):
+        expr = BinaryOp(expr, "-", IntLiteral(i))
+    arena = ASTArena.from_tree(ExprStmt(expr))
+    assert len(arena) == 100_002
+    rebuilt = arena.to_node()
+    assert rebuilt.expr.right.value == 49_999
+
+
+def test_unknown_node_class():
+    class Custom(Identifier):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        ASTArena.from_tree(ExprStmt(Custom("x")))
+
+
+def test_arena_uses_less_memory():
+    result = measure_arena_memory(1000)
+    assert result["arena"] < result["objects"]
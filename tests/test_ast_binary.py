@@ -0,0 +1,181 @@
+"""
+Binary AST format test cases for TyC compiler.
+Covers dumps/loads round trips of every node type, positions and errors.
+"""
+
+import io
+import pickle
+
+import pytest
+from tests.utils import assert_same_tree
+from src.utils import ast_binary
+from src.utils.ast_binary import ASTFormatError, dump, dumps, load, loads
+from src.utils.node_memory import generate_program
+from src.utils.nodes import (
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    TypeTable,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+
+
+def every_node_program():
+    body = BlockStmt(
+        [
+            VarDecl(None, "a", IntLiteral(-2147483648)),
+            VarDecl(FloatType(), "b", FloatLiteral(1.25e-300)),
+            VarDecl(StringType(), "s", StringLiteral('tab\\t "quote" ünïcode')),
+            VarDecl(StructType("Point"), "p", StructLiteral([IntLiteral(1), IntLiteral(2)])),
+            VarDecl(IntType(), "c"),
+            IfStmt(Identifier("a"), BreakStmt(), ContinueStmt()),
+            IfStmt(Identifier("a"), BlockStmt([])),
+            WhileStmt(BinaryOp(Identifier("a"), "<", IntLiteral(10)), ExprStmt(PostfixOp("++", Identifier("a")))),
+            ForStmt(None, None, None, BlockStmt([])),
+            ForStmt(
+                ExprStmt(AssignExpr(Identifier("a"), IntLiteral(0))),
+                BinaryOp(Identifier("a"), "<", IntLiteral(3)),
+                PrefixOp("--", Identifier("a")),
+                ExprStmt(FuncCall("printInt", [MemberAccess(Identifier("p"), "x")])),
+            ),
+            SwitchStmt(
+                Identifier("a"),
+                [CaseStmt(IntLiteral(1), [BreakStmt()]), CaseStmt(PrefixOp("-", IntLiteral(1)), [])],
+                DefaultStmt([ReturnStmt()]),
+            ),
+            SwitchStmt(Identifier("a"), []),
+            ReturnStmt(IntLiteral(12345678901234567890)),
+        ]
+    )
+    program = Program(
+        [
+            StructDecl("Point", [MemberDecl(IntType(), "x"), MemberDecl(IntType(), "y")]),
+            FuncDecl(None, "f", [Param(StructType("Point"), "p"), Param(FloatType(), "q")], body),
+            FuncDecl(VoidType(), "main", [], BlockStmt([])),
+        ]
+    )
+    for index, node in enumerate(body.statements):
+        node.line, node.column = 3 + index * 200, index * 40
+    program.decls[1].line, program.decls[1].column = 2, 0
+    return program
+
+
+def test_round_trip_every_node_type():
+    program = every_node_program()
+    loaded = loads(dumps(program))
+    assert_same_tree(program, loaded)
+    assert str(loaded) == str(program)
+
+
+def test_round_trip_keeps_positions():
+    program = generate_program(500)
+    loaded = loads(dumps(program))
+    assert_same_tree(program, loaded)
+    assert loaded.decls[7].body.statements[3].line == 75
+    assert loaded.decls[7].body.statements[3].column == 4
+    assert loaded.decls[0].params[0].line is None
+
+
+def test_loaded_types_are_shared():
+    loaded = loads(dumps(every_node_program()))
+    assert loaded.decls[0].members[0].member_type is IntType()
+    point = loaded.decls[1].params[0].param_type
+    assert point == StructType("Point")
+    # One StructType per name and loads call
+    assert loaded.decls[1].body.statements[3].var_type is point
+    assert loads(dumps(every_node_program()), TypeTable()).decls[1].params[0].param_type is not point
+    assert loaded.decls[1].return_type is None
+
+
+def test_names_come_from_string_table():
+    program = generate_program(200)
+    data = dumps(program)
+    assert data.count(b"printInt") == 1
+    loaded = loads(data)
+    first, second = loaded.decls[0].body.statements[0], loaded.decls[1].body.statements[0]
+    assert first.name is second.name
+
+
+def test_deep_tree_round_trip():
+    expr = IntLiteral(0)
+    for i in range(50_000):
+        expr = BinaryOp(expr, "+", IntLiteral(i))
+    loaded = loads(dumps(ExprStmt(expr)))
+    depth = 0
+    node = loaded.expr
+    while isinstance(node, BinaryOp):
+        assert node.right.value == 49_999 - depth
+        node = node.left
+        depth += 1
+    assert depth == 50_000
+
+
+def test_dump_and_load_file(tmp_path):
+    program = every_node_program()
+    cache_file = tmp_path / "main.ast"
+    with open(cache_file, "wb") as f:
+        dump(program, f)
+    with open(cache_file, "rb") as f:
+        assert str(load(f)) == str(program)
+    assert str(load(io.BytesIO(dumps(Program([]))))) == "Program([])"
+
+
+def test_binary_format_is_smaller_than_pickle():
+    program = generate_program(1000)
+    assert len(dumps(program)) * 4 < len(pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def test_rejects_other_data():
+    with pytest.raises(ASTFormatError):
+        loads(b"not an AST at all")
+
+
+def test_rejects_other_version(monkeypatch):
+    data = dumps(Program([]))
+    monkeypatch.setattr(ast_binary, "FORMAT_VERSION", ast_binary.FORMAT_VERSION + 1)
+    with pytest.raises(ASTFormatError, match="version"):
+        loads(data)
+
+
+def test_rejects_truncated_data():
+    data = dumps(every_node_program())
+    for size in (len(data) - 1, len(data) // 2, len(ast_binary.MAGIC) + 1):
+        with pytest.raises(ASTFormatError):
+            loads(data[:size])
+
+
+def test_unknown_node_class():
+    class Custom(Identifier):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        dumps(ExprStmt(Custom("x")))
@@ -0,0 +1,162 @@
+"""
+AST serializer test cases for TyC compiler.
+Covers write_ast/ast_to_string, which str() of every node delegates to.
+"""
+
+import io
+
+from src.utils import ast_writer
+from src.utils.ast_writer import ast_to_string, write_ast
+from src.utils.node_memory import generate_program
+from src.utils.nodes import (
+    Program,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+
+
+def test_statement_formats():
+    body = BlockStmt(
+        [
+            WhileStmt(Identifier("x"), BreakStmt()),
+            ForStmt(None, None, None, ContinueStmt()),
+            ForStmt(
+                VarDecl(IntType(), "i", IntLiteral(0)),
+                BinaryOp(Identifier("i"), "<", IntLiteral(3)),
+                PostfixOp("++", Identifier("i")),
+                BlockStmt([]),
+            ),
+            SwitchStmt(
+                Identifier("x"),
+                [CaseStmt(IntLiteral(1), [BreakStmt()]), CaseStmt(IntLiteral(2), [])],
+                DefaultStmt([ExprStmt(PrefixOp("-", Identifier("x")))]),
+            ),
+            SwitchStmt(Identifier("x"), []),
+            IfStmt(Identifier("x"), ReturnStmt(), ReturnStmt(Identifier("x"))),
+        ]
+    )
+    assert ast_to_string(body) == (
+        "BlockStmt([WhileStmt(while Identifier(x) do BreakStmt()), "
+        "ForStmt(for None; None; None do ContinueStmt()), "
+        "ForStmt(for VarDecl(IntType(), i = IntLiteral(0)); BinaryOp(Identifier(i), <, IntLiteral(3)); "
+        "PostfixOp(Identifier(i)++) do BlockStmt([])), "
+        "SwitchStmt(switch Identifier(x) cases [CaseStmt(case IntLiteral(1): [BreakStmt()]), "
+        "CaseStmt(case IntLiteral(2): [])], default DefaultStmt(default: [ExprStmt(PrefixOp(-Identifier(x)))])), "
+        "SwitchStmt(switch Identifier(x) cases []), "
+        "IfStmt(if Identifier(x) then ReturnStmt(return), else ReturnStmt(return Identifier(x)))])"
+    )
+
+
+def test_expression_formats():
+    expr = FuncCall(
+        "f",
+        [
+            AssignExpr(MemberAccess(Identifier("p"), "x"), FloatLiteral(1.5)),
+            StructLiteral([IntLiteral(1), StringLiteral('say "hi"')]),
+            StructLiteral([]),
+        ],
+    )
+    assert ast_to_string(expr) == (
+        "FuncCall(f, [AssignExpr(MemberAccess(Identifier(p).x) = FloatLiteral(1.5)), "
+        "StructLiteral({IntLiteral(1), StringLiteral('say \"hi\"')}), StructLiteral({})])"
+    )
+
+
+def test_type_formats():
+    params = [Param(t, "p") for t in (IntType(), FloatType(), StringType(), StructType("S"))]
+    func = FuncDecl(VoidType(), "f", params, BlockStmt([VarDecl(None, "a")]))
+    assert str(func) == (
+        "FuncDecl(VoidType(), f, [Param(IntType(), p), Param(FloatType(), p), "
+        "Param(StringType(), p), Param(StructType(S), p)], BlockStmt([VarDecl(auto, a)]))"
+    )
+    assert str(FuncDecl(None, "g", [], BlockStmt([]))) == "FuncDecl(auto, g, [], BlockStmt([]))"
+
+
+class TracedCall(FuncCall):
+    __slots__ = ("trace",)
+
+
+class LineLiteral(IntLiteral):
+    __slots__ = ()
+
+
+def test_subclasses_use_their_base_format():
+    call = TracedCall("f", [LineLiteral(3)])
+    assert str(call) == "FuncCall(f, [IntLiteral(3)])"
+    assert str(ExprStmt(TracedCall("g", []))) == "ExprStmt(FuncCall(g, []))"
+    assert ast_writer._LAYOUTS[TracedCall] is ast_writer._LAYOUTS[FuncCall]
+
+
+def test_str_delegates_to_writer():
+    program = generate_program(200)
+    assert str(program) == ast_to_string(program)
+    assert str(program).startswith("Program([FuncDecl(IntType(), f0, [Param(IntType(), a), Param(IntType(), b)]")
+
+
+def test_deeply_nested_expression_does_not_recurse():
+    expr = IntLiteral(0)
+    for _ in range(50_000):
+        expr = BinaryOp(expr, "+", IntLiteral(1))
+    text = str(ExprStmt(expr))
+    assert text.startswith("ExprStmt(" + "BinaryOp(" * 50_000 + "IntLiteral(0), +, IntLiteral(1))")
+    assert text.endswith(", +, IntLiteral(1)))")
+
+
+def test_long_else_if_chain():
+    stmt = ReturnStmt()
+    for i in range(20_000):
+        stmt = IfStmt(Identifier("x"), ReturnStmt(IntLiteral(i)), stmt)
+    assert str(stmt).count("IfStmt(") == 20_000
+
+
+def test_write_ast_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr(ast_writer, "CHUNK_PARTS", 10)
+    writes = []
+
+    class Stream:
+        def write(self, text):
+            writes.append(text)
+
+    program = generate_program(100)
+    write_ast(program, Stream())
+    assert len(writes) > 1
+    assert "".join(writes) == ast_to_string(program)
+
+
+def test_write_ast_to_file(tmp_path):
+    program = Program([FuncDecl(IntType(), "main", [], BlockStmt([]))])
+    out_file = tmp_path / "ast.txt"
+    with open(out_file, "w") as f:
+        write_ast(program, f)
+    assert out_file.read_text() == "Program([FuncDecl(IntType(), main, [], BlockStmt([]))])"
+    buffer = io.StringIO()
+    write_ast(Program([]), buffer)
+    assert buffer.getvalue() == "Program([])"
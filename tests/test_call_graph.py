@@ -0,0 +1,102 @@
+"""
+Call graph test cases for TyC compiler.
+Covers call graph construction, strongly connected components in callee
+first order, and return type inference that follows them.
+"""
+
+import pytest
+from tests.utils import Parser
+from src.astgen.direct_builder import build_ast
+from src.semantics.call_graph import (
+    build_call_graph,
+    generate_call_chain_source,
+    measure_call_graph_inference,
+    strongly_connected_components,
+)
+from src.semantics.static_error import TypeCannotBeInferred
+from src.semantics.type_inference import infer_types
+from src.utils.nodes import FloatType, FuncDecl, VarDecl
+
+
+def declared(source):
+    types = infer_types(build_ast(source))
+    return {node.name: str(node_type) for node, node_type in types.items() if type(node) in (VarDecl, FuncDecl)}
+
+
+def test_call_graph():
+    source = """
+    f(int n) { printInt(n); g(); if (n) return h(n); return g() + 1; }
+    g() { return 1; }
+    h(int n) { return f(n - 1) + g(); }
+    void main() { f(3); }
+    """
+    graph = build_call_graph(build_ast(source))
+    assert list(graph.functions) == ["f", "g", "h", "main"]
+    assert graph.callees == {"f": ["g", "h"], "g": [], "h": ["f", "g"], "main": ["f"]}
+    # Up to and including f's first `return expr;`
+    assert graph.leading_callees["f"] == ["g", "h"]
+    assert graph.leading_callees["main"] == ["f"]
+
+
+def test_leading_callees_stop_at_the_first_return():
+    graph = build_call_graph(build_ast("f() { return g(); return h(); }\ng() { return 1; }\nh() { return 2; }"))
+    assert graph.callees["f"] == ["g", "h"]
+    assert graph.leading_callees["f"] == ["g"]
+
+
+@pytest.mark.parametrize(
+    "graph, components",
+    [
+        ({"a": ["b"], "b": ["c"], "c": []}, [["c"], ["b"], ["a"]]),
+        ({"a": ["b"], "b": ["a", "c"], "c": ["c"]}, [["c"], ["a", "b"]]),
+        ({"d": ["c"], "c": ["a"], "b": ["c", "d"], "a": ["b"]}, [["d", "c", "b", "a"]]),
+        ({"a": [], "b": ["a"], "c": ["b", "d"], "d": ["c"]}, [["a"], ["b"], ["c", "d"]]),
+    ],
+)
+def test_strongly_connected_components(graph, components):
+    assert strongly_connected_components(graph) == components
+
+
+def test_components_are_found_without_recursion():
+    size = 100_000
+    chain = {i: [i + 1] for i in range(size - 1)}
+    chain[size - 1] = [0]
+    assert strongly_connected_components(chain) == [list(range(size))]
+    chain[size - 1] = []
+    assert strongly_connected_components(chain)[0] == [size - 1]
+
+
+def test_callee_is_typed_before_its_caller():
+    # In source order, `y + 1` would make g's return type int before g is checked
+    source = "f() { auto y = g(); auto z = y + 1; return z; }\ng() { return 1.5; }\nvoid main() { f(); }"
+    assert declared(source) == {"y": "FloatType()", "z": "FloatType()", "f": "FloatType()", "g": "FloatType()"}
+
+
+def test_mutual_recursion():
+    source = """
+    isEven(int n) { if (n == 0) return 1; return isOdd(n - 1); }
+    isOdd(int n) { if (n == 0) return 0; return isEven(n - 1); }
+    // sum's first return does not call avg, so sum is typed first
+    avg(int n) { auto s = sum(n); if (n > 0) return s / n; return 0.0; }
+    sum(int n) { if (n <= 0) return 1.5; return avg(n - 1); }
+    void main() { printInt(isEven(4)); printFloat(avg(3)); }
+    """
+    types = declared(source)
+    assert types["isEven"] == types["isOdd"] == "IntType()"
+    assert types["avg"] == types["sum"] == types["s"] == "FloatType()"
+
+
+def test_recursion_without_a_base_type_cannot_be_inferred():
+    source = "f(int n) { return g(n); }\ng(int n) { return f(n); }\nvoid main() { f(1); }"
+    assert Parser(source).parse() == "success"
+    with pytest.raises(TypeCannotBeInferred):
+        infer_types(build_ast(source))
+
+
+def test_call_chain_benchmark():
+    program = build_ast(generate_call_chain_source(40))
+    types = infer_types(program)
+    assert {node_type for node, node_type in types.items() if type(node) is FuncDecl} == {FloatType()}
+    # main, the groups f0-f3 ... f32-f35, then f36 ... f39 on their own
+    assert len(build_call_graph(program).components()) == 1 + 9 + 4
+    assert sorted(measure_call_graph_inference((20, 80))) == [20, 80]
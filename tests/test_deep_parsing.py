@@ -0,0 +1,139 @@
+"""
+Deep-nesting parsing test cases for TyC compiler.
+Stress-tests generated programs nested far beyond Python's recursion limit
+with both front ends, the nesting limit and its diagnostic, syntax errors
+before deep nesting, the bound on the recursion limit, and parity with the
+regular entry points on ordinary programs and errors.
+"""
+
+import sys
+
+import pytest
+from tests.utils import Parser, assert_same_tree
+from src.astgen.direct_builder import build_ast, tokenize
+from src.utils.deep_parsing import (
+    DEFAULT_MAX_NESTING,
+    FRAMES_PER_LEVEL,
+    MAX_RECURSION_LIMIT,
+    NestingError,
+    build_ast_deep,
+    check_nesting,
+    generate_nested_source,
+    nesting_depth,
+    parse_source_deep,
+    run_deep,
+)
+from src.utils.error_listener import SyntaxException
+from src.utils.nodes import BlockStmt, PrefixOp, StructLiteral
+from src.utils.walker import count
+
+DEPTH = 3_000
+KINDS = ["parens", "unary", "blocks", "struct", "else-if"]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_deep_programs_parse(kind):
+    source = generate_nested_source(DEPTH, kind)
+    assert DEPTH > sys.getrecursionlimit()
+    assert parse_source_deep(source).tree is not None
+    program = build_ast_deep(source)
+    if kind == "unary":
+        assert count(program, lambda node: type(node) is PrefixOp) == DEPTH
+    elif kind == "blocks":
+        assert count(program, lambda node: type(node) is BlockStmt) == DEPTH + 1
+    elif kind == "struct":
+        assert count(program, lambda node: type(node) is StructLiteral) == DEPTH
+
+
+def test_recursion_limit_is_restored():
+    limit = sys.getrecursionlimit()
+    build_ast_deep(generate_nested_source(DEPTH))
+    with pytest.raises(NestingError):
+        build_ast_deep(generate_nested_source(DEPTH), limit=100)
+    assert sys.getrecursionlimit() == limit
+
+
+@pytest.mark.parametrize("deep", [parse_source_deep, build_ast_deep])
+def test_nesting_beyond_the_limit_is_reported(deep):
+    source = generate_nested_source(300, "parens")
+    with pytest.raises(NestingError) as error:
+        deep(source, limit=200)
+    # The function body's brace is the first level
+    assert str(error.value) == "Error on line 1 col 221: ( nested deeper than 200 levels"
+    assert isinstance(error.value, SyntaxException)
+    assert error.value.limit == 200
+
+
+@pytest.mark.parametrize("deep", [parse_source_deep, build_ast_deep])
+def test_syntax_error_before_deep_nesting_is_reported(deep):
+    source = "int f( { }\n" + generate_nested_source(300, "parens")
+    with pytest.raises(SyntaxException) as error:
+        deep(source, limit=200)
+    assert type(error.value) is not NestingError
+    assert str(error.value).startswith("Error on line 1 col 7:")
+
+
+def test_recursion_limit_is_bounded():
+    with pytest.raises(ValueError):
+        run_deep(sum, [], limit=MAX_RECURSION_LIMIT // FRAMES_PER_LEVEL)
+    assert run_deep(sum, [], limit=DEFAULT_MAX_NESTING) == 0
+
+
+@pytest.mark.parametrize("deep", [parse_source_deep, build_ast_deep])
+def test_recursion_the_scan_does_not_count_is_reported(deep):
+    # An else-if chain is not counted by the scan, so the recursion limit catches it
+    source = generate_nested_source(1_000, "else-if")
+    assert nesting_depth(tokenize(source))[0] == 2
+    with pytest.raises(NestingError):
+        deep(source, limit=10)
+
+
+@pytest.mark.parametrize(
+    "source, depth",
+    [
+        ("void main() { }", 1),
+        ("void main() { x = -a - -b + -(-c); }", 4),
+        ("void main() { x = a++ - --b; y = !!!c; }", 4),
+        ("void main() { f(- - -(x), {{1}}); }", 6),
+    ],
+)
+def test_nesting_depth(source, depth):
+    tokens = tokenize(source)
+    assert nesting_depth(tokens)[0] == depth
+    check_nesting(tokens, depth)
+    with pytest.raises(NestingError):
+        check_nesting(tokens, depth - 1)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "struct P { int x; };\nint f(P p) { return p.x; }\nvoid main() { printInt(f({1})); }",
+        "void main() { int x = ((1 + 2) * 3; }",
+        "int f() { { } }",
+        'void main() { string s = "abc\n; }',
+        "void main() { int x = 1 @ 2; }",
+    ],
+)
+def test_same_results_as_regular_entry_points(source):
+    expected = Parser(source).parse()
+    try:
+        parse_source_deep(source)
+        actual = "success"
+    except Exception as e:
+        actual = str(e)
+    assert actual == expected
+    try:
+        expected = build_ast(source)
+    except Exception as e:
+        with pytest.raises(type(e)) as error:
+            build_ast_deep(source)
+        assert str(error.value) == str(e)
+        return
+    assert_same_tree(expected, build_ast_deep(source))
+
+
+def test_run_deep_returns_and_raises():
+    assert run_deep(sum, [1, 2, 3]) == 6
+    with pytest.raises(ZeroDivisionError):
+        run_deep(divmod, 1, 0)
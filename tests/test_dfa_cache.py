@@ -0,0 +1,58 @@
+"""
+DFA cache test cases for TyC compiler.
+Checks that warmed lexer/parser DFA states survive a save/load round trip.
+"""
+
+import pickle
+
+from tests.utils import Parser
+from src.utils import dfa_cache
+from src.utils.parsing import parse_source, warm_dfa_cache
+
+
+SOURCE = """struct Point { int x; int y; };
+int add(int a, int b) { return a + b; }
+void main() {
+    Point p = {1, 2};
+    auto s = add(p.x, p.y);
+    for (auto i = 0; i < 10; ++i) { if (i % 2 == 0) printInt(i); else s = s - 1; }
+    switch (s) { case 1: printInt(1); break; default: printString("other"); }
+}"""
+
+
+def test_dfa_cache_round_trip(tmp_path):
+    cache_file = str(tmp_path / "TyC.dfa")
+    expected = parse_source(SOURCE).tree.toStringTree()
+    warmed = dfa_cache.count_dfa_states()
+    dfa_cache.save_dfa_cache(cache_file)
+
+    dfa_cache.clear_dfa_cache()
+    assert dfa_cache.count_dfa_states() == {"lexer": 0, "parser": 0}
+
+    assert dfa_cache.load_dfa_cache(cache_file)
+    assert dfa_cache.count_dfa_states() == warmed
+    assert parse_source(SOURCE).tree.toStringTree() == expected
+    assert Parser("int f() { int x; x = 1; }").parse() == "Error on line 1 col 24: }"
+
+
+def test_dfa_cache_missing_file(tmp_path):
+    assert not dfa_cache.load_dfa_cache(str(tmp_path / "missing.dfa"))
+
+
+def test_dfa_cache_rejects_other_grammar(tmp_path):
+    cache_file = tmp_path / "TyC.dfa"
+    with open(cache_file, "wb") as f:
+        pickle.dump({"version": dfa_cache.CACHE_VERSION, "grammar": "0" * 64}, f)
+    before = dfa_cache.count_dfa_states()
+    assert not dfa_cache.load_dfa_cache(str(cache_file))
+    assert dfa_cache.count_dfa_states() == before
+
+
+def test_warm_dfa_cache_from_files(tmp_path):
+    source_file = tmp_path / "main.tyc"
+    source_file.write_text(SOURCE)
+    cache_file = str(tmp_path / "TyC.dfa")
+    warm_dfa_cache([str(source_file)], cache_file)
+    dfa_cache.clear_dfa_cache()
+    assert dfa_cache.load_dfa_cache(cache_file)
+    assert dfa_cache.count_dfa_states()["parser"] > 0
@@ -0,0 +1,82 @@
+"""
+Multi-error diagnostics test cases for TyC compiler.
+Covers collecting several lexical and syntax errors in one pass, message
+parity with the single-error mode and both lexer backends.
+"""
+
+import pytest
+from tests.utils import Parser, Tokenizer
+from src.utils.diagnostics import LEXICAL, SYNTAX, collect_diagnostics, declaration_starts
+from src.grammar.fast_lexer import TyCFastLexer
+from antlr4 import InputStream
+
+
+BROKEN_FUNCTIONS = [
+    "int f() { int x; x = 1; }",
+    "void g() { x = ; }",
+    "void h() { for (auto i=0 i<10 ++i) printInt(i); }",
+    "int k(int a int b) { return a+b; }",
+]
+
+
+def summary(diagnostics):
+    return [(d.kind, d.line, d.column, d.text) for d in diagnostics]
+
+
+@pytest.mark.parametrize("backend", ["antlr", "fast"])
+def test_valid_program_has_no_diagnostics(backend):
+    source = "struct P { int x; };\nint f(P p) { return p.x; }\nvoid main() { printInt(f({1})); }"
+    assert collect_diagnostics(source, backend) == []
+
+
+@pytest.mark.parametrize("source", BROKEN_FUNCTIONS)
+def test_single_error_matches_single_error_mode(source):
+    diagnostics = collect_diagnostics(source)
+    assert {d.kind for d in diagnostics} == {SYNTAX}
+    assert diagnostics[0].message == Parser(source).parse()
+
+
+def test_one_diagnostic_per_broken_declaration():
+    source = "\n".join(BROKEN_FUNCTIONS)
+    diagnostics = collect_diagnostics(source)
+    firsts = {}
+    for diagnostic in diagnostics:
+        firsts.setdefault(diagnostic.line, diagnostic)
+    assert sorted(firsts) == [1, 2, 3, 4]
+    for line, function in enumerate(BROKEN_FUNCTIONS, 1):
+        # Same first error as when the declaration is parsed on its own
+        assert firsts[line].message == Parser(function).parse().replace("line 1", f"line {line}")
+
+
+@pytest.mark.parametrize("backend", ["antlr", "fast"])
+def test_lexical_errors_are_collected_and_skipped(backend):
+    source = 'void main() {\n  int x = 1 @ 2;\n  string s = "abc\n  string t = "a\\qb\\"c";\n  printInt(x);\n}'
+    diagnostics = collect_diagnostics(source, backend)
+    assert summary(diagnostics) == [
+        (LEXICAL, 2, 12, "@"),
+        (SYNTAX, 2, 14, "2"),
+        (LEXICAL, 3, 13, "abc\n"),
+        (SYNTAX, 4, 2, "string"),  # `string s =` lost its initializer
+        (LEXICAL, 4, 13, "a\\q"),
+        (SYNTAX, 4, 22, ";"),  # without the bad literal: `string t = ;`
+    ]
+    assert diagnostics[0].message == "Error Token @"
+    assert diagnostics[2].message == "Unclosed String: abc\n"
+    assert diagnostics[4].message == Tokenizer('"a\\qb"').get_tokens_as_string()
+
+
+def test_backends_report_the_same_diagnostics():
+    source = 'int f() { return "x\n; }\nvoid g() { a = $; b = ; }\nh() { return 1 }'
+    assert summary(collect_diagnostics(source, "antlr")) == summary(collect_diagnostics(source, "fast"))
+    assert {d.line for d in collect_diagnostics(source)} == {1, 2, 3, 4}
+
+
+def test_default_mode_still_stops_at_first_error():
+    source = "\n".join(BROKEN_FUNCTIONS)
+    assert Parser(source).parse() == collect_diagnostics(source)[0].message
+
+
+def test_declaration_starts():
+    tokens = TyCFastLexer(InputStream("struct P { int x; };\nint f() { { } return 1; }\nvoid g() {}")).getAllTokens()
+    texts = [tokens[index].text for index in declaration_starts(tokens) if index < len(tokens)]
+    assert texts == ["struct", "int", "void"]
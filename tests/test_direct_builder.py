@@ -0,0 +1,181 @@
+"""
+Direct AST builder test cases for TyC compiler.
+Covers the AST shapes built straight from the token stream, agreement with
+TyCParser on accepted programs and error messages, and the memory saving
+over the parse tree.
+"""
+
+import pytest
+from tests.utils import ASTGenerator, Parser, assert_same_tree
+from src.astgen.direct_builder import DirectASTBuilder, UnsupportedConstruct, build_ast, measure_build_memory, tokenize
+from src.astgen.expression_benchmark import CascadeASTBuilder, measure_expression_parsing
+from src.utils.error_listener import SyntaxException
+from src.utils.node_memory import generate_expression_source, generate_program, generate_source
+from src.utils.nodes import BinaryOp, FuncCall, Identifier, IntType, ReturnStmt, VarDecl
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("", "Program([])"),
+        (
+            "struct P { int x; P next; };",
+            "Program([StructDecl(P, [MemberDecl(IntType(), x), MemberDecl(StructType(P), next)])])",
+        ),
+        (
+            "void main() { P p = {1, {2}}; p.next.x = -3; auto q; }",
+            "Program([FuncDecl(VoidType(), main, [], BlockStmt([VarDecl(StructType(P), p = "
+            "StructLiteral({IntLiteral(1), StructLiteral({IntLiteral(2)})})), "
+            "ExprStmt(AssignExpr(MemberAccess(MemberAccess(Identifier(p).next).x) = IntLiteral(-3))), "
+            "VarDecl(auto, q)]))])",
+        ),
+        (
+            "f() return (1 + 2) * 3;",
+            "Program([FuncDecl(auto, f, [], BlockStmt([ReturnStmt(return "
+            "BinaryOp(BinaryOp(IntLiteral(1), +, IntLiteral(2)), *, IntLiteral(3)))]))])",
+        ),
+        (
+            "void g() { a = b = c; x = -y++ || !z && --w; }",
+            "Program([FuncDecl(VoidType(), g, [], BlockStmt([ExprStmt(AssignExpr(Identifier(a) = "
+            "AssignExpr(Identifier(b) = Identifier(c)))), ExprStmt(AssignExpr(Identifier(x) = "
+            "BinaryOp(PrefixOp(-PostfixOp(Identifier(y)++)), ||, "
+            "BinaryOp(PrefixOp(!Identifier(z)), &&, PrefixOp(--Identifier(w))))))]))])",
+        ),
+        (
+            "void h() { for (q = 0; q < 2; q++) { break; } for (;;) { continue; } }",
+            "Program([FuncDecl(VoidType(), h, [], BlockStmt([ForStmt(for ExprStmt(AssignExpr("
+            "Identifier(q) = IntLiteral(0))); BinaryOp(Identifier(q), <, IntLiteral(2)); "
+            "PostfixOp(Identifier(q)++) do BlockStmt([BreakStmt()])), ForStmt(for None; None; None do BlockStmt([ContinueStmt()]))]))])",
+        ),
+        (
+            "int f(int x) { switch (x) { case 1: case 2: printInt(1); break; default: x = 0; } return x; }",
+            "Program([FuncDecl(IntType(), f, [Param(IntType(), x)], BlockStmt([SwitchStmt(switch Identifier(x) "
+            "cases [CaseStmt(case IntLiteral(1): []), CaseStmt(case IntLiteral(2): "
+            "[ExprStmt(FuncCall(printInt, [IntLiteral(1)])), BreakStmt()])], default DefaultStmt(default: "
+            "[ExprStmt(AssignExpr(Identifier(x) = IntLiteral(0)))])), ReturnStmt(return Identifier(x))]))])",
+        ),
+        (
+            "float k() { if (1) return 1.5; else { } return .5e1; }",
+            "Program([FuncDecl(FloatType(), k, [], BlockStmt([IfStmt(if IntLiteral(1) then "
+            "ReturnStmt(return FloatLiteral(1.5)), else BlockStmt([])), ReturnStmt(return FloatLiteral(5.0))]))])",
+        ),
+    ],
+)
+def test_ast_shapes(source, expected):
+    assert Parser(source).parse() == "success"
+    assert str(build_ast(source)) == expected
+
+
+def test_generated_program_matches_hand_built_ast():
+    assert str(build_ast(generate_source(200))) == str(generate_program(200))
+
+
+def test_positions_and_shared_nodes():
+    program = build_ast("int f(int a) {\n  int x = a + 1;\n  return f(x);\n}")
+    func = program.decls[0]
+    assert (func.line, func.column) == (1, 0)
+    decl, ret = func.body.statements
+    assert isinstance(decl, VarDecl) and (decl.line, decl.column) == (2, 2)
+    assert isinstance(decl.init_value, BinaryOp) and (decl.init_value.line, decl.init_value.column) == (2, 10)
+    assert decl.var_type is IntType()
+    assert isinstance(ret, ReturnStmt) and isinstance(ret.expr, FuncCall)
+    assert ret.expr.name is func.name
+    assert isinstance(ret.expr.args[0], Identifier) and ret.expr.args[0].name is decl.name
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "void main() { { } {1, 2}; {}; { {} {} } }",
+        "int f() { { return 1; } }",
+        "int f() {1, 2};",
+        "void main() { while (1) { if (x) { break; } } }",
+        "int f() { { printInt(1); } return 1; }",
+        "void f() { if (x) return; }",
+        "void main() { while (1) break; }",
+        "void main() { switch (x) { case 1: int y; } }",
+        "void main() { switch (x) { case 1: break; break; } }",
+        "void main() { switch (x) { } }",
+        "int f(int a int b) { return a+b; }",
+        "void f() { return 1; }",
+        "struct P{int x; int y;}",
+        "int f() { int x; x = 1; }",
+        "void main() { x = 1 }",
+        "void main() { auto x = ; }",
+        "void main() { int x = 1 @ 2; }",
+        "void main() { (a) = 1; }",
+        "void main() { a + b = c; }",
+        "void main() { -a = 1; }",
+        "void main() { f(x).a = 1; }",
+        "void main() { a.b = c.d = (e = 1) + 2; }",
+        "void main() { x = a == b = c; }",
+        'void main() { string s = "abc',
+        'void main() { string s = "a\\qb"; }',
+    ],
+)
+def test_agrees_with_parser(source):
+    expected = Parser(source).parse()
+    try:
+        build_ast(source)
+        actual = "success"
+    except Exception as e:
+        actual = str(e)
+    assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "void main() { f(1)(2); }",
+        "void main() { s.f(1); }",
+        "void main() { switch (x) { default: break; default: break; } }",
+    ],
+)
+def test_constructs_without_ast_form_are_not_syntax_errors(source):
+    assert Parser(source).parse() == "success"
+    with pytest.raises(UnsupportedConstruct) as error:
+        build_ast(source)
+    assert not isinstance(error.value, SyntaxException)
+    assert str(error.value).startswith("Unsupported construct on line 1 col ")
+
+
+def test_ast_generator_direct_build_mode():
+    source = "void main() { printInt(1); }"
+    assert str(ASTGenerator(source, build="direct").generate()) == str(build_ast(source))
+    error = "void main() { printInt(1) }"
+    assert ASTGenerator(error, build="direct").generate() == f"AST Generation Error: {Parser(error).parse()}"
+
+
+def test_direct_build_uses_less_memory_than_parse_tree():
+    result = measure_build_memory(lines=200)
+    tree, direct = result["parse-tree"], result["direct"]
+    assert direct["peak"] < tree["peak"] / 2
+    assert direct["blocks"] < tree["blocks"] / 2
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "a + b * c - d / e % f",
+        "a || b && c == d != e < f <= g > h >= i",
+        "!-+x * -y++ - --z.w",
+        "a = b = c.d = e || f",
+        "(a + (b - (c * d))) * ((e))",
+        "f(a, g(b + 1), {1, {x, y}}).m.n--",
+        "-1 - -2.5 + \"s\"",
+    ],
+)
+def test_precedence_climbing_matches_cascade(expr):
+    tokens = tokenize(f"void main() {{ {expr}; }}")
+    assert_same_tree(CascadeASTBuilder(tokens).program(), DirectASTBuilder(tokens).program())
+
+
+def test_precedence_climbing_matches_cascade_on_generated_program():
+    tokens = tokenize(generate_expression_source(100))
+    assert_same_tree(CascadeASTBuilder(tokens).program(), DirectASTBuilder(tokens).program())
+
+
+def test_expression_benchmark_reports_every_engine():
+    result = measure_expression_parsing(lines=50, repeat=1)
+    assert result["tokens"] > 0
+    assert all(result[name] > 0 for name in ("parse-tree", "cascade", "precedence"))
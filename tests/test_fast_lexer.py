@@ -0,0 +1,81 @@
+"""
+Fast lexer backend test cases for TyC compiler.
+Each case checks that TyCFastLexer produces exactly the same result as the
+generated TyCLexer.
+"""
+
+import pytest
+from antlr4 import InputStream
+from tests.utils import Tokenizer, Parser
+from build.TyCLexer import TyCLexer
+from src.grammar.fast_lexer import TyCFastLexer
+
+
+def token_details(lexer_class, source):
+    """Lex source and return (type, text, start, stop, line, column) per token, or the error."""
+    lexer = lexer_class(InputStream(source))
+    details = []
+    try:
+        while True:
+            token = lexer.nextToken()
+            details.append(
+                (token.type, token.text, token.start, token.stop, token.line, token.column)
+            )
+            if token.type == -1:
+                break
+    except Exception as e:
+        details.append((type(e).__name__, str(e)))
+    return details
+
+
+SOURCES = [
+    "",
+    "auto autox _x1 int integer return",
+    "-5 - 5 --5 x-5 -.5 -x",
+    "1. 1.5 1.e5 1.5e 1.5e-3 .5E+2 12e8 1e 0.33E-3 ..",
+    "++ + -- - == = != ! <= < >= > || && | & . [ ] { } ( ) ; , :",
+    "/* block\n comment */ a // line \r\n b / c",
+    "/* unclosed block comment",
+    '"simple" "esc \\b\\f\\n\\r\\t\\"\\\\ ok"',
+    '"Unclosed string\r\nwith newline',
+    '"End of file',
+    '"',
+    '"Illegal \\a escape"',
+    '"backslash at end \\',
+    '"backslash newline \\\nnext',
+    "a\n\n  b\tc\fd\r\ne",
+    "x @ y",
+    "café",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_fast_lexer_matches_generated_lexer(source):
+    assert token_details(TyCFastLexer, source) == token_details(TyCLexer, source)
+
+
+def test_fast_lexer_tokenizer_backend():
+    tokenizer = Tokenizer("auto x = 5 + 3 * 2;", backend="fast")
+    assert tokenizer.get_tokens_as_string() == "auto,x,=,5,+,3,*,2,;,<EOF>"
+
+
+def test_fast_lexer_tokenizer_error_message():
+    tokenizer = Tokenizer('x = "Ring \\a bell";', backend="fast")
+    assert tokenizer.get_tokens_as_string() == "x,=,Illegal Escape In String: Ring \\a"
+
+
+def test_fast_lexer_parser_success():
+    source = """struct Point { int x; int y; };
+int add(int a, int b) { return a + b; }
+void main() { Point p = {1, 2}; auto s = add(p.x, -1); printInt(s); }"""
+    assert Parser(source, backend="fast").parse() == "success"
+
+
+def test_fast_lexer_parser_error_position():
+    source = "void main() { int x; x = 1 ** 2; }"
+    assert Parser(source, backend="fast").parse() == "Error on line 1 col 28: *"
+
+
+def test_fast_lexer_unknown_backend():
+    with pytest.raises(ValueError):
+        Tokenizer("x", backend="nope").get_tokens_as_string()
@@ -0,0 +1,140 @@
+"""
+Incremental AST builder test cases for TyC compiler.
+Covers reuse of unchanged declarations, shifted copies of moved ones,
+agreement with a full build and the fallback for errors and ambiguous
+splits.
+"""
+
+import pytest
+from tests.utils import Parser, assert_same_tree
+from src.astgen.direct_builder import build_ast
+from src.astgen.incremental_builder import IncrementalBuilder, measure_incremental_build
+from src.utils.node_memory import generate_source
+
+
+SOURCE = """struct P { int x; };
+int f(int a) {
+    return a + 1;
+}
+void main() { P p = {f(1)}; printInt(p.x); }
+"""
+
+
+def test_unchanged_source_reuses_every_declaration():
+    builder = IncrementalBuilder()
+    first = builder.build(SOURCE)
+    assert (builder.rebuilt, builder.reused) == (3, 0)
+    second = builder.build(SOURCE)
+    assert (builder.rebuilt, builder.reused) == (0, 3)
+    assert all(old is new for old, new in zip(first.decls, second.decls))
+    assert_same_tree(build_ast(SOURCE), second)
+
+
+def test_only_edited_declaration_is_rebuilt():
+    builder = IncrementalBuilder()
+    first = builder.build(SOURCE)
+    edited = SOURCE.replace("a + 1", "a * 2")
+    second = builder.build(edited)
+    assert (builder.rebuilt, builder.reused) == (1, 2)
+    assert second.decls[0] is first.decls[0] and second.decls[2] is first.decls[2]
+    assert second.decls[1] is not first.decls[1]
+    assert_same_tree(build_ast(edited), second)
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        lambda source: source.replace("int x; };", "int x;\n\n};"),  # lines added above
+        lambda source: source.replace("    return a + 1;\n", "return a + 1;"),  # lines removed above
+        lambda source: "// header\n\n" + source,
+        lambda source: source.replace("void main()", "void g() { }\nvoid main()"),
+    ],
+)
+def test_moved_declarations_get_shifted_positions(edit):
+    builder = IncrementalBuilder()
+    builder.build(SOURCE)
+    edited = edit(SOURCE)
+    assert_same_tree(build_ast(edited), builder.build(edited))
+    assert builder.reused >= 1
+    # Back again: the shifted nodes are shifted back
+    assert_same_tree(build_ast(SOURCE), builder.build(SOURCE))
+
+
+def test_moving_declarations_leaves_earlier_builds_unchanged():
+    source = "int f() { return 1; }\nint g() { return 2; }\n"
+    builder = IncrementalBuilder()
+    first = builder.build(source)
+    second = builder.build("\n\n" + source)
+    assert [decl.line for decl in first.decls] == [1, 2]
+    assert [decl.line for decl in second.decls] == [3, 4]
+    assert second.decls[1] is not first.decls[1]
+    assert builder.moved[second.decls[1]] is first.decls[1]
+    assert_same_tree(build_ast(source), first)
+
+
+def test_struct_types_are_shared_across_builds():
+    builder = IncrementalBuilder()
+    first = builder.build(SOURCE)
+    second = builder.build(SOURCE.replace("a + 1", "a * 2").replace("P p", "P q").replace("p.x", "q.x"))
+    point = first.decls[2].body.statements[0].var_type
+    assert second.decls[2] is not first.decls[2]
+    assert second.decls[2].body.statements[0].var_type is point
+
+
+def test_identical_declarations_are_not_shared():
+    source = "void f() { }\nvoid f() { }\n"
+    builder = IncrementalBuilder()
+    builder.build(source)
+    program = builder.build(source + "void f() { }\n")
+    assert (builder.rebuilt, builder.reused) == (1, 2)
+    assert len({id(decl) for decl in program.decls}) == 3
+    assert [decl.line for decl in program.decls] == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "int f(int x) if (x) return 1; else return 2;\nvoid main() { printInt(f(1)); }",
+        "void main() { printInt(1);\n",
+        "",
+        "  \n// nothing here\n",
+    ],
+)
+def test_falls_back_to_full_build(source):
+    builder = IncrementalBuilder()
+    builder.build(SOURCE)
+    try:
+        expected = build_ast(source)
+    except Exception as e:
+        with pytest.raises(type(e)) as error:
+            builder.build(source)
+        assert str(error.value) == str(e)
+    else:
+        assert Parser(source).parse() == "success"
+        assert_same_tree(expected, builder.build(source))
+
+
+def test_error_keeps_cached_declarations():
+    builder = IncrementalBuilder()
+    builder.build(SOURCE)
+    broken = SOURCE.replace("a + 1", "a +")
+    with pytest.raises(Exception) as error:
+        builder.build(broken)
+    assert str(error.value) == "Error on line 3 col 14: ;"
+    builder.build(SOURCE)
+    assert (builder.rebuilt, builder.reused) == (0, 3)
+    with pytest.raises(Exception):
+        builder.build("\n\n" + broken)
+    assert_same_tree(build_ast(SOURCE), builder.build(SOURCE))
+
+
+def test_rebuild_is_cheaper_than_full_build():
+    source = generate_source(1_000)
+    edited = source.replace("b * 2", "b * 3", 1)
+    builder = IncrementalBuilder()
+    builder.build(source)
+    assert_same_tree(build_ast(edited), builder.build(edited))
+    assert builder.rebuilt == 1
+    timings = measure_incremental_build(sizes=(200,), repeat=1)[200]
+    assert timings["edit"]["rebuilt"] == timings["insert"]["rebuilt"] == 1
+    assert timings["edit"]["seconds"] < timings["full"]
@@ -0,0 +1,164 @@
+"""
+Incremental type checker test cases for TyC compiler.
+Covers reuse of unchanged functions, invalidation through struct layouts,
+declared signatures and inferred return types, return types bound by
+callers, agreement with a full check and current positions in reused
+diagnostics.
+"""
+
+import pytest
+from tests.utils import Parser
+from src.astgen.incremental_builder import IncrementalBuilder
+from src.semantics.incremental_checker import IncrementalChecker, measure_incremental_check
+from src.semantics.parallel_checker import check_program, generate_checker_source
+
+SOURCE = """struct P {
+    int x;
+};
+int first(int a) {
+    return a + 1;
+}
+size() {
+    return 2;
+}
+twice(int a) {
+    auto n = size();
+    return a * n;
+}
+void show(P p) {
+    printInt(p.x);
+}
+void main() {
+    P p = {first(1)};
+    show(p);
+    printInt(twice(3));
+}
+"""
+
+
+def summary(result):
+    return (
+        [(d.line, d.column, str(d)) for d in result.diagnostics],
+        {name: str(t) for name, t in result.return_types.items()},
+    )
+
+
+class Session:
+    """An IncrementalBuilder and IncrementalChecker fed the same versions."""
+
+    def __init__(self):
+        self.builder = IncrementalBuilder()
+        self.checker = IncrementalChecker()
+
+    def check(self, source):
+        assert Parser(source).parse() == "success"
+        program = self.builder.build(source)
+        result = self.checker.check(program, self.builder.moved)
+        assert summary(result) == summary(check_program(program, workers=1))
+        return result
+
+    @property
+    def counts(self):
+        return self.checker.rechecked, self.checker.reused
+
+
+def test_unchanged_program_reuses_every_function():
+    session = Session()
+    result = session.check(SOURCE)
+    assert session.counts == (5, 0)
+    assert summary(result) == ([], {"size": "IntType()", "twice": "IntType()"})
+    session.check(SOURCE)
+    assert session.counts == (0, 5)
+
+
+@pytest.mark.parametrize(
+    "edit, rechecked",
+    [
+        (lambda source: source.replace("a + 1", "a * 2"), ["first"]),
+        # A declared return type keeps callers valid; printInt's signature is unchanged
+        (lambda source: source.replace("printInt(p.x)", "printInt(p.x + 1)"), ["show"]),
+        # An inferred return type that stays int keeps twice valid
+        (lambda source: source.replace("return 2;", "return 3;"), ["size"]),
+        (lambda source: source.replace("return 2;", "return 2.5;"), ["size", "twice", "main"]),
+        (lambda source: source.replace("int x;", "int x;\n    int y;"), ["show", "main"]),
+        (lambda source: source.replace("int first(int a)", "int first(float a)"), ["first", "main"]),
+        (lambda source: "// header\n\n" + source, []),
+    ],
+)
+def test_only_invalidated_functions_are_rechecked(edit, rechecked):
+    session = Session()
+    session.check(SOURCE)
+    session.check(edit(SOURCE))
+    assert session.counts == (len(rechecked), 5 - len(rechecked))
+
+
+def test_reused_diagnostics_follow_moved_functions():
+    broken = SOURCE.replace("return a * n;", "return a * n + \"s\";")
+    session = Session()
+    first = session.check(broken)
+    assert [str(d) for d in first.diagnostics] == [
+        "TypeMismatchInExpression(BinaryOp(BinaryOp(Identifier(a), *, Identifier(n)), +, StringLiteral('s')))"
+    ]
+    # main calls twice, which failed, so it is neither rechecked nor reused
+    assert session.counts == (4, 0)
+    moved = session.check("\n\n" + broken)
+    assert session.counts == (0, 4)
+    assert moved.diagnostics[0].line == first.diagnostics[0].line + 2
+    session.check(SOURCE)
+    assert session.counts == (2, 3)
+
+
+def test_declaring_a_called_function_rechecks_its_callers():
+    session = Session()
+    undeclared = "void main() {\n    helper(1);\n}\n"
+    result = session.check(undeclared)
+    assert [str(d) for d in result.diagnostics] == ["UndeclaredFunction(helper)"]
+    # main's node is reused, but the signature it looked up now exists
+    result = session.check(undeclared + "void helper(int a) {\n}\n")
+    assert result.diagnostics == [] and session.counts == (2, 0)
+    session.check(undeclared)
+    assert session.counts == (1, 0)
+
+
+def test_return_type_bound_by_a_caller():
+    session = Session()
+    source = "f() {\n    auto x;\n    return x;\n}\nint k() {\n    return 1;\n}\nvoid main() {\n    int y = f();\n}\n"
+    result = session.check(source)
+    assert summary(result) == ([], {"f": "IntType()"})
+    # f and main are checked together again; k is reused
+    session.check(source)
+    assert session.counts == (2, 1)
+    result = session.check(source.replace("int y = f();", "printInt(k());"))
+    assert [str(d) for d in result.diagnostics] == ["TypeCannotBeInferred(ReturnStmt(return Identifier(x)))"]
+
+
+def test_gaining_a_caller_rechecks_an_unbound_return_type():
+    session = Session()
+    source = "f3(int a) {\n    auto x;\n    return x;\n}\nint f6(int a) {\n    return 1;\n}\n"
+    result = session.check(source)
+    assert [str(d) for d in result.diagnostics] == ["TypeCannotBeInferred(ReturnStmt(return Identifier(x)))"]
+    edited = source.replace("    return 1;", "    auto x;\n    x = f3(a);\n    return x;")
+    result = session.check(edited)
+    assert summary(result) == ([], {"f3": "IntType()"})
+    assert session.counts == (2, 0)
+
+
+def test_signature_errors_keep_the_cache():
+    session = Session()
+    session.check(SOURCE)
+    result = session.check(SOURCE + "void show() { }\n")
+    assert [str(d) for d in result.diagnostics] == ["Redeclared(Function, show)"]
+    assert session.counts == (0, 0)
+    session.check(SOURCE)
+    assert session.counts == (0, 5)
+
+
+def test_incremental_check_is_cheaper_than_full_check():
+    session = Session()
+    source = generate_checker_source(100)
+    session.check(source)
+    session.check(source.replace("b * 2", "b * 3", 1))
+    assert session.counts == (1, 100)
+    timings = measure_incremental_check(sizes=(100,), repeat=1)[100]
+    assert timings["edit"]["rechecked"] == timings["insert"]["rechecked"] == 1
+    assert timings["edit"]["seconds"] < timings["full"]
@@ -0,0 +1,151 @@
+"""
+AST node test cases for TyC compiler.
+Covers the __slots__ layout of the node classes, shared type nodes,
+interned names and the memory benchmark.
+"""
+
+import copy
+import pickle
+
+import pytest
+from src.utils import nodes
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    FuncDecl,
+    StructDecl,
+    MemberDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    TypeTable,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    ReturnStmt,
+    BinaryOp,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    IntLiteral,
+    FloatLiteral,
+)
+from src.utils.node_memory import count_nodes, generate_program, measure_node_memory, node_fields
+
+
+NODE_CLASSES = [
+    value
+    for value in vars(nodes).values()
+    if isinstance(value, type) and issubclass(value, ASTNode)
+]
+
+
+@pytest.mark.parametrize("node_class", NODE_CLASSES, ids=lambda c: c.__name__)
+def test_node_class_declares_slots(node_class):
+    assert "__slots__" in node_class.__dict__
+    assert "__dict__" not in dir(node_class)
+
+
+def test_node_has_no_instance_dict():
+    node = BinaryOp(Identifier("x"), "+", IntLiteral(1))
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.extra = 1
+
+
+def test_node_fields_in_base_first_order():
+    assert node_fields(VarDecl) == ("line", "column", "var_type", "name", "init_value")
+    assert node_fields(IntLiteral) == ("line", "column", "value")
+    assert node_fields(IntType) == ("line", "column")
+
+
+def test_str_output_unchanged():
+    program = Program(
+        [
+            StructDecl("Point", [MemberDecl(IntType(), "x"), MemberDecl(IntType(), "y")]),
+            FuncDecl(
+                None,
+                "f",
+                [Param(StructType("Point"), "p")],
+                BlockStmt(
+                    [
+                        VarDecl(None, "a", FloatLiteral(1.5)),
+                        IfStmt(Identifier("a"), ReturnStmt(IntLiteral(1))),
+                        ReturnStmt(),
+                    ]
+                ),
+            ),
+        ]
+    )
+    assert str(program) == (
+        "Program([StructDecl(Point, [MemberDecl(IntType(), x), MemberDecl(IntType(), y)]), "
+        "FuncDecl(auto, f, [Param(StructType(Point), p)], BlockStmt([VarDecl(auto, a = FloatLiteral(1.5)), "
+        "IfStmt(if Identifier(a) then ReturnStmt(return IntLiteral(1))), ReturnStmt(return)]))])"
+    )
+
+
+def test_line_and_column_default_to_none():
+    node = Identifier("x")
+    assert (node.line, node.column) == (None, None)
+
+
+@pytest.mark.parametrize("type_class", [IntType, FloatType, StringType, VoidType])
+def test_primitive_types_are_singletons(type_class):
+    assert type_class() is type_class()
+    assert copy.deepcopy(type_class()) is type_class()
+    assert pickle.loads(pickle.dumps(type_class())) is type_class()
+
+
+def test_primitive_types_are_distinct():
+    types = [IntType(), FloatType(), StringType(), VoidType()]
+    assert len({id(t) for t in types}) == 4
+
+
+@pytest.mark.parametrize("type_class", [IntType, FloatType, StringType, VoidType])
+def test_primitive_types_take_no_position(type_class):
+    shared = type_class()
+    with pytest.raises(AttributeError):
+        shared.line = 3
+    with pytest.raises(AttributeError):
+        shared.column = 0
+    assert type_class().line is None and type_class().column is None
+
+
+def test_struct_types_compare_by_name():
+    point = StructType("Point")
+    assert StructType("Point") == point and hash(StructType("Point")) == hash(point)
+    assert StructType(struct_name="Point") == point
+    assert StructType("Line") != point and point != IntType()
+    assert pickle.loads(pickle.dumps(point)) == point
+    assert str(StructType("Point")) == "StructType(Point)"
+
+
+def test_type_table_shares_struct_types():
+    table = TypeTable()
+    point = table.struct_type("Point")
+    assert table.struct_type("Point") is point
+    assert table.struct_type("Line") is not point
+    assert TypeTable().struct_type("Point") is not point
+
+
+def test_names_are_interned():
+    name = "".join(["cou", "nter"])
+    assert Identifier(name).name is Identifier("counter").name
+    assert VarDecl(None, name).name is Param(IntType(), "counter").name
+    assert FuncCall(name, []).name is FuncDecl(None, "counter", [], BlockStmt([])).name
+    assert MemberAccess(Identifier("p"), name).member is MemberDecl(IntType(), "counter").name
+    assert StructType(name).struct_name is StructDecl("counter", []).name
+
+
+def test_generated_program_size():
+    program = generate_program(1000)
+    assert len(program.decls) == 100
+    assert count_nodes(program) == 6901
+
+
+def test_slots_use_less_memory_than_dict():
+    result = measure_node_memory(2000)
+    assert result["slots"] < result["dict"]
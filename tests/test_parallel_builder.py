@@ -0,0 +1,110 @@
+"""
+Parallel AST builder test cases for TyC compiler.
+Covers the declaration pre-scan, absolute positions of stitched chunks,
+reuse of a process pool and the sequential fallback for ambiguous splits
+and errors.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from tests.utils import Parser, assert_same_tree
+from src.astgen.direct_builder import build_ast
+from src.astgen.parallel_builder import build_ast_parallel, measure_parallel_build, split_chunks, split_declarations
+from src.utils.node_memory import generate_expression_source, generate_source
+
+
+def parallel(source, **kwargs):
+    return build_ast_parallel(source, workers=2, min_chunk_chars=1, **kwargs)
+
+
+def test_split_declarations_skips_comments_and_strings():
+    source = (
+        'struct P { int x; };\n'
+        'void f() { printString("}{;"); /* } */ }  // {\n'
+        'g() return 1;\n'
+        '  int h() { { } return 2; }'
+    )
+    starts = split_declarations(source)
+    assert [source[start:].split(maxsplit=1)[0] for start in starts if source[start:].strip()] == [
+        "struct",
+        "void",
+        "//",  # the comment after f goes with g
+        "int",
+    ]
+
+
+@pytest.mark.parametrize("source", ["void f() { ", "void f() { } }", "int f() { return 1; } {"])
+def test_unbalanced_braces_are_ambiguous(source):
+    assert split_declarations(source) is None
+
+
+def test_chunks_keep_absolute_positions():
+    source = "void f() {\n}\n  void g() {}  void h() {\n\tprintInt(1);\n}"
+    starts = split_declarations(source)
+    assert starts == [0, 12, 26, len(source)]
+    assert split_chunks(source, starts, 3) == [
+        "void f() {\n}\n  void g() {}",
+        "\n\n" + " " * 13 + "  void h() {\n\tprintInt(1);\n}",
+    ]
+    assert_same_tree(build_ast(source), parallel(source))
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        generate_source(200),
+        generate_expression_source(200),
+        'struct P { int x; };\nP make() { P p = {1}; return p; }\r\nvoid main() { printString("};"); }\n',
+    ],
+)
+def test_parallel_build_matches_sequential(source):
+    assert_same_tree(build_ast(source), parallel(source))
+
+
+def test_parallel_build_reuses_executor():
+    source = generate_source(100)
+    with ProcessPoolExecutor(2) as executor:
+        for _ in range(2):
+            assert_same_tree(build_ast(source), parallel(source, executor=executor))
+
+
+def test_names_are_interned_after_stitching():
+    program = parallel(generate_source(100))
+    first, last = program.decls[0], program.decls[-1]
+    assert first.body.statements[0].var_type is last.body.statements[0].var_type
+    assert first.params[0].name is last.params[0].name
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        # The `;` at depth 0 splits a one-statement body: the second chunk does not parse
+        "int f(int x) if (x) return 1; else return 2;\nvoid main() { printInt(f(1)); }",
+        "void main() { printInt(1); }\nint f() { return 1 }\nvoid g() { }",
+        'void main() { printInt(1); }\nvoid g() { string s = "abc\n }',
+        "void main() { printInt(1); }\nvoid g() { int x = 1 @ 2; }",
+        "void main() { s.f(1); }\nvoid g() { }",
+    ],
+)
+def test_falls_back_to_sequential_build(source):
+    try:
+        expected = build_ast(source)
+    except Exception as e:
+        with pytest.raises(type(e)) as error:
+            parallel(source)
+        assert str(error.value) == str(e)
+        return
+    assert Parser(source).parse() == "success"
+    assert_same_tree(expected, parallel(source))
+
+
+def test_small_sources_are_built_sequentially():
+    source = "void main() { }\nvoid g() { }"
+    assert split_declarations(source) == [0, 15, len(source)]
+    assert_same_tree(build_ast(source), build_ast_parallel(source, workers=2))
+
+
+def test_parallel_benchmark_reports_both_builds():
+    result = measure_parallel_build(lines=100, workers=2, repeat=1)
+    assert result["sequential"] > 0 and result["parallel"] > 0
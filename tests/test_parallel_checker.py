@@ -0,0 +1,122 @@
+"""
+Parallel type checker test cases for TyC compiler.
+Covers agreement with sequential type inference, return types bound by
+callers, per-function diagnostics in source order, skipping callers of
+failed functions, reuse of a process pool and the benchmark.
+"""
+
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from src.astgen.direct_builder import build_ast
+from src.semantics.parallel_checker import check_program, generate_checker_source, measure_parallel_check
+from src.semantics.static_error import StaticError
+from src.semantics.type_inference import infer_types
+from src.utils.diagnostics import SEMANTIC
+from src.utils.nodes import FuncDecl
+
+BROKEN = """struct P { int x; };
+int f() { return 1.5; }
+g() { return f() + 1; }
+h() { return g(); }
+int k(int a) { auto x; return a; }
+p() { return q(); }
+q() { return 2.5; }
+r() { auto y = s(); return y % 2; }
+s() { return "s"; }
+void t() { P v = {r()}; }
+void main() { printInt(z); h(); }
+"""
+
+
+def summary(result):
+    return [(d.kind, d.line, d.column, d.text) for d in result.diagnostics]
+
+
+def outcome(result):
+    return summary(result), {name: str(t) for name, t in result.return_types.items()}
+
+
+def parallel(program, **kwargs):
+    return check_program(program, workers=2, min_parallel_functions=1, **kwargs)
+
+
+@pytest.mark.parametrize("functions", [1, 9, 60])
+def test_parallel_check_matches_sequential_inference(functions):
+    program = build_ast(generate_checker_source(functions))
+    types = infer_types(program)
+    expected = {decl.name: types[decl] for decl in program.decls if type(decl) is FuncDecl and decl in types}
+    for result in (check_program(program, workers=1), parallel(program)):
+        assert result.diagnostics == []
+        assert result.return_types == expected
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "f() { auto x; return x; }\nvoid main() { int y = f(); }",
+        "f() { auto x; return x; }\ng() { return f(); }\nvoid main() { int y = g(); }",
+        "f() { auto x; return x; }\nvoid main() { int y = f(); float z = f(); }",
+        "f() { auto x; return x; }\nvoid main() { auto y = f(); }",
+    ],
+)
+def test_return_type_bound_by_a_caller_agrees_with_inference(source):
+    program = build_ast(source)
+    try:
+        types = infer_types(program)
+    except StaticError as e:
+        expected = ([str(e)], {})
+    else:
+        expected = ([], {decl.name: types[decl] for decl in program.decls if decl in types})
+    for result in (check_program(program, workers=1), parallel(program)):
+        assert ([str(d) for d in result.diagnostics], result.return_types) == expected
+
+
+def test_one_diagnostic_per_failed_function_in_source_order():
+    program = build_ast(BROKEN)
+    expected = [
+        (SEMANTIC, 2, 10, "TypeMismatchInStatement"),
+        (SEMANTIC, 5, 15, "TypeCannotBeInferred"),
+        (SEMANTIC, 8, 27, "TypeMismatchInExpression"),
+        (SEMANTIC, 11, 0, "UndeclaredIdentifier"),
+    ]
+    sequential = check_program(program, workers=1)
+    assert summary(sequential) == summary(parallel(program)) == expected
+    assert str(sequential.diagnostics[2]) == "TypeMismatchInExpression(BinaryOp(Identifier(y), %, IntLiteral(2)))"
+    # f's return type is declared, so g and h are still checked; t calls r, which failed
+    assert {name: str(t) for name, t in sequential.return_types.items()} == {
+        "g": "IntType()",
+        "h": "IntType()",
+        "p": "FloatType()",
+        "q": "FloatType()",
+        "s": "StringType()",
+    }
+
+
+def test_callers_of_failed_functions_are_skipped():
+    source = "f() { return 1 + \"a\"; }\ng() { return f(); }\nint h() { return g() + 1; }\nvoid main() { h(); }"
+    result = parallel(build_ast(source))
+    assert summary(result) == [(SEMANTIC, 1, 13, "TypeMismatchInExpression")]
+    assert result.return_types == {}
+
+
+def test_signature_errors_are_reported_alone():
+    result = parallel(build_ast("void f() { }\nint f() { return 1; }\nvoid main() { printInt(x); }"))
+    assert [str(d) for d in result.diagnostics] == ["Redeclared(Function, f)"]
+
+
+def test_parallel_check_reuses_executor(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    programs = [build_ast(BROKEN), build_ast(generate_checker_source(30, chains=3))]
+    expected = [outcome(check_program(program, workers=1)) for program in programs]
+    with ProcessPoolExecutor(2) as executor:
+        # Workers that loaded one program's functions must not check another's with them
+        for _ in range(2):
+            assert [outcome(parallel(program, executor=executor)) for program in programs] == expected
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parallel_benchmark_reports_both_checks():
+    result = measure_parallel_check(functions=40, workers=2, repeat=1)
+    assert result["sequential"] > 0 and result["parallel"] > 0
@@ -0,0 +1,90 @@
+"""
+Parser profiling test cases for TyC compiler.
+Covers the per-decision and per-rule statistics of a profiled parse and
+the report.
+"""
+
+import pytest
+from tests.utils import Parser
+from src.utils.parser_profile import profile_parse
+
+
+SOURCE = """int f(int a) {
+    int x = a + 1;
+    if (x > 1) x = x - 1; else x = 0;
+    while (x > 0) { x = x - 1; }
+    return x;
+}
+void main() { printInt(f(3)); }
+"""
+
+
+def test_decisions_record_invocations_and_lookahead():
+    profile = profile_parse(SOURCE)
+    assert profile.tokens > 0 and profile.seconds > 0
+    assert profile.decisions
+    for decision in profile.decisions:
+        assert decision.invocations > 0
+        assert 1 <= decision.sll_max_lookahead <= profile.tokens
+        assert decision.sll_lookahead <= decision.invocations * decision.sll_max_lookahead
+        assert decision.ll_fallbacks <= decision.invocations
+        assert (decision.ll_max_lookahead > 0) == (decision.ll_fallbacks > 0)
+    times = [decision.time_ns for decision in profile.decisions]
+    assert times == sorted(times, reverse=True)
+
+
+def test_full_context_fallbacks_are_counted():
+    # The else branch conflicts in SLL: only the full context tells whether it binds here
+    profile = profile_parse(SOURCE)
+    if_decisions = [decision for decision in profile.decisions if decision.rule == "ifStmt"]
+    assert sum(decision.ll_fallbacks for decision in if_decisions) >= 1
+    assert sum(decision.ll_fallbacks for decision in profile.decisions) >= 1
+
+
+def test_block_lookahead_does_not_grow_with_the_body():
+    # A block is told from a struct literal by its first statement, not its closing brace
+    def block_lookahead(statements, head, tail):
+        body = "".join(f"    x = x + {i};\n    if (x > {i}) {{ x = x - 1; }}\n" for i in range(statements))
+        profile = profile_parse(f"{head}\n{body}{tail}\nvoid main() {{ }}")
+        return {
+            decision.decision: (decision.ll_fallbacks, decision.sll_max_lookahead)
+            for decision in profile.decisions
+            if "lock" in decision.rule
+        }
+
+    for head, tail in [
+        ("int f(int x) {", "    return x;\n}"),
+        ("f(int x) {", "}"),
+        ("void f(int x) {", "    return;\n}"),
+        ("int f(int x) { while (x) {", "    return x;\n} return x; }"),
+    ]:
+        short, long = block_lookahead(2, head, tail), block_lookahead(40, head, tail)
+        assert short and short == long
+        assert all(fallbacks == 0 for fallbacks, _ in long.values())
+
+
+def test_rules_record_invocations_and_time():
+    profile = profile_parse(SOURCE)
+    rules = {rule.rule: rule for rule in profile.rules}
+    assert rules["program"].invocations == 1
+    assert rules["ifStmt"].invocations == 1
+    assert rules["whileStmt"].invocations == 1
+    for rule in profile.rules:
+        assert rule.time_ns >= rule.self_time_ns >= 0
+    # Nested rules are included in the program's time
+    assert rules["program"].time_ns >= max(rule.time_ns for rule in profile.rules)
+    assert sum(rule.prediction_ns for rule in profile.rules) == sum(d.time_ns for d in profile.decisions)
+
+
+def test_report_lists_top_rows():
+    report = profile_parse(SOURCE).format(top=3)
+    assert "Decisions by prediction time:" in report and "Rules by self time:" in report
+    decision_rows = report.split("Decisions by prediction time:")[1].split("Rules by self time:")[0]
+    assert len(decision_rows.strip().splitlines()) == 1 + 3
+
+
+def test_syntax_errors_are_raised():
+    source = "void main() { printInt(1) }"
+    with pytest.raises(Exception) as error:
+        profile_parse(source)
+    assert str(error.value) == Parser(source).parse()
@@ -0,0 +1,103 @@
+"""
+Parse mode test cases for TyC compiler.
+Covers the two-stage (SLL first, LL fallback) and plain LL parse entry points
+and the per-thread lexer/parser pool.
+"""
+
+import threading
+
+import pytest
+from tests.utils import Parser
+from src.utils.parsing import POOL, parse_program, parse_source, parse_file, SLL, LL
+from src.utils.error_listener import SyntaxException
+
+
+VALID_SOURCE = """struct Point { int x; int y; };
+int add(int a, int b) { return a + b; }
+sum(int n) { auto s = 0; for (auto i = 0; i < n; ++i) s = s + i; return s; }
+void main() { Point p = {1, 2}; printInt(add(p.x, sum(10))); }"""
+
+
+def test_two_stage_valid_program_takes_sll_path():
+    result = parse_source(VALID_SOURCE, mode="two-stage")
+    assert result.prediction == SLL
+    assert result.tree.getChildCount() == 5  # four declarations and EOF
+
+
+def test_ll_mode_reports_ll_path():
+    result = parse_source(VALID_SOURCE, mode="ll")
+    assert result.prediction == LL
+
+
+def test_two_stage_and_ll_build_same_tree():
+    sll_tree = parse_source(VALID_SOURCE, mode="two-stage").tree
+    ll_tree = parse_source(VALID_SOURCE, mode="ll").tree
+    assert sll_tree.toStringTree() == ll_tree.toStringTree()
+
+
+def test_two_stage_syntax_error_reported_by_ll_stage():
+    with pytest.raises(SyntaxException) as e:
+        parse_source("int f() { int x; x = 1; }", mode="two-stage")
+    assert e.value.message == "Error on line 1 col 24: }"
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "int f(int a int b) { return a+b; }",
+        "void f() { return 1; }",
+        "void main() { for (auto i=0 i<10 ++i) printInt(i); }",
+        "struct P{int x; int y;}",
+    ],
+)
+def test_two_stage_errors_match_ll_mode(source):
+    assert Parser(source, mode="two-stage").parse() == Parser(source, mode="ll").parse()
+
+
+def test_parser_wrapper_records_prediction():
+    parser = Parser("void main() { auto x = 5; }")
+    assert parser.parse() == "success"
+    assert parser.prediction == SLL
+
+
+def test_parse_file_reports_path(tmp_path):
+    source_file = tmp_path / "main.tyc"
+    source_file.write_text(VALID_SOURCE)
+    assert parse_file(str(source_file)).prediction == SLL
+
+
+def test_unknown_parse_mode():
+    with pytest.raises(ValueError):
+        parse_source("", mode="lr")
+
+
+def test_pool_reuses_parser_within_thread():
+    first = POOL.parser("void main() {}")
+    second = POOL.parser("void f() {}")
+    assert first is second
+    assert POOL.lexer("x", "fast") is POOL.lexer("y", "fast")
+
+
+def test_pool_parser_state_is_reset_between_sources():
+    assert Parser("void main() { int x }").parse() == "Error on line 1 col 20: }"
+    assert Parser("void main() { int x; }").parse() == "success"
+    assert Parser("int f() { return 1; }\nvoid g() { h( }").parse() == "Error on line 2 col 14: }"
+
+
+def test_pool_gives_each_thread_its_own_parser():
+    parsers = {}
+
+    def parse_in_thread(name):
+        parser = POOL.parser("void main() { printInt(1); }")
+        parsers[name] = parser
+        results[name] = parse_program(parser).prediction
+
+    results = {}
+    threads = [threading.Thread(target=parse_in_thread, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {i: SLL for i in range(4)}
+    assert len({id(parser) for parser in parsers.values()}) == 4
+    assert POOL.parser("void main() {}") not in parsers.values()
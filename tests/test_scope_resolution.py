@@ -0,0 +1,112 @@
+"""
+Scope resolution test cases for TyC compiler.
+Covers frame slots of parameters, variables and identifiers, shadowing,
+slot reuse across sibling blocks, frame sizes and the scope errors.
+"""
+
+import pytest
+from tests.utils import Parser
+from src.astgen.direct_builder import build_ast
+from src.semantics.scope_resolution import generate_scope_source, measure_scope_resolution, resolve_scopes
+from src.semantics.static_error import Redeclared, UndeclaredIdentifier
+from src.utils.nodes import Identifier, Param, VarDecl
+from src.utils.walker import walk
+
+
+def slot_table(source):
+    """(kind, name, slot) of every Param, VarDecl and Identifier in source order, and the frame sizes by function."""
+    program = build_ast(source)
+    resolver = resolve_scopes(program)
+    names = {Param: "param", VarDecl: "var", Identifier: "use"}
+    table = [
+        (names[type(node)], node.name, resolver.slots[node])
+        for node in walk(program)
+        if type(node) in names
+    ]
+    return table, {decl.name: size for decl, size in resolver.frame_sizes.items()}
+
+
+def test_parameters_and_variables_get_consecutive_slots():
+    table, sizes = slot_table("int f(int a, float b) { int c = a; auto d; d = b; return c; }")
+    assert table == [
+        ("param", "a", 0),
+        ("param", "b", 1),
+        ("var", "c", 2),
+        ("use", "a", 0),
+        ("var", "d", 3),
+        ("use", "d", 3),
+        ("use", "b", 1),
+        ("use", "c", 2),
+    ]
+    assert sizes == {"f": 4}
+
+
+def test_shadowing_and_sibling_blocks():
+    source = """void main() {
+        int x = 1;
+        { int x = x; printInt(x); { int y; y = x; } }
+        { float z; int w; printInt(x); }
+        printInt(x);
+    }"""
+    table, sizes = slot_table(source)
+    assert table == [
+        ("var", "x", 0),
+        ("var", "x", 1),
+        ("use", "x", 0),  # the initializer reads the outer x
+        ("use", "x", 1),
+        ("var", "y", 2),
+        ("use", "y", 2),
+        ("use", "x", 1),
+        ("var", "z", 1),  # the sibling block reuses the freed slots
+        ("var", "w", 2),
+        ("use", "x", 0),
+        ("use", "x", 0),
+    ]
+    assert sizes == {"main": 3}
+
+
+def test_for_opens_a_scope():
+    source = """void main() {
+        int n = 3;
+        for (int i = 0; i < n; ++i) { int j = i; }
+        switch (n) { default: n = 1; case 1: printInt(n); }
+        int i = 5;
+    }"""
+    table, sizes = slot_table(source)
+    slots = [(kind, name, slot) for kind, name, slot in table if kind == "var"]
+    assert slots == [("var", "n", 0), ("var", "i", 1), ("var", "j", 2), ("var", "i", 1)]
+    assert sizes == {"main": 3}
+
+
+def test_frames_are_per_function():
+    table, sizes = slot_table("void f(int a) { int b; }\nvoid g() { int c; { int d; } }\nvoid main() {}")
+    assert [slot for _, _, slot in table] == [0, 1, 0, 1]
+    assert sizes == {"f": 2, "g": 2, "main": 0}
+
+
+@pytest.mark.parametrize(
+    "source, error, message",
+    [
+        ("void main() { printInt(x); }", UndeclaredIdentifier, "UndeclaredIdentifier(x)"),
+        ("void main() { { int x; } x = 1; }", UndeclaredIdentifier, "UndeclaredIdentifier(x)"),
+        ("void main() { for (int i = 0; i < 1; ++i) {} i = 1; }", UndeclaredIdentifier, "UndeclaredIdentifier(i)"),
+        ("void main() { int x = x; }", UndeclaredIdentifier, "UndeclaredIdentifier(x)"),
+        ("void f(int a, int a) {}", Redeclared, "Redeclared(Parameter, a)"),
+        ("void f(int a) { float a; }", Redeclared, "Redeclared(Variable, a)"),
+        ("void main() { { int x; int x; } }", Redeclared, "Redeclared(Variable, x)"),
+    ],
+)
+def test_scope_errors(source, error, message):
+    assert Parser(source).parse() == "success"
+    with pytest.raises(error) as raised:
+        resolve_scopes(build_ast(source))
+    assert str(raised.value) == message
+
+
+def test_lookup_benchmark():
+    table, sizes = slot_table(generate_scope_source(8, 20))
+    assert sizes == {"main": 9}
+    assert {slot for kind, name, slot in table if name == "v0"} == {0}
+    result = measure_scope_resolution(depths=(2, 8), uses=50, passes=1)
+    assert sorted(result) == [2, 8]
+    assert set(result[8]) == {"resolution", "slots", "names"}
@@ -0,0 +1,213 @@
+"""
+Type inference test cases for TyC compiler.
+Covers the spec's auto declaration and expression typing rules, inferred
+return types, deferred classes typed by a later usage, the static errors
+and the linear-time benchmark.
+"""
+
+import pytest
+from tests.utils import Parser
+from src.astgen.direct_builder import build_ast
+from src.semantics.static_error import (
+    Redeclared,
+    TypeCannotBeInferred,
+    TypeMismatchInExpression,
+    TypeMismatchInStatement,
+    UndeclaredFunction,
+    UndeclaredIdentifier,
+    UndeclaredStruct,
+)
+from src.semantics.type_inference import generate_auto_source, infer_types, measure_type_inference
+from src.utils.nodes import FloatType, FuncDecl, IntType, StringType, StructType, VarDecl, VoidType
+
+
+def declared(source):
+    """Types of the auto variables and inferred functions of source, by name."""
+    types = infer_types(build_ast(source))
+    return {node.name: str(node_type) for node, node_type in types.items() if type(node) in (VarDecl, FuncDecl)}
+
+
+def main(body):
+    return "void main() {\n" + body + "\n}\n"
+
+
+def test_rule_2_2_first_usage():
+    source = main(
+        """
+        auto a; a = 10;
+        auto b; b = 3.14;
+        auto c; c = a + b;
+        auto x; x = readInt();
+        auto y; printInt(y);
+        auto z; z = readInt(); printInt(z);
+        """
+    )
+    assert declared(source) == {
+        "a": "IntType()",
+        "b": "FloatType()",
+        "c": "FloatType()",
+        "x": "IntType()",
+        "y": "IntType()",
+        "z": "IntType()",
+    }
+
+
+def test_rule_3_expressions():
+    source = main(
+        """
+        auto x = 10; auto y = 20; auto f = 3.14;
+        auto z = x + y; auto mixed = x + f; auto flag = x < y;
+        auto result = flag && 1; auto msg = "hello";
+        auto e4 = 10 % 3; auto e7 = ++x; auto neg = -f;
+        """
+    )
+    types = declared(source)
+    assert types["z"] == types["flag"] == types["result"] == types["e4"] == types["e7"] == "IntType()"
+    assert types["mixed"] == types["neg"] == "FloatType()"
+    assert types["msg"] == "StringType()"
+
+
+@pytest.mark.parametrize(
+    "usage, expected",
+    [
+        ("a % 2;", IntType()),
+        ("a + 1.5;", FloatType()),
+        ("if (a) {}", IntType()),
+        ("a++;", IntType()),
+        ("printString(a);", StringType()),
+        ("return;", None),
+    ],
+)
+def test_usage_contexts(usage, expected):
+    source = main("auto a;\n" + usage + "\na = a;")
+    if expected is None:
+        with pytest.raises(TypeCannotBeInferred):
+            infer_types(build_ast(source))
+        return
+    types = infer_types(build_ast(source))
+    assert {node_type for node, node_type in types.items() if type(node) is VarDecl} == {expected}
+
+
+def test_deferred_union_is_typed_by_a_later_usage():
+    source = main("auto p; auto q; auto r;\np = q;\nr = p;\nq = 2.5;\nprintFloat(r);")
+    assert set(declared(source).values()) == {"FloatType()"}
+
+
+def test_identifiers_and_calls_are_typed():
+    program = build_ast(main("auto s; s = readString(); printString(s);"))
+    types = infer_types(program)
+    assert [str(types[node]) for node in types if type(node).__name__ == "Identifier"] == ["StringType()"] * 2
+    assert {str(types[node]) for node in types if type(node).__name__ == "FuncCall"} == {
+        "StringType()",
+        "VoidType()",
+    }
+
+
+def test_inferred_return_types():
+    source = """
+    fact(int n) { if (n <= 1) return 1; return n * fact(n - 1); }
+    half(float x) { auto y; y = x / 2; return y; }
+    log(string s) { printString(s); }
+    twice() { return id(2); }
+    id(int x) { return x; }
+    void main() { auto r = fact(5); auto h = half(3.0); log("x"); auto t = twice(); }
+    """
+    types = declared(source)
+    assert types["fact"] == types["r"] == types["twice"] == types["t"] == "IntType()"
+    assert types["half"] == types["h"] == "FloatType()"
+    assert types["log"] == str(VoidType())
+
+
+def test_return_type_from_a_later_caller():
+    # f's return type only meets a type when main uses it
+    source = "f() { auto x; return x; }\nvoid main() { int y = f(); }"
+    assert declared(source) == {"x": "IntType()", "f": "IntType()"}
+
+
+def test_structs():
+    source = """
+    struct Point { int x; float y; };
+    struct Line { Point a; Point b; };
+    Point make(int x) { return {x, 1.0}; }
+    void main() {
+        auto p = make(1);
+        Line l = {{1, 2.0}, p};
+        auto q; q = l.b;
+        auto n; n = q.y;
+        p = {2, 3.5};
+    }
+    """
+    types = declared(source)
+    assert types["p"] == types["q"] == str(StructType("Point"))
+    assert types["n"] == "FloatType()"
+
+
+def test_scopes_and_shadowing():
+    source = main("auto a = 1;\n{ auto a; a = 1.5; }\nfor (auto i = 0; i < 3; ++i) { auto a = \"s\"; }\nprintInt(a);")
+    program = build_ast(source)
+    types = infer_types(program)
+    assert [str(t) for node, t in types.items() if type(node) is VarDecl] == [
+        "IntType()",
+        "FloatType()",
+        "IntType()",
+        "StringType()",
+    ]
+
+
+@pytest.mark.parametrize(
+    "source, error, message",
+    [
+        (main("auto x;"), TypeCannotBeInferred, "TypeCannotBeInferred(VarDecl(auto, x))"),
+        (main("auto a; auto b;\na = b;"), TypeCannotBeInferred, "TypeCannotBeInferred(ExprStmt(AssignExpr(Identifier(a) = Identifier(b))))"),
+        (main("auto a; auto b;\nauto c = a + b;"), TypeCannotBeInferred, None),
+        (main("auto p = {1, 2};"), TypeCannotBeInferred, None),
+        ("f() { return f(); }\nvoid main() {}", TypeCannotBeInferred, "TypeCannotBeInferred(ReturnStmt(return FuncCall(f, [])))"),
+        (main("int x = 1.5;"), TypeMismatchInStatement, None),
+        (main("auto x = printInt(1);"), TypeMismatchInStatement, None),
+        (main("if (1.5) printInt(1);"), TypeMismatchInStatement, None),
+        (main('while ("s") {}'), TypeMismatchInStatement, None),
+        (main("switch (1) { case 1.0: break; }"), TypeMismatchInStatement, None),
+        ("f() { return 1; return 1.5; }\nvoid main() {}", TypeMismatchInStatement, None),
+        ("f() { return printInt(1); }\nvoid main() {}", TypeMismatchInStatement, None),
+        ("f() { return g(); }\ng() { }\nvoid main() {}", TypeMismatchInStatement, "TypeMismatchInStatement(ReturnStmt(return FuncCall(g, [])))"),
+        (main('auto a; a = 1; a = "s";'), TypeMismatchInExpression, None),
+        (main('auto s = "a" + "b";'), TypeMismatchInExpression, None),
+        (main("auto f = 1.5; f++;"), TypeMismatchInExpression, None),
+        (main("auto f = 1.5 % 2;"), TypeMismatchInExpression, None),
+        (main("printInt(1, 2);"), TypeMismatchInExpression, None),
+        (main("auto a; printInt(a); printFloat(a);"), TypeMismatchInExpression, None),
+        ("struct P { int x; };\nvoid main() { P p = {1}; auto y = p.z; }", TypeMismatchInExpression, None),
+        (main("auto x; x = y;"), UndeclaredIdentifier, "UndeclaredIdentifier(y)"),
+        (main("auto x = g();"), UndeclaredFunction, "UndeclaredFunction(g)"),
+        (main("Q q;"), UndeclaredStruct, "UndeclaredStruct(Q)"),
+        (main("int a; auto a = 1;"), Redeclared, "Redeclared(Variable, a)"),
+        ("void f(int a, float a) {}\nvoid main() {}", Redeclared, "Redeclared(Parameter, a)"),
+        ("void f(int a) { auto a; }\nvoid main() {}", Redeclared, "Redeclared(Variable, a)"),
+        ("void main() {}\nvoid main() {}", Redeclared, "Redeclared(Function, main)"),
+        ("void printInt(int x) {}", Redeclared, "Redeclared(Function, printInt)"),
+    ],
+)
+def test_static_errors(source, error, message):
+    assert Parser(source).parse() == "success"
+    with pytest.raises(error) as raised:
+        infer_types(build_ast(source))
+    if message is not None:
+        assert str(raised.value) == message
+
+
+def test_first_error_is_reported():
+    source = main("auto a;\nauto b;\nb = a;\nprintInt(c);")
+    with pytest.raises(UndeclaredIdentifier):
+        infer_types(build_ast(source))
+    # Unresolved classes are reported at the earliest statement that left them so
+    source = main("auto a;\nauto b;\nauto c;\nb = c;\na = b;")
+    with pytest.raises(TypeCannotBeInferred) as raised:
+        infer_types(build_ast(source))
+    assert "Identifier(b) = Identifier(c)" in str(raised.value)
+
+
+def test_assignment_chain_benchmark():
+    program = build_ast(generate_auto_source(500))
+    types = infer_types(program)
+    assert {node_type for node, node_type in types.items() if type(node) is VarDecl} == {IntType()}
+    assert sorted(measure_type_inference((50, 200))) == [50, 200]
@@ -0,0 +1,208 @@
+"""
+Visitor dispatch test cases for TyC compiler.
+Covers TableVisitor against the accept()-based BaseVisitor.
+"""
+
+from src.utils.node_memory import generate_program
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    StructDecl,
+    MemberDecl,
+    FuncDecl,
+    Param,
+    IntType,
+    FloatType,
+    StringType,
+    VoidType,
+    StructType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    SwitchStmt,
+    CaseStmt,
+    DefaultStmt,
+    BreakStmt,
+    ContinueStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    PrefixOp,
+    PostfixOp,
+    AssignExpr,
+    MemberAccess,
+    FuncCall,
+    Identifier,
+    StructLiteral,
+    IntLiteral,
+    FloatLiteral,
+    StringLiteral,
+)
+from src.utils.visitor import VISIT_METHODS, BaseVisitor, TableVisitor
+from src.utils.visitor_benchmark import measure_dispatch
+
+
+class RecordingVisitor(BaseVisitor):
+    """Records the class of every visited node, in visit order."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def visit(self, node, o=None):
+        self.log.append(type(node).__name__)
+        return super().visit(node, o)
+
+
+class TableRecordingVisitor(TableVisitor):
+    """Same as RecordingVisitor, through the dispatch table."""
+
+    def __init__(self, log):
+        self.log = log
+
+
+def _recording_methods():
+    # Wrap every visit_* method so TableRecordingVisitor logs the node before traversing it
+    def wrap(name):
+        default = getattr(TableVisitor, name)
+
+        def method(self, node, o=None):
+            self.log.append(type(node).__name__)
+            return default(self, node, o)
+
+        return method
+
+    for name in VISIT_METHODS.values():
+        setattr(TableRecordingVisitor, name, wrap(name))
+
+
+_recording_methods()
+
+
+def every_node_program():
+    body = BlockStmt(
+        [
+            VarDecl(None, "a", IntLiteral(1)),
+            VarDecl(StructType("P"), "p", StructLiteral([FloatLiteral(1.5), StringLiteral("s")])),
+            IfStmt(Identifier("a"), BreakStmt(), ContinueStmt()),
+            WhileStmt(Identifier("a"), ExprStmt(PostfixOp("++", Identifier("a")))),
+            ForStmt(VarDecl(IntType(), "i", IntLiteral(0)), Identifier("i"), PrefixOp("++", Identifier("i")), BlockStmt([])),
+            ForStmt(None, None, None, BlockStmt([])),
+            SwitchStmt(Identifier("a"), [CaseStmt(IntLiteral(1), [BreakStmt()])], DefaultStmt([ReturnStmt()])),
+            ExprStmt(AssignExpr(MemberAccess(Identifier("p"), "x"), FuncCall("f", [BinaryOp(Identifier("a"), "+", IntLiteral(2))]))),
+            ReturnStmt(Identifier("a")),
+        ]
+    )
+    return Program(
+        [
+            StructDecl("P", [MemberDecl(FloatType(), "x")]),
+            FuncDecl(IntType(), "f", [Param(IntType(), "a")], body),
+            FuncDecl(VoidType(), "g", [Param(StringType(), "s")], BlockStmt([])),
+            FuncDecl(None, "h", [], BlockStmt([])),
+        ]
+    )
+
+
+def test_table_visitor_visits_like_base_visitor():
+    for program in (every_node_program(), generate_program(300)):
+        expected, actual = [], []
+        RecordingVisitor(expected).visit(program)
+        TableRecordingVisitor(actual).visit(program)
+        assert actual == expected
+
+
+def test_default_traversal_reaches_every_node_class():
+    visited = []
+    TableRecordingVisitor(visited).visit(every_node_program())
+    assert set(visited) == {node_class.__name__ for node_class in VISIT_METHODS}
+
+
+def test_overrides_and_return_values():
+    class Evaluator(TableVisitor):
+        def visit_binary_op(self, node, o=None):
+            return self.visit(node.left, o) + self.visit(node.right, o)
+
+        def visit_int_literal(self, node, o=None):
+            return node.value
+
+        def visit_identifier(self, node, o=None):
+            return o[node.name]
+
+    expr = BinaryOp(BinaryOp(IntLiteral(1), "+", Identifier("x")), "+", IntLiteral(3))
+    assert Evaluator().visit(expr, {"x": 10}) == 14
+
+
+def test_visitor_without_init_call_gets_table():
+    class Counter(TableVisitor):
+        def __init__(self, start):
+            self.count = start
+
+        def visit_identifier(self, node, o=None):
+            self.count += 1
+
+    counter = Counter(5)
+    counter.visit(generate_program(100))
+    assert counter.count == 5 + 240
+
+
+def test_unknown_node_class_falls_back_to_accept():
+    class Hole(ASTNode):
+        __slots__ = ()
+
+        def accept(self, visitor, o=None):
+            return visitor.visit_hole(self, o)
+
+    class HoleVisitor(TableVisitor):
+        def visit_hole(self, node, o=None):
+            return "hole"
+
+    assert HoleVisitor().visit(Hole()) == "hole"
+
+
+def test_table_is_built_once_per_class():
+    class Counter(TableVisitor):
+        def visit_identifier(self, node, o=None):
+            pass
+
+    first, second = Counter(), Counter()
+    assert "_dispatch_table" not in vars(first)
+    assert first._dispatch_table is second._dispatch_table is Counter._dispatch_table
+    assert Counter._dispatch_table is not TableVisitor()._dispatch_table
+    assert Counter._dispatch_table[Identifier] is Counter.visit_identifier
+
+
+def test_node_class_defined_after_the_visitor_falls_back_to_accept():
+    class LateVisitor(TableVisitor):
+        def visit_late(self, node, o=None):
+            return o
+
+    visitor = LateVisitor()
+
+    class Late(ASTNode):
+        __slots__ = ()
+
+        def accept(self, visitor, o=None):
+            return visitor.visit_late(self, o)
+
+    assert Late not in LateVisitor._dispatch_table
+    assert visitor.visit(Late(), "late") == "late"
+    assert Late in LateVisitor._dispatch_table
+    assert visitor.visit(BlockStmt([ExprStmt(Late())])) is None
+
+
+def test_traversals_dispatch_children_through_the_table():
+    class Tracing(TableVisitor):
+        def visit(self, node, o=None):
+            o.append(type(node).__name__)
+            return super().visit(node, o)
+
+    visited = []
+    Tracing().visit(BlockStmt([ExprStmt(Identifier("x"))]), visited)
+    assert visited == ["BlockStmt"]
+
+
+def test_measure_dispatch_reports_both_mechanisms():
+    result = measure_dispatch(lines=200, repeat=1)
+    assert result["nodes"] == 1381
+    assert result["accept"] > 0 and result["table"] > 0
@@ -0,0 +1,169 @@
+"""
+AST walker test cases for TyC compiler.
+Covers pre-order, post-order and level-order walks, pruning and rewrites.
+"""
+
+import pytest
+from src.utils.node_memory import count_nodes, generate_program
+from src.utils.nodes import (
+    ASTNode,
+    Program,
+    FuncDecl,
+    Param,
+    IntType,
+    BlockStmt,
+    VarDecl,
+    IfStmt,
+    ReturnStmt,
+    ExprStmt,
+    BinaryOp,
+    Identifier,
+    IntLiteral,
+)
+from src.utils.visitor import BaseVisitor
+from src.utils.walker import (
+    LEVEL_ORDER,
+    POST_ORDER,
+    PRE_ORDER,
+    child_fields,
+    children,
+    count,
+    find,
+    find_all,
+    replace_child,
+    transform,
+    walk,
+)
+
+
+def small_program():
+    # int f(int a) { if (a) return a + 1; }
+    body = BlockStmt([IfStmt(Identifier("a"), ReturnStmt(BinaryOp(Identifier("a"), "+", IntLiteral(1))))])
+    return Program([FuncDecl(IntType(), "f", [Param(IntType(), "a")], body)])
+
+
+def names(nodes):
+    return [type(node).__name__ for node in nodes]
+
+
+def test_pre_order_matches_base_visitor_order():
+    class Recorder(BaseVisitor):
+        def __init__(self):
+            self.order = []
+
+        def visit(self, node, o=None):
+            self.order.append(node)
+            return super().visit(node, o)
+
+    program = generate_program(300)
+    recorder = Recorder()
+    recorder.visit(program)
+    walked = list(walk(program))
+    assert len(walked) == len(recorder.order)
+    assert all(a is b for a, b in zip(walked, recorder.order))
+
+
+def test_orders():
+    program = small_program()
+    assert names(walk(program, PRE_ORDER)) == [
+        "Program", "FuncDecl", "IntType", "Param", "IntType", "BlockStmt", "IfStmt",
+        "Identifier", "ReturnStmt", "BinaryOp", "Identifier", "IntLiteral",
+    ]
+    assert names(walk(program, POST_ORDER)) == [
+        "IntType", "IntType", "Param", "Identifier", "Identifier", "IntLiteral", "BinaryOp",
+        "ReturnStmt", "IfStmt", "BlockStmt", "FuncDecl", "Program",
+    ]
+    assert names(walk(program, LEVEL_ORDER)) == [
+        "Program", "FuncDecl", "IntType", "Param", "BlockStmt", "IntType", "IfStmt",
+        "Identifier", "ReturnStmt", "BinaryOp", "Identifier", "IntLiteral",
+    ]
+
+
+@pytest.mark.parametrize("order", [PRE_ORDER, POST_ORDER, LEVEL_ORDER])
+def test_context_gives_parent_and_depth(order):
+    program = small_program()
+    steps = list(walk(program, order, context=True))
+    assert len(steps) == 12
+    for node, parent, depth in steps:
+        if parent is None:
+            assert node is program and depth == 0
+        else:
+            assert any(child is node for child in children(parent))
+    depths = {type(node).__name__: depth for node, _, depth in steps}
+    assert depths["BinaryOp"] == 5 and depths["IntLiteral"] == 6
+
+
+@pytest.mark.parametrize("order", [PRE_ORDER, POST_ORDER, LEVEL_ORDER])
+def test_descend_prunes_subtrees(order):
+    program = small_program()
+    walked = names(walk(program, order, descend=lambda node: not isinstance(node, IfStmt)))
+    assert "IfStmt" in walked
+    assert "ReturnStmt" not in walked and "Identifier" not in walked
+    assert len(walked) == 7
+
+
+def test_unknown_order():
+    with pytest.raises(ValueError):
+        walk(small_program(), "in")
+
+
+def test_deep_trees_do_not_recurse():
+    expr = IntLiteral(0)
+    for _ in range(100_000):
+        expr = BinaryOp(expr, "+", Identifier("x"))
+    for order in (PRE_ORDER, POST_ORDER, LEVEL_ORDER):
+        assert count(ExprStmt(expr)) == 200_002
+        assert max(depth for _, _, depth in walk(expr, order, context=True)) == 100_000
+
+
+def test_count_and_find():
+    program = generate_program(500)
+    assert count(program) == count_nodes(program)
+    assert count(program, lambda node: isinstance(node, FuncDecl)) == 50
+    call = find(program, lambda node: getattr(node, "name", None) == "f3" and not isinstance(node, FuncDecl))
+    assert type(call).__name__ == "FuncCall"
+    assert find(program, lambda node: isinstance(node, IfStmt) and node.else_stmt is None) is None
+    assert len(list(find_all(program, lambda node: isinstance(node, Identifier) and node.name == "i"))) == 150
+
+
+def test_child_fields_of_subclass():
+    class TaggedIdentifier(Identifier):
+        __slots__ = ()
+
+    class Wrapper(BinaryOp):
+        __slots__ = ()
+
+    assert child_fields(TaggedIdentifier) == ()
+    assert child_fields(Wrapper) == ("left", "right")
+    assert names(walk(Wrapper(TaggedIdentifier("a"), "+", IntLiteral(1)))) == [
+        "Wrapper", "TaggedIdentifier", "IntLiteral",
+    ]
+
+
+def test_replace_child():
+    program = small_program()
+    block = program.decls[0].body
+    if_stmt = block.statements[0]
+    replace_child(if_stmt, if_stmt.condition, IntLiteral(1))
+    assert str(if_stmt.condition) == "IntLiteral(1)"
+    replace_child(block, if_stmt, None)
+    assert block.statements == []
+    with pytest.raises(ValueError):
+        replace_child(block, if_stmt, None)
+
+
+def test_transform_folds_constants():
+    def fold(node: ASTNode):
+        if (
+            isinstance(node, BinaryOp)
+            and node.operator == "+"
+            and isinstance(node.left, IntLiteral)
+            and isinstance(node.right, IntLiteral)
+        ):
+            return IntLiteral(node.left.value + node.right.value)
+        return node
+
+    expr = BinaryOp(BinaryOp(IntLiteral(1), "+", IntLiteral(2)), "+", IntLiteral(3))
+    assert str(transform(expr, fold)) == "IntLiteral(6)"
+    stmt = VarDecl(None, "x", BinaryOp(Identifier("y"), "+", BinaryOp(IntLiteral(1), "+", IntLiteral(2))))
+    assert str(transform(stmt, fold)) == "VarDecl(auto, x = BinaryOp(Identifier(y), +, IntLiteral(3)))"
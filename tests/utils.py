@@ -11,23 +11,21 @@ build_dir = os.path.join(project_root, "build")
 sys.path.insert(0, project_root)
 sys.path.insert(0, build_dir)
 
-from build.TyCLexer import TyCLexer
-from build.TyCParser import TyCParser
-from antlr4 import InputStream, CommonTokenStream
-from src.utils.error_listener import NewErrorListener
+from src.utils.parsing import POOL, parse_program
+from src.astgen.direct_builder import BUILD_MODE, build_ast
+from src.utils.deep_parsing import DEEP_MODE, build_ast_deep, parse_source_deep, run_deep
+from src.utils.nodes import ASTNode
 
 
 class ASTGenerator:
     """Class to generate AST from TyC source code."""
 
-    def __init__(self, input_string: str):
+    def __init__(self, input_string: str, backend: str = None, mode: str = None, build: str = None):
         self.input_string = input_string
-        self.input_stream = InputStream(input_string)
-        self.lexer = TyCLexer(self.input_stream)
-        self.token_stream = CommonTokenStream(self.lexer)
-        self.parser = TyCParser(self.token_stream)
-        self.parser.removeErrorListeners()
-        self.parser.addErrorListener(NewErrorListener.INSTANCE)
+        self.backend = backend
+        self.mode = mode
+        self.build = build  # "parse-tree" or "direct", TYC_AST_BUILD by default
+        self.prediction = None
         # Import here to avoid circular dependency issues during build
         try:
             from src.astgen.ast_generation import ASTGeneration
@@ -38,13 +36,28 @@ class ASTGenerator:
 
     def generate(self):
         """Generate AST from the input string."""
-        if self.ast_generator is None:
+        direct = (self.build or BUILD_MODE) == "direct"
+        if self.ast_generator is None and not direct:
             return "AST Generation Error: ASTGeneration class not found. Please implement src/astgen/ast_generation.py"
         try:
+            if direct:
+                # Build the AST straight from the tokens, without a parse tree
+                if DEEP_MODE:
+                    return build_ast_deep(self.input_string, self.backend)
+                return build_ast(self.input_string, self.backend)
+
             # Parse the program starting from the entry point
-            parse_tree = self.parser.program()
+            if DEEP_MODE:
+                result = parse_source_deep(self.input_string, self.mode, self.backend)
+            else:
+                parser = POOL.parser(self.input_string, self.backend)
+                result = parse_program(parser, self.mode)
+            self.prediction = result.prediction
+            parse_tree = result.tree
 
             # Generate AST using the visitor
+            if DEEP_MODE:
+                return run_deep(self.ast_generator.visit, parse_tree)
             ast = self.ast_generator.visit(parse_tree)
             return ast
         except Exception as e:
@@ -54,13 +67,13 @@ class ASTGenerator:
 class Tokenizer:
     """Lexer wrapper for testing"""
 
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, backend: str = None):
         self.source_code = source_code
+        self.backend = backend
 
     def get_tokens_as_string(self) -> str:
         """Get tokens as comma-separated string (only token text)"""
-        input_stream = InputStream(self.source_code)
-        lexer = TyCLexer(input_stream)
+        lexer = POOL.lexer(self.source_code, self.backend)
 
         tokens = []
         try:
@@ -84,20 +97,41 @@ class Tokenizer:
 class Parser:
     """Parser wrapper for testing"""
 
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, backend: str = None, mode: str = None):
         self.source_code = source_code
+        self.backend = backend
+        self.mode = mode
+        self.prediction = None  # SLL or LL once parsed
 
     def parse(self) -> str:
         """Parse source code and return result"""
-        input_stream = InputStream(self.source_code)
-        lexer = TyCLexer(input_stream)
-        token_stream = CommonTokenStream(lexer)
-        parser = TyCParser(token_stream)
-        parser.removeErrorListeners()
-        parser.addErrorListener(NewErrorListener.INSTANCE)
-
         try:
-            tree = parser.program()
+            if DEEP_MODE:
+                result = parse_source_deep(self.source_code, self.mode, self.backend)
+            else:
+                result = parse_program(POOL.parser(self.source_code, self.backend), self.mode)
+            self.prediction = result.prediction
             return "success"
         except Exception as e:
             return str(e)
+
+
+def slot_fields(node_class: type) -> tuple:
+    """All slot names of a node class, line and column included, base class fields first."""
+    return tuple(field for klass in reversed(node_class.__mro__) for field in klass.__dict__.get("__slots__", ()))
+
+
+def assert_same_tree(expected, actual):
+    """Assert that two ASTs have the same node classes, positions and values, without recursing."""
+    pending = [(expected, actual)]
+    while pending:
+        left, right = pending.pop()
+        if isinstance(left, list):
+            assert isinstance(right, list) and len(left) == len(right)
+            pending.extend(zip(left, right))
+        elif isinstance(left, ASTNode):
+            assert type(left) is type(right)
+            for field in slot_fields(type(left)):
+                pending.append((getattr(left, field), getattr(right, field)))
+        else:
+            assert left == right and type(left) is type(right)